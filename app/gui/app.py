@@ -2,9 +2,16 @@ import tkinter as tk
 from tkinter import ttk
 import numpy as np
 import matplotlib.pyplot as plt
+import matplotlib.tri as mtri
+from matplotlib.colors import ListedColormap
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg  # , NavigationToolbar2Tk
 from app.methods.root_finding import lu_factorization_with_pivot as lu_with_pivot, interactive_jacboi as jacobi_iter, \
-    newton_raphson_no_line_relaxation as newton_classic, newton_raphson_with_relaxation as newton_relaxed
+    newton_raphson_no_line_relaxation as newton_classic, newton_raphson_with_relaxation as newton_relaxed, \
+    newton_basins
+from app.methods.root_finding.lu_cache import CACHE_LU_COMPARTIDA
+from app.utils.expressions import SistemaCompilado, compilar_jacobiano
+from app.utils.automatic_differentiation import SistemaDiferenciable
+from app.gui.utils.contour_grid import EvaluadorMalla, malla_adaptativa
 
 
 class RootFindingApp:
@@ -215,13 +222,13 @@ class RootFindingApp:
             A_np = np.array(matrix_A_list, dtype=float)
             b_np = np.array(vector_b_list, dtype=float)
 
-            resultado = lu_with_pivot.resolver_sistema_lu(A_np, b_np)
+            resultado = lu_with_pivot.resolver_sistema_lu(A_np, b_np, cache=CACHE_LU_COMPARTIDA)
 
             if isinstance(resultado, str):
                 self.results_lu_text.insert(tk.END, resultado + "\n")
             else:
                 # Corregir el desempaquetado para esperar 5 valores (P, L, U, x, y)
-                P, L, U, x, y = resultado # y es el vector intermedio de Ly = Pb
+                P, L, U, x, y = resultado # y es el vector intermedio de Ly = Pᵀb
                 self.results_lu_text.insert(tk.END, "Factorización LU Exitosa:\n\n")
                 self.results_lu_text.insert(tk.END, "Matriz de Permutación P:\n")
                 self.results_lu_text.insert(tk.END, np.array2string(P, precision=4, suppress_small=True) + "\n\n")
@@ -229,7 +236,7 @@ class RootFindingApp:
                 self.results_lu_text.insert(tk.END, np.array2string(L, precision=4, suppress_small=True) + "\n\n")
                 self.results_lu_text.insert(tk.END, "Matriz Triangular Superior U:\n")
                 self.results_lu_text.insert(tk.END, np.array2string(U, precision=4, suppress_small=True) + "\n\n")
-                self.results_lu_text.insert(tk.END, "Vector Intermedio y (solución de Ly = Pb):\n")
+                self.results_lu_text.insert(tk.END, "Vector Intermedio y (solución de Ly = Pᵀb):\n")
                 self.results_lu_text.insert(tk.END, np.array2string(y, precision=10, suppress_small=True) + "\n\n")
                 self.results_lu_text.insert(tk.END, "Vector Solución x (solución de Ux = y):\n")
                 self.results_lu_text.insert(tk.END, np.array2string(x, precision=10, suppress_small=True) + "\n")
@@ -293,8 +300,9 @@ class RootFindingApp:
 
         jac_entry_frame = ttk.Frame(self.newton_custom_functions_frame)
         jac_entry_frame.pack(fill='x', pady=5)
-        ttk.Label(jac_entry_frame, text="Jacobiano J(x,y):").grid(row=0, column=0, columnspan=4, padx=5, pady=5,
-                                                                  sticky='w')
+        ttk.Label(jac_entry_frame, text="Jacobiano J(x,y) (opcional: vacío = automático):").grid(row=0, column=0,
+                                                                                                columnspan=4, padx=5,
+                                                                                                pady=5, sticky='w')
         ttk.Label(jac_entry_frame, text="dF1/dx =").grid(row=1, column=0, padx=5, pady=2, sticky='w')
         self.text_j11_eq = tk.Text(jac_entry_frame, height=2, width=25)
         self.text_j11_eq.grid(row=1, column=1, padx=5, pady=2)
@@ -338,6 +346,19 @@ class RootFindingApp:
         self.entry_w_newton = ttk.Entry(other_params_frame, width=10);
         self.entry_w_newton.grid(row=1, column=1, padx=5, pady=2);
         self.entry_w_newton.insert(0, "1.0")
+        ttk.Label(other_params_frame, text="Reusar Jacobiano (m iter.):").grid(row=1, column=2, padx=5, pady=2,
+                                                                             sticky="w")
+        self.entry_reuso_j_newton = ttk.Entry(other_params_frame, width=10);
+        self.entry_reuso_j_newton.grid(row=1, column=3, padx=5, pady=2);
+        self.entry_reuso_j_newton.insert(0, "1")
+        ttk.Label(other_params_frame, text="Búsqueda lineal:").grid(row=2, column=0, padx=5, pady=2, sticky="w")
+        self.newton_line_search_var = tk.StringVar(value="ninguna")
+        line_search_frame = ttk.Frame(other_params_frame)
+        line_search_frame.grid(row=2, column=1, columnspan=3, sticky="w")
+        for texto, valor in (("Ninguna (paso w fijo)", "ninguna"), ("Armijo", "armijo"),
+                             ("Interpolación", "interpolacion")):
+            ttk.Radiobutton(line_search_frame, text=texto, variable=self.newton_line_search_var,
+                            value=valor).pack(side=tk.LEFT, padx=5)
 
         # Botón para resolver (dentro de la pestaña 1)
         ttk.Button(config_params_frame, text="Resolver Sistema No Lineal",
@@ -370,6 +391,44 @@ class RootFindingApp:
         self.newton_plot_frame = ttk.LabelFrame(plot_tab_frame, text="Gráfico del Sistema y Convergencia")
         self.newton_plot_frame.pack(pady=10, padx=10, fill='both', expand=True)
 
+        # --- Pestaña 5: Cuencas de Atracción ---
+        basins_tab_frame = ttk.Frame(self.newton_classic_notebook, padding=10)
+        self.newton_classic_notebook.add(basins_tab_frame, text='Cuencas de Atracción')
+
+        basins_params_frame = ttk.LabelFrame(basins_tab_frame, text="Malla de Valores Iniciales")
+        basins_params_frame.pack(pady=5, padx=10, fill='x')
+        ttk.Label(basins_params_frame, text="x mín / máx:").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        self.entry_basins_xmin = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_xmin.grid(row=0, column=1, padx=5, pady=2);
+        self.entry_basins_xmin.insert(0, "-6")
+        self.entry_basins_xmax = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_xmax.grid(row=0, column=2, padx=5, pady=2);
+        self.entry_basins_xmax.insert(0, "6")
+        ttk.Label(basins_params_frame, text="y mín / máx:").grid(row=1, column=0, padx=5, pady=2, sticky="w")
+        self.entry_basins_ymin = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_ymin.grid(row=1, column=1, padx=5, pady=2);
+        self.entry_basins_ymin.insert(0, "-6")
+        self.entry_basins_ymax = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_ymax.grid(row=1, column=2, padx=5, pady=2);
+        self.entry_basins_ymax.insert(0, "6")
+        ttk.Label(basins_params_frame, text="Resolución (puntos por eje):").grid(row=0, column=3, padx=5, pady=2,
+                                                                              sticky="w")
+        self.entry_basins_resolution = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_resolution.grid(row=0, column=4, padx=5, pady=2);
+        self.entry_basins_resolution.insert(0, "400")
+        ttk.Label(basins_params_frame, text="Max. Iteraciones:").grid(row=1, column=3, padx=5, pady=2, sticky="w")
+        self.entry_basins_max_iter = ttk.Entry(basins_params_frame, width=8);
+        self.entry_basins_max_iter.grid(row=1, column=4, padx=5, pady=2);
+        self.entry_basins_max_iter.insert(0, "50")
+        ttk.Button(basins_params_frame, text="Calcular Mapa de Cuencas",
+                   command=self.solve_newton_basins).grid(row=0, column=5, rowspan=2, padx=10, pady=2)
+
+        self.basins_summary_text = tk.Text(basins_tab_frame, height=5, width=100, wrap=tk.WORD)
+        self.basins_summary_text.pack(pady=5, padx=10, fill='x')
+        self.basins_summary_text.config(state=tk.DISABLED)
+        self.newton_basins_plot_frame = ttk.LabelFrame(basins_tab_frame, text="Raíz Alcanzada e Iteraciones")
+        self.newton_basins_plot_frame.pack(pady=5, padx=10, fill='both', expand=True)
+
         # Inicializar estado de los campos de entrada personalizados
         self._toggle_newton_classic_input_mode()
 
@@ -426,6 +485,64 @@ class RootFindingApp:
         """
         pass  # No hacer nada.
 
+    def _build_newton_system(self):
+        """
+        Construye F y J según el tipo de sistema elegido en la ventana de Newton.
+
+        Retorna:
+        tuple: (F_to_solve, J_to_solve, F_for_plot, origen_jacobiano). J_to_solve es None si el
+               Jacobiano debe aproximarse numéricamente.
+        str: Mensaje de error si las expresiones no son válidas.
+        """
+        if self.newton_classic_system_var.get() == "sistema_2x2":
+            # print("DEBUG: Usando sistema estándar")
+            F_to_solve = newton_classic.ejemplo_F_sistema_2x2
+            J_to_solve = newton_classic.ejemplo_J_sistema_2x2
+            origen_jacobiano = "analítico"
+            F_for_plot = newton_classic.ejemplo_F_sistema_2x2
+        elif self.newton_classic_system_var.get() == "personalizado_2x2":
+            # print("DEBUG: Usando sistema personalizado")
+            f1_str = self.text_f1_eq.get("1.0", tk.END).strip()
+            f2_str = self.text_f2_eq.get("1.0", tk.END).strip()
+            j11_str = self.text_j11_eq.get("1.0", tk.END).strip()
+            j12_str = self.text_j12_eq.get("1.0", tk.END).strip()
+            j21_str = self.text_j21_eq.get("1.0", tk.END).strip()
+            j22_str = self.text_j22_eq.get("1.0", tk.END).strip()
+
+            j_strs = [j11_str, j12_str, j21_str, j22_str]
+            # Las derivadas son opcionales: si se dejan todas vacías, J se obtiene por diferenciación
+            # automática de F (o numéricamente si F usa una función que no se sabe derivar)
+            if not all([f1_str, f2_str]) or (any(j_strs) and not all(j_strs)):
+                return ("Error: Ingrese f1 y f2, y las cuatro derivadas parciales o ninguna "
+                        "(sin derivadas el Jacobiano se calcula automáticamente).")
+
+            # Las expresiones se analizan, validan y compilan una sola vez (ver app.utils.expressions);
+            # las funciones resultantes sirven tanto para un punto como para toda la malla del gráfico.
+            try:
+                F_custom = SistemaCompilado([f1_str, f2_str], variables=('x', 'y'))
+                J_custom = compilar_jacobiano([[j11_str, j12_str], [j21_str, j22_str]],
+                                              variables=('x', 'y')) if all(j_strs) else None
+            except ValueError as e_expr:
+                return f"Error en las expresiones del sistema: {e_expr}"
+
+            F_to_solve = F_custom
+            J_to_solve = J_custom
+            origen_jacobiano = "ingresado por el usuario"
+            if J_custom is None:
+                try:
+                    # F y J en una sola evaluación fusionada (ver app.utils.automatic_differentiation)
+                    sistema_diferenciable = SistemaDiferenciable([f1_str, f2_str], variables=('x', 'y'))
+                    F_to_solve = sistema_diferenciable.F
+                    J_to_solve = sistema_diferenciable.J
+                    origen_jacobiano = "diferenciación automática"
+                except ValueError as e_ad:
+                    origen_jacobiano = f"numérico ({e_ad})"
+            F_for_plot = F_custom
+        else:
+            return "Error: Tipo de sistema no reconocido."
+
+        return F_to_solve, J_to_solve, F_for_plot, origen_jacobiano
+
     def solve_newton_classic_system(self):
         # Usar una comprobación más genérica para la ventana de Newton NL
         if not self.newton_classic_window or not self.newton_classic_window.winfo_exists():
@@ -441,64 +558,21 @@ class RootFindingApp:
             tol = float(self.entry_tol_newton.get())
             max_iter = int(self.entry_max_iter_newton.get())
             w_factor = float(self.entry_w_newton.get())
+            reusar_jacobiano = int(self.entry_reuso_j_newton.get())
+            busqueda_lineal = self.newton_line_search_var.get()
+            busqueda_lineal = None if busqueda_lineal == "ninguna" else busqueda_lineal
 
             # Vector inicial
             x_inicial = np.array([x0, y0])
 
-            F_to_solve = None
-            J_to_solve = None
-            F_for_plot = None
-
-            if self.newton_classic_system_var.get() == "sistema_2x2":
-                # print("DEBUG: Usando sistema estándar")
-                F_to_solve = newton_classic.ejemplo_F_sistema_2x2
-                J_to_solve = newton_classic.ejemplo_J_sistema_2x2
-                F_for_plot = newton_classic.ejemplo_F_sistema_2x2
-            elif self.newton_classic_system_var.get() == "personalizado_2x2":
-                # print("DEBUG: Usando sistema personalizado")
-                f1_str = self.text_f1_eq.get("1.0", tk.END).strip()
-                f2_str = self.text_f2_eq.get("1.0", tk.END).strip()
-                j11_str = self.text_j11_eq.get("1.0", tk.END).strip()
-                j12_str = self.text_j12_eq.get("1.0", tk.END).strip()
-                j21_str = self.text_j21_eq.get("1.0", tk.END).strip()
-                j22_str = self.text_j22_eq.get("1.0", tk.END).strip()
-
-                if not all([f1_str, f2_str, j11_str, j12_str, j21_str, j22_str]):
-                    error_msg = "Error: Todas las funciones y derivadas deben ser ingresadas para el sistema personalizado."
-                    self._show_error_in_text(self.results_newton_text, error_msg)
-                    self._show_error_in_text(self.summary_newton_text, error_msg)
-                    return
-
-                safe_globals = {"np": np, "__builtins__": {}}
-                math_funcs = {name: getattr(np, name) for name in dir(np) if isinstance(getattr(np, name), np.ufunc)}
-                safe_globals.update(math_funcs)
-
-                def F_custom(vec):
-                    x, y = vec
-                    local_env = {"x": x, "y": y}
-                    f1 = eval(f1_str, safe_globals, local_env)
-                    f2 = eval(f2_str, safe_globals, local_env)
-                    return np.array([f1, f2])
-
-                def J_custom(vec):
-                    x, y = vec
-                    local_env = {"x": x, "y": y}
-                    j11 = eval(j11_str, safe_globals, local_env)
-                    j12 = eval(j12_str, safe_globals, local_env)
-                    j21 = eval(j21_str, safe_globals, local_env)
-                    j22 = eval(j22_str, safe_globals, local_env)
-                    return np.array([[j11, j12], [j21, j22]])
-
-                F_to_solve = F_custom
-                J_to_solve = J_custom
-                F_for_plot = F_custom
-            else:
-                error_msg = "Error: Tipo de sistema no reconocido."
-                self._show_error_in_text(self.results_newton_text, error_msg)
-                self._show_error_in_text(self.summary_newton_text, error_msg)
+            sistema = self._build_newton_system()
+            if isinstance(sistema, str):
+                self._show_error_in_text(self.results_newton_text, sistema)
+                self._show_error_in_text(self.summary_newton_text, sistema)
                 return
+            F_to_solve, J_to_solve, F_for_plot, origen_jacobiano = sistema
 
-            if not F_to_solve or not J_to_solve or not F_for_plot:
+            if not F_to_solve or not F_for_plot:
                 error_msg = "Error: No se pudieron definir las funciones para resolver."
                 self._show_error_in_text(self.results_newton_text, error_msg)
                 self._show_error_in_text(self.summary_newton_text, error_msg)
@@ -510,7 +584,10 @@ class RootFindingApp:
                 x_inicial,
                 tol,
                 max_iter,
-                w_factor
+                w_factor,
+                reusar_jacobiano=reusar_jacobiano,
+                metodo_jacobiano='central',
+                busqueda_lineal=busqueda_lineal
             )
 
             # --- Poblar Pestaña de Resumen ---
@@ -531,6 +608,15 @@ class RootFindingApp:
                     summary_content += "Solución final: No disponible\n"
                 summary_content += f"Iteraciones realizadas: {iter_realizadas}\n"
                 summary_content += f"Norma del residuo final ||F(x_k)||: {norma_final:.4e}\n"
+                summary_content += f"Evaluaciones de F: {resultado.get('evaluaciones_F', 'N/A')}\n"
+                summary_content += f"Origen del Jacobiano: {origen_jacobiano}\n"
+                summary_content += (f"Evaluaciones del Jacobiano: {resultado.get('evaluaciones_jacobiano', 'N/A')}, "
+                                    f"factorizaciones: {resultado.get('factorizaciones', 'N/A')}\n")
+                info_jacobiano = resultado.get('jacobiano_numerico')
+                if info_jacobiano:
+                    summary_content += (f"Jacobiano numérico ({info_jacobiano['metodo']}, evaluación "
+                                        f"{info_jacobiano['evaluacion']}): {info_jacobiano['evaluaciones_F']} "
+                                        f"evaluaciones de F\n")
             else:
                 summary_content = "Error: Tipo de resultado inesperado del backend."
                 self._show_error_in_text(self.results_newton_text, summary_content)  # También en detallado
@@ -580,6 +666,8 @@ class RootFindingApp:
                         detailed_content += "Jacobiano J(x_k):\n" + np.array2string(jx_k_val, precision=5,
                                                                                     suppress_small=True,
                                                                                     separator=', ') + "\n"  # Precisión 5 para Jacobiano
+                    elif item.get('jacobiano_nuevo') == 0.0:
+                        detailed_content += "Jacobiano J(x_k): reutilizado (factorización de una iteración anterior)\n"
                     else:
                         detailed_content += "Jacobiano J(x_k): N/A\n"
 
@@ -598,16 +686,23 @@ class RootFindingApp:
                         else:
                             detailed_content += f"Norma del cambio ||x_{{k+1}} - x_k||: No calculada/Error\n"
 
-                    # Calcular y mostrar x_{k+1}
-                    # Necesitamos el w_factor de la GUI para este cálculo.
-                    try:
-                        w_factor_gui = float(self.entry_w_newton.get())
-                    except ValueError:
-                        w_factor_gui = 1.0  # Default si la entrada es inválida, aunque el backend usa el suyo.
-                        # Esto es solo para visualización aquí.
-
-                    if x_k_val is not None and delta_k_val is not None:
-                        x_k_siguiente = x_k_val + w_factor_gui * delta_k_val
+                    # Calcular y mostrar x_{k+1} con el α aplicado por el backend (w fijo o el de la búsqueda lineal)
+                    alfa_k_val = item.get('alfa_k')
+                    if item.get('pruebas_busqueda') is not None:
+                        num_pruebas = int(item['pruebas_busqueda'])
+                        detailed_content += f"Búsqueda lineal: {num_pruebas} prueba(s)\n"
+                        alfas_prueba, normas_prueba = item.get('alfas_prueba'), item.get('normas_prueba')
+                        if alfas_prueba is None or normas_prueba is None:
+                            alfas_prueba, normas_prueba = [], []  # El modo de historial no guardó las pruebas
+                        for alfa_prueba, norma_prueba in zip(alfas_prueba[:num_pruebas], normas_prueba[:num_pruebas]):
+                            detailed_content += f"  α = {alfa_prueba:.6g}: ||F|| = {norma_prueba:.4e}\n"
+                        if item.get('paso_sin_descenso'):
+                            detailed_content += "  Ningún α dio descenso suficiente: se aplica el de menor ||F|| (la iteración siguiente da el paso w·δ_k)\n"
+                    if alfa_k_val is not None:
+                        detailed_content += f"Longitud de paso aplicada α_k: {alfa_k_val:.6g}\n"
+
+                    if x_k_val is not None and delta_k_val is not None and alfa_k_val is not None:
+                        x_k_siguiente = x_k_val + alfa_k_val * delta_k_val
                         detailed_content += "Vector x_{k+1} (resultado de esta iteración):\n" + np.array2string(
                             x_k_siguiente, precision=10, suppress_small=True, separator=', ') + "\n"
                     else:
@@ -656,20 +751,19 @@ class RootFindingApp:
         x_min, x_max = solucion[0] - 2, solucion[0] + 2
         y_min, y_max = solucion[1] - 2, solucion[1] + 2
 
-        # Renombrar para mayor claridad y evitar conflictos de nombres si los hubiera
-        x_grid_vals = np.linspace(x_min, x_max, 100)
-        y_grid_vals = np.linspace(y_min, y_max, 100)
-        X, Y = np.meshgrid(x_grid_vals, y_grid_vals)
-
-        Z = np.zeros((len(y_grid_vals), len(x_grid_vals), 2))
-        for i in range(len(y_grid_vals)):
-            for j in range(len(x_grid_vals)):
-                Z[i, j] = F_func(np.array([X[i, j], Y[i, j]]))
+        # F se evalúa por lotes (una sola llamada por bloque si admite arreglos) y solo se refina la
+        # malla cerca de las curvas F_i = 0; ver app.gui.utils.contour_grid
+        evaluador = EvaluadorMalla(F_func, al_avanzar=self.newton_plot_frame.update_idletasks)
+        malla = malla_adaptativa(F_func, (x_min, x_max), (y_min, y_max), n_base=32, niveles=3,
+                                 evaluador=evaluador)
+        triangulacion = mtri.Triangulation(malla['x'], malla['y'])
 
         # Graficar curvas de nivel para F1(x,y) = 0 y F2(x,y) = 0
         # Se elimina el argumento 'label' ya que no es usado por contour para la leyenda.
-        ax.contour(X, Y, Z[:, :, 0], levels=[0], colors='blue')
-        ax.contour(X, Y, Z[:, :, 1], levels=[0], colors='red')
+        for valores, color in zip(malla['valores'][:2], ('blue', 'red')):
+            # Los triángulos con algún vértice fuera del dominio de F se excluyen
+            triangulacion.set_mask(~np.all(np.isfinite(valores[triangulacion.triangles]), axis=1))
+            ax.tricontour(triangulacion, valores, levels=[0], colors=color)
 
         # Artistas proxy para la leyenda de las curvas de nivel
         ax.plot([], [], color='blue', lw=2, label='F1(x,y) = 0')
@@ -703,6 +797,77 @@ class RootFindingApp:
         # toolbar.update()
         # canvas.get_tk_widget().pack(side=tk.TOP, fill=tk.BOTH, expand=True)
 
+    def solve_newton_basins(self):
+        """Mapa de cuencas de atracción: Newton desde cada punto de la malla, en un solo lote vectorizado."""
+        if not self.newton_classic_window or not self.newton_classic_window.winfo_exists():
+            return
+
+        self._clear_text_widget(self.basins_summary_text)
+        try:
+            limites_x = (float(self.entry_basins_xmin.get()), float(self.entry_basins_xmax.get()))
+            limites_y = (float(self.entry_basins_ymin.get()), float(self.entry_basins_ymax.get()))
+            resolucion = int(self.entry_basins_resolution.get())
+            max_iter = int(self.entry_basins_max_iter.get())
+            # Tolerancia y relajación: las mismas de la pestaña de configuración
+            tol = float(self.entry_tol_newton.get())
+            w_factor = float(self.entry_w_newton.get())
+        except ValueError as e_val:
+            self._show_error_in_text(self.basins_summary_text, f"Error de valor en parámetros de entrada: {e_val}")
+            return
+
+        sistema = self._build_newton_system()
+        if isinstance(sistema, str):
+            self._show_error_in_text(self.basins_summary_text, sistema)
+            return
+        F_to_solve, J_to_solve, _, origen_jacobiano = sistema
+
+        resultado = newton_basins.mapa_cuencas(F_to_solve, J_to_solve, limites_x, limites_y, resolucion, tol,
+                                               max_iter, w_factor)
+        if isinstance(resultado, str):
+            self._show_error_in_text(self.basins_summary_text, resultado)
+            return
+
+        resumen = (f"{resultado['puntos']} puntos iniciales en {resultado['tiempo_segundos']:.2f} s "
+                   f"(Jacobiano: {origen_jacobiano}).\n")
+        for i, (raiz, cantidad) in enumerate(zip(resultado['raices'], resultado['puntos_por_raiz'])):
+            resumen += f"Raíz {i + 1}: ({raiz[0]:.8f}, {raiz[1]:.8f}) alcanzada desde {cantidad} puntos\n"
+        resumen += f"Sin convergencia: {np.count_nonzero(resultado['indice_raiz'] < 0)} puntos\n"
+        self._insert_text_in_widget(self.basins_summary_text, resumen)
+        self.basins_summary_text.config(state=tk.DISABLED)
+        self._plot_newton_basins(resultado)
+
+    def _plot_newton_basins(self, resultado):
+        for widget in self.newton_basins_plot_frame.winfo_children():
+            widget.destroy()
+
+        fig = plt.Figure(figsize=(10, 4.5), dpi=100)
+        ax_raiz, ax_iter = fig.add_subplot(121), fig.add_subplot(122)
+        extension = (resultado['X'][0, 0], resultado['X'][0, -1], resultado['Y'][0, 0], resultado['Y'][-1, 0])
+
+        # Un color por raíz; negro para los puntos sin convergencia
+        num_raices = len(resultado['raices'])
+        colores = ['black'] + [plt.get_cmap('tab10')(i % 10) for i in range(num_raices)]
+        ax_raiz.imshow(resultado['indice_raiz'] + 1, origin='lower', extent=extension, aspect='auto',
+                       cmap=ListedColormap(colores), vmin=-0.5, vmax=num_raices + 0.5, interpolation='nearest')
+        ax_raiz.set_title('Raíz alcanzada (negro: sin convergencia)')
+
+        imagen_iter = ax_iter.imshow(resultado['iteraciones'], origin='lower', extent=extension, aspect='auto',
+                                     cmap='viridis', interpolation='nearest')
+        fig.colorbar(imagen_iter, ax=ax_iter, label='Iteraciones')
+        ax_iter.set_title('Iteraciones realizadas')
+
+        for ax in (ax_raiz, ax_iter):
+            if num_raices:
+                ax.plot(resultado['raices'][:, 0], resultado['raices'][:, 1], 'wx', markersize=8, mew=2)
+            ax.set_xlabel('x₀')
+            ax.set_ylabel('y₀')
+        fig.tight_layout()
+
+        canvas = FigureCanvasTkAgg(fig, master=self.newton_basins_plot_frame)
+        canvas.draw()
+        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.newton_basins_plot_canvas = canvas
+
     def open_sor_window(self):
         if self.sor_window and self.sor_window.winfo_exists(): self.sor_window.lift(); return
         self.sor_window = tk.Toplevel(self.root);
@@ -727,7 +892,7 @@ class RootFindingApp:
         # Frame para parámetros (debajo del área de entrada)
         params_frame = ttk.Frame(self.sor_window);
         params_frame.pack(pady=10)
-        ttk.Label(params_frame, text="Factor Relajación (w):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
+        ttk.Label(params_frame, text="Factor Relajación (w o 'auto'):").grid(row=0, column=0, padx=5, pady=2, sticky="w")
         self.entry_w_sor = ttk.Entry(params_frame, width=10);
         self.entry_w_sor.grid(row=0, column=1, padx=5, pady=2);
         self.entry_w_sor.insert(0, "1.0")
@@ -815,7 +980,7 @@ class RootFindingApp:
                 except ValueError:
                     x0_list.append(0.0)
             x0_np = np.array(x0_list, dtype=float)
-            w = float(self.entry_w_sor.get());
+            w = self._parse_w_factor(self.entry_w_sor.get());
             tol = float(self.entry_tol_sor.get());
             max_iter = int(self.entry_max_iter_sor.get())
             resultado = newton_relaxed.resolver_sistema_sor(A_np, b_np, w, tol, max_iter, x_inicial_np=x0_np)
@@ -986,7 +1151,7 @@ class RootFindingApp:
         self.entry_max_iter_comp = ttk.Entry(params_frame, width=10);
         self.entry_max_iter_comp.grid(row=0, column=3, padx=5, pady=2);
         self.entry_max_iter_comp.insert(0, "100")
-        ttk.Label(params_frame, text="Factor Relajación (w para SOR):").grid(row=1, column=0, padx=5, pady=2,
+        ttk.Label(params_frame, text="Factor Relajación (w o 'auto' para SOR):").grid(row=1, column=0, padx=5, pady=2,
                                                                              sticky="w")
         self.entry_w_comp = ttk.Entry(params_frame, width=10);
         self.entry_w_comp.grid(row=1, column=1, padx=5, pady=2);
@@ -1087,14 +1252,14 @@ class RootFindingApp:
                 float(val_str) if val_str else 0.0)
             tol = float(self.entry_tol_comp.get());
             max_iter = int(self.entry_max_iter_comp.get());
-            w_sor = float(self.entry_w_comp.get())
+            w_sor = self._parse_w_factor(self.entry_w_comp.get())
             A_np = np.array(A_list, dtype=float);
             b_np = np.array(b_list, dtype=float);
             x0_np = np.array(x0_list, dtype=float)
 
             # --- Ejecución LU (y guardar solución si éxito) ---
             try:
-                resultado_lu = lu_with_pivot.resolver_sistema_lu(A_np, b_np)
+                resultado_lu = lu_with_pivot.resolver_sistema_lu(A_np, b_np, cache=CACHE_LU_COMPARTIDA)
                 if isinstance(resultado_lu, str):
                     self._show_error_in_text(self.compare_results_text_lu, resultado_lu)
                 else:
@@ -1309,6 +1474,11 @@ class RootFindingApp:
         text_widget.insert(tk.END, message)
         # No se deshabilita aquí, se hará al final de la operación principal
 
+    def _parse_w_factor(self, texto):
+        """Factor de relajación de SOR: un número o 'auto' para estimarlo (lanza ValueError si no es válido)."""
+        texto = texto.strip()
+        return 'auto' if texto.lower() == 'auto' else float(texto)
+
     def _check_window_ready(self, window, matrix_size):
         if not window or not window.winfo_exists() or matrix_size == 0:
             return False
@@ -1338,8 +1508,18 @@ class RootFindingApp:
                 f"Solución final x:\n{np.array2string(resultado.get('solucion', np.array([])), precision=10, suppress_small=True)}\n\n"
                 f"Iteraciones realizadas: {resultado.get('iteraciones_realizadas', 'N/A')}\n"
                 f"Norma final del residuo: {resultado.get('norma_residuo_final', float('inf')):.2e}\n\n"
-                "--- Historial de Iteraciones ---\n"
             )
+            estimacion_w = resultado.get('estimacion_w')
+            if estimacion_w:
+                summary += (
+                    f"Factor de relajación estimado: w = {resultado['w_factor_usado']:.6f} "
+                    f"(ρ(B_J) ≈ {estimacion_w['radio_espectral_jacobi']:.6f}, {estimacion_w['metodo']}, "
+                    f"{estimacion_w['productos_matriz_vector']} productos A·v, "
+                    f"{estimacion_w['tiempo_segundos'] * 1e3:.1f} ms)\n\n"
+                )
+                if estimacion_w.get('advertencia'):
+                    summary += f"Advertencia: {estimacion_w['advertencia']}\n\n"
+            summary += "--- Historial de Iteraciones ---\n"
             full_message += summary
             historial = resultado.get('historial_iteraciones', [])
             if not historial:
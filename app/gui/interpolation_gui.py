@@ -7,6 +7,9 @@ from app.methods.interpolation import finite_differences
 from app.methods.interpolation import newton_divided_differences
 from app.methods.interpolation import data_resampling
 
+# Filas de derivadas que se muestran con fórmula (el texto se genera solo para estas)
+MAX_FILAS_DERIVADAS = 2000
+
 class InterpolationApp:
     def __init__(self, root):
         self.root = root
@@ -226,7 +229,9 @@ class InterpolationApp:
             resultados = finite_differences.numerical_derivatives_with_formulas(x_vals, y_vals)
             
             output = "Aproximaciones de Derivadas:\\n"
-            for r in resultados:
+            filas_mostradas = min(len(resultados), MAX_FILAS_DERIVADAS)
+            for i in range(filas_mostradas):
+                r = resultados[i]
                 output += f"Punto x = {r['x']}\n"
                 if r.get('sucesiva'):
                     output += f"  Sucesiva:  {r['sucesiva'][1]:.6f} (Fórmula: {r['sucesiva'][0]})\n"
@@ -235,6 +240,8 @@ class InterpolationApp:
                 if r.get('regresiva'):
                     output += f"  Regresiva: {r['regresiva'][1]:.6f} (Fórmula: {r['regresiva'][0]})\n"
                 output += "-\n"
+            if len(resultados) > filas_mostradas:
+                output += f"... se muestran los primeros {filas_mostradas} de {len(resultados)} puntos.\n"
             self.fd_results_text.insert(tk.END, output)
 
         except ValueError as ve:
@@ -0,0 +1,196 @@
+"""
+Evaluación de F(x, y) sobre mallas para graficar las curvas de nivel cero de un sistema 2x2.
+
+Antes el gráfico de Newton recorría una malla de 100x100 con un doble bucle de Python y
+llamaba a F punto por punto (10.000 llamadas). Aquí:
+- EvaluadorMalla intenta evaluar F sobre todos los puntos en una sola llamada (F(P) con P de
+  2 x k, que funciona con las expresiones compiladas y con cualquier F escrita con NumPy
+  como `x, y = vec`), la verifica contra evaluaciones individuales y, si F solo acepta un
+  punto, cae a la evaluación punto por punto. En ambos casos trabaja por bloques, para acotar
+  la memoria temporal y poder devolver el control a la interfaz entre bloque y bloque.
+- malla_adaptativa refina con un árbol cuaternario solo las celdas donde alguna componente
+  de F cambia de signo, es decir, cerca de las curvas F_i = 0. Con la misma resolución final
+  se evalúa una fracción de los puntos de la malla uniforme.
+"""
+
+import numpy as np
+
+# Máximo de puntos por llamada vectorizada (acota los arreglos temporales de F)
+MAX_PUNTOS_POR_BLOQUE = 65536
+# Puntos entre llamadas a `al_avanzar` cuando F se evalúa punto por punto
+PUNTOS_POR_BLOQUE_SECUENCIAL = 2048
+
+
+class EvaluadorMalla:
+    """
+    Evalúa F en lotes de puntos: evaluador(P) con P de 2 x k retorna una matriz de m x k.
+
+    Parámetros:
+    F_func (callable): F(vec) del sistema, con vec = [x, y].
+    max_puntos_por_bloque (int): Puntos por llamada en la evaluación vectorizada.
+    al_avanzar (callable, opcional): Se llama sin argumentos después de cada bloque (p. ej.
+                                     root.update_idletasks para no congelar la ventana).
+
+    La forma de evaluación se decide en el primer lote y se recuerda (ver `vectorizada`).
+    """
+
+    def __init__(self, F_func, max_puntos_por_bloque=MAX_PUNTOS_POR_BLOQUE, al_avanzar=None):
+        if max_puntos_por_bloque < 1:
+            raise ValueError("max_puntos_por_bloque debe ser un entero positivo.")
+        self.F_func = F_func
+        self.max_puntos_por_bloque = int(max_puntos_por_bloque)
+        self.al_avanzar = al_avanzar
+        self.vectorizada = None  # None hasta evaluar el primer lote
+        self.puntos_evaluados = 0
+
+    def __call__(self, puntos):
+        puntos = np.asarray(puntos, dtype=float)
+        k = puntos.shape[1]
+        if k == 0:
+            return np.empty((0, 0))
+        with np.errstate(all='ignore'): # Las zonas fuera del dominio de F solo dejan huecos en el gráfico
+            if self.vectorizada is None:
+                self.vectorizada = self._es_vectorizable(puntos[:, :min(k, self.max_puntos_por_bloque)])
+            tam_bloque = self.max_puntos_por_bloque if self.vectorizada else PUNTOS_POR_BLOQUE_SECUENCIAL
+
+            bloques = []
+            for inicio in range(0, k, tam_bloque):
+                bloque = puntos[:, inicio:inicio + tam_bloque]
+                if self.vectorizada:
+                    bloques.append(np.asarray(self.F_func(bloque), dtype=float))
+                else:
+                    bloques.append(np.column_stack([np.asarray(self.F_func(p), dtype=float) for p in bloque.T]))
+                self.puntos_evaluados += bloque.shape[1]
+                if self.al_avanzar is not None:
+                    self.al_avanzar()
+        return np.concatenate(bloques, axis=1)
+
+    def _es_vectorizable(self, muestra):
+        """
+        Prueba F sobre `muestra` completa y la compara con F en su primer y su último punto (una
+        F que reduce sobre toda la entrada puede coincidir en un solo punto).
+        """
+        try:
+            lote = np.asarray(self.F_func(muestra), dtype=float)
+        except Exception:
+            return False
+        if lote.ndim != 2 or lote.shape[1] != muestra.shape[1]:
+            return False
+        for columna in sorted({0, muestra.shape[1] - 1}):
+            referencia = np.asarray(self.F_func(muestra[:, columna]), dtype=float)
+            if referencia.shape != lote[:, columna].shape or not np.allclose(
+                    lote[:, columna], referencia, rtol=1e-12, atol=0.0, equal_nan=True):
+                return False
+        return True
+
+
+def evaluar_en_malla(F_func, X, Y, evaluador=None):
+    """
+    Evalúa F en todos los puntos de una malla (p. ej. de np.meshgrid).
+
+    Parámetros:
+    F_func (callable): F(vec) del sistema.
+    X, Y (np.array): Coordenadas de la malla, de la misma forma.
+    evaluador (EvaluadorMalla, opcional): Evaluador a reutilizar (conserva la forma de evaluación).
+
+    Retorna:
+    np.array: Z de forma X.shape + (m,), con Z[..., i] = F_i(X, Y).
+    """
+    evaluador = evaluador or EvaluadorMalla(F_func)
+    valores = evaluador(np.vstack([np.ravel(X), np.ravel(Y)]))
+    return np.moveaxis(valores.reshape((-1,) + np.shape(X)), 0, -1)
+
+
+def malla_adaptativa(F_func, limites_x, limites_y, n_base=25, niveles=3, evaluador=None):
+    """
+    Malla refinada cerca de las curvas F_i(x, y) = 0.
+
+    Se parte de una malla uniforme de n_base x n_base celdas; en cada nivel se dividen en
+    cuatro las celdas en cuyas esquinas alguna componente de F cambia de signo (o se anula).
+    Tras `niveles` divisiones la resolución junto a las curvas es la de una malla uniforme de
+    (n_base·2^niveles + 1)² puntos. Los puntos se indexan sobre esa malla fina, así que las
+    esquinas compartidas se evalúan una sola vez.
+
+    Parámetros:
+    F_func (callable): F(vec) del sistema.
+    limites_x, limites_y (tuple): (mínimo, máximo) de cada eje.
+    n_base (int): Celdas por eje de la malla inicial.
+    niveles (int): Número de refinamientos.
+    evaluador (EvaluadorMalla, opcional): Evaluador a reutilizar.
+
+    Retorna:
+    dict: {'x': np.array, 'y': np.array,           # coordenadas de los k puntos evaluados
+           'valores': np.array,                    # m x k, valores de F en esos puntos
+           'puntos_evaluados': int,
+           'puntos_malla_uniforme': int}           # puntos de la malla uniforme equivalente
+    """
+    if n_base < 1 or niveles < 0:
+        raise ValueError("n_base debe ser positivo y niveles no negativo.")
+    evaluador = evaluador or EvaluadorMalla(F_func)
+    paso = 2 ** niveles
+    N = n_base * paso
+    xs = np.linspace(limites_x[0], limites_x[1], N + 1)
+    ys = np.linspace(limites_y[0], limites_y[1], N + 1)
+
+    # Malla inicial: índices (fila -> y, columna -> x) sobre la malla fina
+    indices_base = np.arange(0, N + 1, paso)
+    filas, columnas = (a.ravel() for a in np.meshgrid(indices_base, indices_base, indexing='ij'))
+    valores_base = evaluador(np.vstack([xs[columnas], ys[filas]]))
+    Z = np.full((valores_base.shape[0], N + 1, N + 1), np.nan)
+    evaluado = np.zeros((N + 1, N + 1), dtype=bool)
+    Z[:, filas, columnas] = valores_base
+    evaluado[filas, columnas] = True
+
+    # Celdas: esquina inferior izquierda (i0, j0) y tamaño s, común a todo un nivel
+    i0, j0 = (a.ravel() for a in np.meshgrid(indices_base[:-1], indices_base[:-1], indexing='ij'))
+    s = paso
+    while s > 1 and i0.size:
+        esquinas = np.stack([Z[:, i0, j0], Z[:, i0 + s, j0], Z[:, i0, j0 + s], Z[:, i0 + s, j0 + s]])
+        # Las comparaciones con NaN dan False: las esquinas fuera del dominio no fuerzan el refinamiento
+        cruza = np.any(np.any(esquinas <= 0, axis=0) & np.any(esquinas >= 0, axis=0), axis=0)
+        i0, j0 = i0[cruza], j0[cruza]
+        h = s // 2
+
+        # Puntos medios de los lados y centro de cada celda marcada
+        nuevas_filas = np.concatenate([i0 + h, i0, i0 + h, i0 + s, i0 + h])
+        nuevas_columnas = np.concatenate([j0, j0 + h, j0 + h, j0 + h, j0 + s])
+        lineales = np.unique(np.ravel_multi_index((nuevas_filas, nuevas_columnas), evaluado.shape))
+        nuevas_filas, nuevas_columnas = np.unravel_index(lineales, evaluado.shape)
+        pendientes = ~evaluado[nuevas_filas, nuevas_columnas]
+        nuevas_filas, nuevas_columnas = nuevas_filas[pendientes], nuevas_columnas[pendientes]
+        if nuevas_filas.size:
+            Z[:, nuevas_filas, nuevas_columnas] = evaluador(np.vstack([xs[nuevas_columnas], ys[nuevas_filas]]))
+            evaluado[nuevas_filas, nuevas_columnas] = True
+
+        i0 = np.concatenate([i0, i0 + h, i0, i0 + h])
+        j0 = np.concatenate([j0, j0, j0 + h, j0 + h])
+        s = h
+
+    filas, columnas = np.nonzero(evaluado)
+    return {
+        'x': xs[columnas],
+        'y': ys[filas],
+        'valores': Z[:, filas, columnas],
+        'puntos_evaluados': int(filas.size),
+        'puntos_malla_uniforme': (N + 1) ** 2
+    }
+
+
+if __name__ == '__main__':
+    import time
+    from app.methods.root_finding.newton_raphson_no_line_relaxation import ejemplo_F_sistema_2x2
+
+    print("Probando el módulo contour_grid.py...")
+    X_p, Y_p = np.meshgrid(np.linspace(0, 4, 100), np.linspace(1, 5, 100))
+    for nombre, F_p in (("vectorizada", ejemplo_F_sistema_2x2),
+                        ("punto a punto", lambda v: np.array([float(v[0]) ** 2 + v[0] * v[1] - 10,
+                                                              v[1] + 3 * v[0] * v[1] ** 2 - 57]))):
+        evaluador_p = EvaluadorMalla(F_p)
+        inicio_p = time.perf_counter()
+        Z_p = evaluar_en_malla(F_p, X_p, Y_p, evaluador_p)
+        print(f"  {nombre:<13}: Z {Z_p.shape}, vectorizada = {evaluador_p.vectorizada}, "
+              f"{time.perf_counter() - inicio_p:.4f} s")
+
+    malla_p = malla_adaptativa(ejemplo_F_sistema_2x2, (0, 4), (1, 5), n_base=25, niveles=3)
+    print(f"Malla adaptativa: {malla_p['puntos_evaluados']} puntos evaluados en lugar de "
+          f"{malla_p['puntos_malla_uniforme']} de la malla uniforme equivalente")
@@ -0,0 +1,187 @@
+"""
+Método de Interpolación Baricéntrica de Lagrange
+
+Descripción:
+Construye el mismo polinomio interpolante que el método de Newton por diferencias divididas,
+pero escrito en la forma baricéntrica. Los pesos w_j dependen solo de los nodos x_j, por lo
+que se calculan una vez por conjunto de nodos y se reutilizan para cualquier serie de valores y.
+Cada evaluación cuesta O(n) por punto y la fórmula es numéricamente más estable que la forma
+de Newton, sobre todo con muchos nodos.
+
+Fórmulas:
+w_j = 1 / Π_{k != j} (x_j - x_k)
+P(x) = [Σ_j w_j y_j / (x - x_j)] / [Σ_j w_j / (x - x_j)]      (segunda forma baricéntrica)
+Si x coincide con un nodo x_j, P(x) = y_j.
+
+Aplicaciones:
+- Interpolación de muchas series de datos sobre los mismos nodos
+- Re-muestreo de datos a una malla nueva
+
+Requisitos:
+- No requiere que los puntos estén igualmente espaciados
+- Los nodos deben ser distintos
+"""
+
+import hashlib
+from collections import OrderedDict
+
+import numpy as np
+
+# Conjuntos de nodos cuyos pesos se conservan en caché
+WEIGHT_CACHE_SIZE = 32
+# Elementos de la matriz temporal 1/(x - x_j) por bloque de evaluación
+BARYCENTRIC_BLOCK_ELEMENTS = 2 ** 20
+
+_weight_cache = OrderedDict()
+
+def _nodes_key(x_vals):
+    """Clave de caché: hash del contenido binario de los nodos (y de su cantidad)."""
+    digest = hashlib.blake2b(x_vals.tobytes(), digest_size=16)
+    digest.update(str(len(x_vals)).encode())
+    return digest.hexdigest()
+
+def _compute_weights(x_vals):
+    """
+    Calcula los pesos normalizados (max |w_j| = 1).
+    Los productos se acumulan como suma de logaritmos para que no desborden con muchos
+    nodos; escalar todos los pesos por una constante no cambia la segunda forma baricéntrica.
+    """
+    n = len(x_vals)
+    log_abs = np.empty(n)
+    negatives = np.empty(n, dtype=np.int64)
+    rows_per_block = max(1, BARYCENTRIC_BLOCK_ELEMENTS // max(n, 1))
+    for start in range(0, n, rows_per_block):
+        stop = min(start + rows_per_block, n)
+        differences = x_vals[start:stop, None] - x_vals[None, :]
+        differences[np.arange(stop - start), np.arange(start, stop)] = 1.0 # Excluir k = j
+        close_to_zero = np.isclose(differences, 0.0)
+        if close_to_zero.any():
+            row, k = np.argwhere(close_to_zero)[0]
+            raise ValueError(f"Error: División por cero detectada. x_vals[{start + row}] y x_vals[{k}] son muy cercanos o iguales.")
+        log_abs[start:stop] = np.log(np.abs(differences)).sum(axis=1)
+        negatives[start:stop] = np.count_nonzero(differences < 0, axis=1)
+    signs = np.where(negatives % 2 == 0, 1.0, -1.0)
+    return signs * np.exp(log_abs.min() - log_abs)
+
+def barycentric_weights(x_vals, use_cache=True):
+    """
+    Retorna los pesos baricéntricos de los nodos x_vals.
+
+    Los pesos se guardan en una caché indexada por un hash de los nodos, así que llamar de
+    nuevo con los mismos nodos (p. ej. para otra serie de y) no repite el cálculo O(n²).
+    El array retornado es de solo lectura porque se comparte entre llamadas.
+    """
+    x_vals = np.ascontiguousarray(x_vals, dtype=float)
+    if x_vals.ndim != 1 or len(x_vals) == 0:
+        raise ValueError("x_vals debe ser un array unidimensional no vacío.")
+    if not use_cache:
+        return _compute_weights(x_vals)
+
+    key = _nodes_key(x_vals)
+    cached = _weight_cache.get(key)
+    if cached is not None and np.array_equal(cached[0], x_vals):
+        _weight_cache.move_to_end(key)
+        return cached[1]
+
+    weights = _compute_weights(x_vals)
+    weights.flags.writeable = False
+    nodes = x_vals.copy()
+    nodes.flags.writeable = False
+    _weight_cache[key] = (nodes, weights)
+    while len(_weight_cache) > WEIGHT_CACHE_SIZE:
+        _weight_cache.popitem(last=False)
+    return weights
+
+def clear_weight_cache():
+    """Vacía la caché de pesos baricéntricos."""
+    _weight_cache.clear()
+
+def evaluate_barycentric(x_vals, y_vals, x_eval, weights=None):
+    """
+    Evalúa el polinomio interpolante en forma baricéntrica.
+
+    Parámetros:
+    x_vals: Nodos (n,).
+    y_vals: Valores (n,) o varias series en columnas (n, s).
+    x_eval: Punto (escalar) o array de puntos de cualquier forma.
+    weights: Pesos precalculados; por defecto se obtienen de barycentric_weights (con caché).
+
+    Retorna:
+    float o np.ndarray de forma x_eval.shape + y_vals.shape[1:].
+    """
+    x_vals = np.ascontiguousarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    if len(x_vals) != len(y_vals):
+        raise ValueError("Los arrays x_vals e y_vals deben tener la misma longitud.")
+    if y_vals.ndim not in (1, 2):
+        raise ValueError("y_vals debe ser un array (n,) o (n, s).")
+    weights = barycentric_weights(x_vals) if weights is None else np.asarray(weights, dtype=float)
+
+    x_eval_arr = np.asarray(x_eval, dtype=float)
+    points = x_eval_arr.reshape(-1)
+    n = len(x_vals)
+    series = y_vals.reshape(n, -1)
+    weighted_y = weights[:, None] * series
+    result = np.empty((points.size, series.shape[1]))
+
+    # Puntos que coinciden exactamente con un nodo (se ubican con búsqueda binaria): P(x_j) = y_j
+    order = np.argsort(x_vals)
+    positions = np.minimum(np.searchsorted(x_vals[order], points), n - 1)
+    exact_points = np.nonzero(x_vals[order][positions] == points)[0]
+
+    # Cada bloque forma la matriz C[i, j] = 1 / (t_i - x_j) y reduce con productos matriciales
+    points_per_block = max(1, BARYCENTRIC_BLOCK_ELEMENTS // n)
+    cauchy_buffer = np.empty((min(points_per_block, points.size), n))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        for start in range(0, points.size, points_per_block):
+            t = points[start:start + points_per_block]
+            cauchy = cauchy_buffer[:t.size]
+            np.subtract(t[:, None], x_vals[None, :], out=cauchy)
+            np.reciprocal(cauchy, out=cauchy)
+            result[start:start + t.size] = (cauchy @ weighted_y) / (cauchy @ weights)[:, None]
+    result[exact_points] = series[order[positions[exact_points]]]
+
+    result = result.reshape(x_eval_arr.shape + y_vals.shape[1:])
+    return float(result) if result.ndim == 0 else result
+
+if __name__ == '__main__':
+    import time
+    from . import newton_divided_differences
+
+    print("--- Ejecutando pruebas para: barycentric_interpolation.py ---")
+    x_test = np.array([0, 0.5, 1, 1.5, 2], dtype=float)
+    y_test = np.array([0, 2.5, 5.8, 8.5, 10.2], dtype=float)
+    print(f"Probando con x = {x_test}, y = {y_test}")
+    print(f"Pesos baricéntricos (normalizados): {barycentric_weights(x_test)}")
+    for x_eval_point in (1.25, 5.0, 1.5):
+        print(f"Interpolación en x = {x_eval_point}: P(x) = {evaluate_barycentric(x_test, y_test, x_eval_point):.4f}")
+
+    # Varias series sobre los mismos nodos: los pesos se calculan una sola vez
+    n_nodos = 2000
+    x_cheb = np.cos(np.pi * (2 * np.arange(n_nodos) + 1) / (2 * n_nodos)) # Nodos de Chebyshev
+    x_nuevos = np.linspace(-1, 1, 100001)
+    clear_weight_cache()
+    inicio = time.perf_counter()
+    barycentric_weights(x_cheb)
+    t_pesos = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    barycentric_weights(x_cheb)
+    t_cache = time.perf_counter() - inicio
+    print(f"\nPesos para {n_nodos} nodos: {t_pesos:.4f} s la primera vez, {t_cache:.6f} s desde la caché")
+
+    series = np.column_stack([np.exp(x_cheb), np.sin(5 * x_cheb), 1 / (1 + 25 * x_cheb**2)])
+    inicio = time.perf_counter()
+    y_nuevos = evaluate_barycentric(x_cheb, series, x_nuevos)
+    t_eval = time.perf_counter() - inicio
+    exactos = np.column_stack([np.exp(x_nuevos), np.sin(5 * x_nuevos), 1 / (1 + 25 * x_nuevos**2)])
+    print(f"3 series evaluadas en {len(x_nuevos)} puntos en {t_eval:.3f} s; "
+          f"error máximo: {np.max(np.abs(y_nuevos - exactos)):.2e}")
+
+    # Con muchos nodos la forma de Newton pierde precisión; la baricéntrica no
+    x_medio = np.cos(np.pi * (2 * np.arange(60) + 1) / 120)
+    coef_newton = newton_divided_differences.compute_newton_coefficients(x_medio, np.exp(x_medio))
+    error_newton = np.max(np.abs(newton_divided_differences.evaluate_newton_polynomial(x_medio, coef_newton, x_nuevos) - np.exp(x_nuevos)))
+    error_bary = np.max(np.abs(evaluate_barycentric(x_medio, np.exp(x_medio), x_nuevos) - np.exp(x_nuevos)))
+    print(f"60 nodos de Chebyshev, f = exp: error Newton = {error_newton:.2e}, error baricéntrico = {error_bary:.2e}")
+
+    print("--- Fin de pruebas para: barycentric_interpolation.py ---")
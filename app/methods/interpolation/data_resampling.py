@@ -1,22 +1,121 @@
 import numpy as np
 from . import newton_divided_differences # Usamos importación relativa
+from . import barycentric_interpolation
+
+# Backends de interpolación disponibles para el re-muestreo
+RESAMPLING_BACKENDS = ('newton', 'barycentric')
+# Puntos de salida por bloque en el modo por ventanas (acota la memoria temporal)
+PIECEWISE_CHUNK_SIZE = 65536
+
+def evaluate_piecewise_newton(x_original: np.ndarray,
+                              y_original: np.ndarray,
+                              x_eval: np.ndarray,
+                              degree: int = 3,
+                              chunk_size: int = PIECEWISE_CHUNK_SIZE,
+                              out: np.ndarray = None):
+    """
+    Interpola con polinomios de Newton locales de grado `degree` sobre ventanas deslizantes.
+
+    Cada punto t usa los degree+1 nodos consecutivos más cercanos al intervalo
+    [x_i, x_{i+1}] que lo contiene (centrados en él, o pegados al borde cerca de los
+    extremos). El intervalo se obtiene con np.searchsorted y los coeficientes de todas las
+    ventanas de un bloque se calculan juntos con la misma recurrencia por columnas de
+    newton_divided_differences, así que el costo es O(m·k²) para m puntos y el polinomio no
+    oscila como el global cuando hay muchos nodos.
+
+    Args:
+        x_original (np.ndarray): Valores x originales, estrictamente crecientes.
+        y_original (np.ndarray): Valores y originales correspondientes a x_original.
+        x_eval (np.ndarray): Puntos donde evaluar (cualquier forma).
+        degree (int): Grado k de cada polinomio local (se reduce a n-1 si hay pocos nodos).
+        chunk_size (int): Puntos de salida procesados por bloque.
+        out (np.ndarray, opcional): Array de la forma de x_eval donde escribir el resultado
+            (p. ej. un np.memmap).
+
+    Returns:
+        np.ndarray: Los valores interpolados, con la forma de x_eval.
+
+    Raises:
+        ValueError: Si x_original no es estrictamente creciente, degree es negativo o
+            chunk_size no es positivo.
+    """
+    x_original = np.asarray(x_original, dtype=float)
+    y_original = np.asarray(y_original, dtype=float)
+    n = len(x_original)
+    if n == 0 or n != len(y_original):
+        raise ValueError("Los arrays x_original e y_original deben tener la misma longitud y no estar vacíos.")
+    if int(degree) != degree or degree < 0:
+        raise ValueError("El grado (degree) debe ser un entero no negativo.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size debe ser un entero positivo.")
+    if np.any(np.diff(x_original) <= 0):
+        raise ValueError("x_original debe ser estrictamente creciente para el re-muestreo por ventanas.")
+
+    k = min(int(degree), n - 1)
+    x_eval = np.asarray(x_eval, dtype=float)
+    if out is None:
+        out = np.empty(x_eval.shape)
+    elif out.shape != x_eval.shape:
+        raise ValueError("El array 'out' debe tener la misma forma que x_eval.")
+    x_flat = x_eval.reshape(-1)
+    out_flat = out.reshape(-1) # Vista si out es contiguo
+    offsets = np.arange(k + 1)
+
+    for start in range(0, x_flat.size, int(chunk_size)):
+        t = x_flat[start:start + chunk_size]
+        # Intervalo que contiene a t y primera fila de su ventana
+        interval = np.searchsorted(x_original, t, side='right') - 1
+        first = np.clip(interval - k // 2, 0, n - k - 1)
+        # Solo las ventanas distintas del bloque (con x creciente suelen ser pocas y consecutivas)
+        if first.size and np.all(first[1:] >= first[:-1]) and first[-1] - first[0] < first.size:
+            windows = np.arange(first[0], first[-1] + 1)
+            which = first - first[0]
+        else:
+            windows, which = np.unique(first, return_inverse=True)
+        X = x_original[windows[:, None] + offsets]
+        C = y_original[windows[:, None] + offsets]
+        for j in range(1, k + 1):
+            C[:, j:] = (C[:, j:] - C[:, j-1:-1]) / (X[:, j:] - X[:, :k+1-j])
+        X, C = X[which], C[which]
+        # Horner generalizado, igual que evaluate_newton_polynomial pero con nodos por fila
+        result = C[:, k].copy()
+        for i in range(k - 1, -1, -1):
+            result *= t - X[:, i]
+            result += C[:, i]
+        out_flat[start:start + chunk_size] = result
+    if not np.shares_memory(out_flat, out):
+        out[...] = out_flat.reshape(out.shape)
+    return out
 
 def resample_data_newton(x_original: np.ndarray, 
                          y_original: np.ndarray, 
                          x_target_start: float, 
                          x_target_end: float, 
-                         new_h: float):
+                         new_h: float,
+                         backend: str = 'newton',
+                         degree: int = None,
+                         chunk_size: int = PIECEWISE_CHUNK_SIZE):
     """
     Re-muestrea los datos (x_original, y_original) para un nuevo conjunto de puntos x
     definidos por un rango [x_target_start, x_target_end] y un nuevo paso new_h,
     utilizando la interpolación polinómica de Newton.
 
+    Con backend='barycentric' se evalúa el mismo polinomio en forma baricéntrica: los pesos
+    se reutilizan (caché) si los nodos se repiten y el resultado es más estable con muchos nodos.
+
+    Con degree=k se usa el modo local: polinomios de Newton de grado k sobre ventanas de k+1
+    puntos (ver evaluate_piecewise_newton). Es el modo adecuado para señales largas, donde el
+    polinomio global cuesta O(n²) y oscila (fenómeno de Runge).
+
     Args:
         x_original (np.ndarray): Valores x originales.
         y_original (np.ndarray): Valores y originales correspondientes a x_original.
         x_target_start (float): Valor inicial para los nuevos puntos x re-muestreados.
         x_target_end (float): Valor final para los nuevos puntos x re-muestreados.
         new_h (float): Nuevo paso deseado entre los puntos x re-muestreados.
+        backend (str): 'newton' (diferencias divididas, por defecto) o 'barycentric'.
+        degree (int, opcional): Grado de los polinomios locales. None = un polinomio global.
+        chunk_size (int): Puntos de salida por bloque en el modo local.
 
     Returns:
         tuple[np.ndarray, np.ndarray]: Una tupla conteniendo:
@@ -27,6 +126,8 @@ def resample_data_newton(x_original: np.ndarray,
         ValueError: Si new_h es cero o negativo, o si x_target_start > x_target_end.
         ValueError: Si los arrays originales x e y no tienen la misma longitud o están vacíos.
         ValueError: Si no se pueden construir los coeficientes de Newton (e.g., x_original no es adecuado).
+        ValueError: Si el backend no es uno de RESAMPLING_BACKENDS.
+        ValueError: Si se pide el modo local (degree) con un backend distinto de 'newton'.
     """
     if not isinstance(x_original, np.ndarray):
         x_original = np.array(x_original, dtype=float)
@@ -42,17 +143,26 @@ def resample_data_newton(x_original: np.ndarray,
         raise ValueError("El nuevo paso (new_h) debe ser positivo.")
     if x_target_start > x_target_end:
         raise ValueError("x_target_start no puede ser mayor que x_target_end.")
+    if backend not in RESAMPLING_BACKENDS:
+        raise ValueError(f"Backend de interpolación desconocido: '{backend}'. Opciones: {', '.join(RESAMPLING_BACKENDS)}.")
+    if degree is not None and backend != 'newton':
+        raise ValueError("El modo por ventanas (degree) solo está disponible con el backend 'newton'.")
 
-    # 1. Construir el polinomio de Newton con (x_original, y_original)
+    # 1. Construir el polinomio con (x_original, y_original)
     try:
-        value_table, _ = newton_divided_differences.build_divided_difference_table(x_original, y_original)
-        coefficients = newton_divided_differences.get_newton_coefficients(value_table)
+        if degree is not None:
+            pass # Los polinomios locales se construyen por bloques al evaluar
+        elif backend == 'barycentric':
+            # Pesos baricéntricos (se reutilizan desde la caché si los nodos ya se usaron)
+            weights = barycentric_interpolation.barycentric_weights(x_original)
+        else:
+            # Solo se necesitan los coeficientes: se calculan en O(n) memoria, sin la tabla completa
+            coefficients = newton_divided_differences.compute_newton_coefficients(x_original, y_original)
+            if len(coefficients) == 0:
+                raise ValueError("No se pudieron obtener los coeficientes del polinomio de Newton.")
     except Exception as e:
         raise ValueError(f"Error al construir el polinomio de Newton: {e}")
 
-    if not coefficients: # o len(coefficients) == 0
-         raise ValueError("No se pudieron obtener los coeficientes del polinomio de Newton.")
-
     # 2. Generar los new_x_points
     # Calculamos el número de puntos para np.linspace para incluir el punto final correctamente.
     if x_target_start == x_target_end: # Caso de un solo punto
@@ -71,7 +181,13 @@ def resample_data_newton(x_original: np.ndarray,
 
 
     # 3. Evaluar el polinomio en new_x_points para obtener new_y_points
-    new_y_points = np.array([newton_divided_differences.evaluate_newton_polynomial(x_original, coefficients, x_val) for x_val in new_x_points])
+    if degree is not None:
+        new_y_points = evaluate_piecewise_newton(x_original, y_original, new_x_points, degree, chunk_size)
+    elif backend == 'barycentric':
+        new_y_points = barycentric_interpolation.evaluate_barycentric(x_original, y_original, new_x_points, weights)
+    else:
+        # (Horner vectorizado sobre todo el array, por bloques)
+        new_y_points = newton_divided_differences.evaluate_newton_polynomial(x_original, coefficients, new_x_points)
 
     return new_x_points, new_y_points
 
@@ -112,6 +228,30 @@ if __name__ == '__main__':
         x_h_large, y_h_large = resample_data_newton(x_orig_test, y_orig_test, 0, 4, 5.0) # h > rango
         print(f"x_h_large: {x_h_large}, y_h_large: {y_h_large}") # Debería dar al menos el punto inicial.
 
+        print("\\nProbando re-muestreo a un millón de puntos:")
+        import time
+        inicio = time.perf_counter()
+        x_millon, y_millon = resample_data_newton(x_orig_test, y_orig_test, 0, 4, 4e-6)
+        print(f"{len(x_millon)} puntos en {time.perf_counter() - inicio:.4f} s, "
+              f"error máximo contra x^2: {np.max(np.abs(y_millon - x_millon**2)):.2e}")
+
+        print("\\nProbando el backend baricéntrico:")
+        x_bar, y_bar = resample_data_newton(x_orig_test, y_orig_test, x_start_test, x_end_test, h_new_test, backend='barycentric')
+        print(f"Nuevos y: {y_bar}")
+        print(f"  Diferencia máxima con el backend de Newton: {np.max(np.abs(y_bar - y_resampled)):.2e}")
+
+        print("\\nProbando el modo por ventanas (Newton de grado 3) contra el polinomio global:")
+        x_runge = np.linspace(-1, 1, 41)
+        y_runge = 1 / (1 + 25 * x_runge**2)
+        for grado in (None, 3):
+            x_r, y_r = resample_data_newton(x_runge, y_runge, -1, 1, 0.001, degree=grado)
+            print(f"  degree={grado}: error máximo contra 1/(1+25x^2) = {np.max(np.abs(y_r - 1 / (1 + 25 * x_r**2))):.2e}")
+        x_senal = np.linspace(0, 100, 10**6)
+        inicio = time.perf_counter()
+        x_r, y_r = resample_data_newton(x_senal, np.sin(x_senal), 0, 100, 1e-4, degree=3)
+        print(f"  Señal de {len(x_senal)} muestras re-muestreada a {len(x_r)} puntos en "
+              f"{time.perf_counter() - inicio:.3f} s, error máximo: {np.max(np.abs(y_r - np.sin(x_r))):.2e}")
+
     except ValueError as ve:
         print(f"Error durante la prueba: {ve}")
     except Exception as e:
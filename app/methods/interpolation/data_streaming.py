@@ -0,0 +1,370 @@
+"""
+Lectura por bloques de archivos de muestras (x, y) y procesamiento en flujo.
+
+resample_data_newton y numerical_derivatives_with_formulas trabajan con x e y completos en
+memoria. Para archivos de varios gigabytes este módulo:
+- abre la fuente con open_samples: archivos .npy y binarios crudos se mapean con np.memmap
+  (solo se leen las páginas que se tocan) y los CSV se leen de a chunk_size filas;
+- recorre la fuente hacia adelante, bloque por bloque, conservando solo las pocas muestras
+  del bloque anterior que necesita cada método (la "cola");
+- escribe el resultado en un .npy abierto con np.lib.format.open_memmap, así que la salida
+  tampoco tiene que caber en memoria y después se puede abrir con np.load(..., mmap_mode='r').
+
+La memoria usada queda acotada por chunk_size, sin importar el tamaño del archivo.
+"""
+
+import itertools
+import os
+
+import numpy as np
+from . import data_resampling
+from . import finite_differences
+
+# Filas por bloque al recorrer una fuente
+STREAM_CHUNK_SIZE = 1 << 20
+# Extensiones que se leen como binario crudo con np.memmap
+BINARY_EXTENSIONS = ('.bin', '.dat', '.raw')
+# Inicio de comentario en los CSV (el valor por defecto de np.loadtxt)
+CSV_COMMENT = '#'
+
+
+def _data_lines(file, skip_header):
+    """
+    Genera las líneas con datos de un CSV con las mismas reglas que np.loadtxt: se omiten las
+    skip_header primeras líneas, se quita lo que sigue a CSV_COMMENT y se descartan las vacías.
+    """
+    for line in itertools.islice(file, skip_header, None):
+        content = line.split(CSV_COMMENT, 1)[0]
+        if content.strip():
+            yield content
+
+
+def _mark_last(chunks):
+    """
+    Recorre (inicio, x, y) adelantando un bloque y genera (inicio, x, y, es_ultimo), así el
+    último bloque se detecta al agotarse la fuente y no comparando con un conteo previo.
+    """
+    previous = next(chunks, None)
+    for current in chunks:
+        yield previous + (False,)
+        previous = current
+    if previous is not None:
+        yield previous + (True,)
+
+
+def _check_rows_read(source, rows_read):
+    """Verifica que se leyeron las source.n muestras contadas al abrir la fuente."""
+    if rows_read != source.n:
+        raise ValueError(f"Se leyeron {rows_read} muestras de '{source.path}' y se esperaban {source.n} "
+                         "(¿el archivo cambió después de abrirlo?).")
+
+
+class SampleSource:
+    """
+    Fuente de muestras (x, y) que se recorre por bloques con `chunks`.
+
+    No se crea directamente: usar open_samples. Atributos:
+    path (str): Archivo de origen.
+    n (int): Cantidad de muestras.
+    """
+
+    def __init__(self, path, n, data=None, x_column=0, y_column=1, x_start=None, x_step=None,
+                 delimiter=',', skip_header=0):
+        self.path = path
+        self.n = n
+        self._data = data # np.memmap (o None para CSV)
+        self._x_column = x_column
+        self._y_column = y_column
+        self._x_start = x_start
+        self._x_step = x_step
+        self._delimiter = delimiter
+        self._skip_header = skip_header
+
+    def __len__(self):
+        return self.n
+
+    def _split(self, start, block):
+        """Separa un bloque de filas leídas en arrays x e y de float (copias en memoria)."""
+        if block.ndim == 1 or self._x_start is not None:
+            y = np.array(block if block.ndim == 1 else block[:, self._y_column], dtype=float)
+            x = self._x_start + self._x_step * np.arange(start, start + len(y), dtype=float)
+        else:
+            x = np.array(block[:, self._x_column], dtype=float)
+            y = np.array(block[:, self._y_column], dtype=float)
+        return x, y
+
+    def chunks(self, chunk_size=STREAM_CHUNK_SIZE):
+        """
+        Genera (inicio, x, y) para bloques consecutivos de a lo sumo chunk_size muestras.
+        """
+        if chunk_size < 1:
+            raise ValueError("chunk_size debe ser un entero positivo.")
+        if self._data is not None:
+            for start in range(0, self.n, chunk_size):
+                x, y = self._split(start, self._data[start:start + chunk_size])
+                yield start, x, y
+            return
+
+        with open(self.path, 'r') as file:
+            lines = _data_lines(file, self._skip_header)
+            start = 0
+            while True:
+                block_lines = list(itertools.islice(lines, chunk_size))
+                if not block_lines:
+                    return
+                block = np.loadtxt(block_lines, delimiter=self._delimiter, ndmin=2)
+                x, y = self._split(start, block[:, 0] if block.shape[1] == 1 else block)
+                yield start, x, y
+                start += len(x)
+
+
+def open_samples(path, x_column=0, y_column=1, x_start=None, x_step=None, delimiter=',',
+                 skip_header=0, dtype='float64', n_columns=2):
+    """
+    Abre un archivo de muestras sin cargarlo en memoria.
+
+    Args:
+        path (str): Archivo .npy, CSV (.csv/.txt) o binario crudo (.bin/.dat/.raw).
+        x_column, y_column (int): Columnas de x e y cuando el archivo tiene varias.
+        x_start, x_step (float, opcional): Malla x = x_start + i*x_step para archivos con
+            solo la columna y (o para ignorar la columna x). Deben darse juntos.
+        delimiter (str): Separador de columnas del CSV.
+        skip_header (int): Líneas de encabezado a omitir en el CSV. Como en np.loadtxt, las
+            líneas vacías y los comentarios (desde CSV_COMMENT) se omiten siempre.
+        dtype (str): Tipo de dato del binario crudo.
+        n_columns (int): Columnas por fila del binario crudo.
+
+    Returns:
+        SampleSource: La fuente, lista para recorrer con `chunks`.
+
+    Raises:
+        ValueError: Si el formato no es reconocido, la forma de los datos no es válida o
+            falta la malla x.
+    """
+    if (x_start is None) != (x_step is None):
+        raise ValueError("x_start y x_step deben indicarse juntos.")
+    if x_step is not None and x_step <= 0:
+        raise ValueError("x_step debe ser positivo.")
+    grid = dict(x_start=x_start, x_step=x_step)
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == '.npy' or extension in BINARY_EXTENSIONS:
+        if extension == '.npy':
+            data = np.load(path, mmap_mode='r') # np.memmap sobre el archivo
+        else:
+            data = np.memmap(path, dtype=dtype, mode='r')
+            if n_columns > 1:
+                if data.size % n_columns:
+                    raise ValueError(f"El tamaño del archivo no es múltiplo de {n_columns} columnas.")
+                data = data.reshape(-1, n_columns)
+        if data.ndim not in (1, 2):
+            raise ValueError("El archivo debe contener un array de una o dos dimensiones.")
+        if data.ndim == 1 and x_start is None:
+            raise ValueError("El archivo solo tiene valores y: indique x_start y x_step.")
+        if data.ndim == 2 and max(x_column, y_column) >= data.shape[1]:
+            raise ValueError(f"El archivo tiene {data.shape[1]} columnas.")
+        return SampleSource(path, len(data), data, x_column, y_column, **grid)
+
+    if extension in ('.csv', '.txt'):
+        with open(path, 'r') as file:
+            lines = _data_lines(file, skip_header)
+            first = next(lines, None)
+            n = 0 if first is None else 1 + sum(1 for _ in lines)
+        if first is not None:
+            n_fields = len(first.split(delimiter))
+            if n_fields == 1 and x_start is None:
+                raise ValueError("El archivo solo tiene valores y: indique x_start y x_step.")
+            if n_fields > 1 and max(x_column, y_column) >= n_fields:
+                raise ValueError(f"El archivo tiene {n_fields} columnas.")
+        return SampleSource(path, n, None, x_column, y_column, delimiter=delimiter,
+                            skip_header=skip_header, **grid)
+
+    raise ValueError(f"Formato de archivo no reconocido: '{extension}'. Use .npy, .csv/.txt o {'/'.join(BINARY_EXTENSIONS)}.")
+
+
+def stream_resample(source, x_target_start, x_target_end, new_h, output_path, degree=3,
+                    chunk_size=STREAM_CHUNK_SIZE):
+    """
+    Re-muestrea una fuente por bloques con el modo por ventanas de data_resampling
+    (polinomios de Newton locales de grado `degree`) y escribe (x, y) en un .npy.
+
+    Los puntos nuevos son los mismos que genera resample_data_newton para el rango y el paso
+    dados, y los valores coinciden con evaluate_piecewise_newton sobre todos los datos: un
+    punto solo se evalúa cuando su ventana ya está completa dentro de las muestras leídas.
+
+    Args:
+        source (SampleSource): Fuente abierta con open_samples (x estrictamente creciente).
+        x_target_start, x_target_end (float): Rango de los nuevos puntos.
+        new_h (float): Nuevo paso.
+        output_path (str): Archivo .npy de salida, de forma (m, 2) con columnas x, y.
+        degree (int): Grado de los polinomios locales.
+        chunk_size (int): Muestras de entrada (y puntos de salida) por bloque.
+
+    Returns:
+        np.memmap: La salida, abierta en modo lectura/escritura.
+
+    Raises:
+        ValueError: Si los parámetros no son válidos, x no es estrictamente creciente o la
+            fuente no tiene las source.n muestras que se contaron al abrirla.
+    """
+    if source.n == 0:
+        raise ValueError("La fuente no tiene muestras.")
+    if new_h <= 0:
+        raise ValueError("El nuevo paso (new_h) debe ser positivo.")
+    if x_target_start > x_target_end:
+        raise ValueError("x_target_start no puede ser mayor que x_target_end.")
+    if int(degree) != degree or degree < 0:
+        raise ValueError("El grado (degree) debe ser un entero no negativo.")
+    k = min(int(degree), source.n - 1)
+
+    # Misma malla que resample_data_newton (y que np.linspace): t_j = inicio + j*paso, último = fin
+    if x_target_start == x_target_end:
+        num_points = 1
+    else:
+        num_points = max(1, int(round((x_target_end - x_target_start) / new_h)) + 1)
+    step = (x_target_end - x_target_start) / (num_points - 1) if num_points > 1 else 0.0
+
+    def targets(j0, j1):
+        t = x_target_start + np.arange(j0, j1, dtype=float) * step
+        if j1 == num_points and num_points > 1:
+            t[-1] = x_target_end
+        return t
+
+    output = np.lib.format.open_memmap(output_path, mode='w+', dtype=np.float64, shape=(num_points, 2))
+    # Muestras necesarias a la derecha del intervalo de un punto para que su ventana esté completa
+    right = k - k // 2
+    tail_x, tail_y = np.empty(0), np.empty(0)
+    next_target = 0
+    rows_read = 0
+    for start, x, y, last_chunk in _mark_last(source.chunks(chunk_size)):
+        rows_read = start + len(x)
+        x_ext = np.concatenate([tail_x, x])
+        y_ext = np.concatenate([tail_y, y])
+        if np.any(np.diff(x_ext) <= 0):
+            raise ValueError("x debe ser estrictamente creciente para el re-muestreo por ventanas.")
+        # Los puntos con t < cota tienen su ventana completa en x_ext
+        if last_chunk:
+            bound = np.inf
+        elif len(x_ext) > k:
+            bound = x_ext[len(x_ext) - 1 - right]
+        else:
+            bound = -np.inf # Todavía no hay ninguna ventana completa
+        while next_target < num_points:
+            t = targets(next_target, min(next_target + chunk_size, num_points))
+            ready = int(np.searchsorted(t, bound, side='left'))
+            if ready == 0:
+                break
+            t = t[:ready]
+            output[next_target:next_target + ready, 0] = t
+            output[next_target:next_target + ready, 1] = data_resampling.evaluate_piecewise_newton(
+                x_ext, y_ext, t, k, chunk_size)
+            next_target += ready
+        # Cola: las últimas k + 1 muestras bastan para las ventanas de los puntos pendientes
+        tail_x, tail_y = x_ext[-(k + 1):], y_ext[-(k + 1):]
+    _check_rows_read(source, rows_read)
+    if next_target < num_points:
+        raise ValueError(f"Quedaron {num_points - next_target} puntos nuevos sin evaluar.")
+    output.flush()
+    return output
+
+
+def stream_derivatives(source, output_path, chunk_size=STREAM_CHUNK_SIZE, tolerance=1e-9):
+    """
+    Calcula las diferencias progresiva, central y regresiva de una fuente por bloques y
+    las escribe en un .npy con el dtype estructurado finite_differences.DERIVATIVE_DTYPE
+    (campos 'x', 'sucesiva', 'central', 'regresiva'; NaN donde la fórmula no aplica).
+
+    Cada bloque pasa por finite_differences.numerical_derivatives con el paso global. Cada
+    fila necesita y[i-1], y[i] e y[i+1], así que la última fila de un bloque se escribe al
+    leer el siguiente y del bloque anterior solo se conservan dos muestras.
+
+    Args:
+        source (SampleSource): Fuente abierta con open_samples.
+        output_path (str): Archivo .npy de salida.
+        chunk_size (int): Muestras por bloque.
+        tolerance (float): Tolerancia para verificar el espaciado constante.
+
+    Returns:
+        np.memmap: La salida, abierta en modo lectura/escritura.
+
+    Raises:
+        ValueError: Si los valores de x no están igualmente espaciados o la fuente no tiene
+            las source.n muestras que se contaron al abrirla.
+    """
+    n = source.n
+    if n == 0:
+        raise ValueError("La fuente no tiene muestras.")
+    output = np.lib.format.open_memmap(output_path, mode='w+', dtype=finite_differences.DERIVATIVE_DTYPE,
+                                       shape=(n,))
+    h = None
+    tail_x, tail_y = np.empty(0), np.empty(0)
+    done = 0 # Filas ya escritas
+    rows_read = 0
+    for start, x, y, last_chunk in _mark_last(source.chunks(chunk_size)):
+        rows_read = start + len(x)
+        if rows_read > n:
+            _check_rows_read(source, rows_read)
+        x_ext = np.concatenate([tail_x, x])
+        y_ext = np.concatenate([tail_y, y])
+        offset = start - len(tail_x) # Índice global de x_ext[0]
+        if h is None and len(x_ext) > 1:
+            h = x_ext[1] - x_ext[0] # Paso global, el mismo para todos los bloques
+        values = finite_differences.numerical_derivatives(x_ext, y_ext, h=h, tolerance=tolerance)
+
+        # Filas [done, stop): todas menos la última leída, salvo en el último bloque. Los
+        # extremos de x_ext que no son extremos globales nunca caen en este rango.
+        stop = rows_read if last_chunk else rows_read - 1
+        output[done:stop] = values[done - offset:stop - offset]
+        done = stop
+        tail_x, tail_y = x_ext[-2:], y_ext[-2:]
+    _check_rows_read(source, rows_read)
+    if done < n:
+        raise ValueError(f"Quedaron {n - done} filas de derivadas sin escribir.")
+    output.flush()
+    return output
+
+
+if __name__ == '__main__':
+    import shutil
+    import tempfile
+    import time
+
+    print("--- Ejecutando pruebas para: data_streaming.py ---")
+    directorio = tempfile.mkdtemp()
+    n_muestras = 2_000_000
+    x_datos = np.linspace(0, 200, n_muestras)
+    y_datos = np.sin(x_datos)
+
+    # Los tres formatos de entrada con los mismos datos
+    ruta_npy = os.path.join(directorio, 'muestras.npy')
+    np.save(ruta_npy, np.column_stack([x_datos, y_datos]))
+    ruta_bin = os.path.join(directorio, 'muestras.bin')
+    y_datos.tofile(ruta_bin)
+    ruta_csv = os.path.join(directorio, 'muestras.csv')
+    np.savetxt(ruta_csv, np.column_stack([x_datos[:20001], y_datos[:20001]]), delimiter=',', header='x,y')
+
+    fuente_npy = open_samples(ruta_npy)
+    fuente_bin = open_samples(ruta_bin, x_start=0.0, x_step=x_datos[1] - x_datos[0], n_columns=1)
+    fuente_csv = open_samples(ruta_csv) # El encabezado '# x,y' es un comentario
+    print(f"Muestras: .npy = {len(fuente_npy)}, .bin = {len(fuente_bin)}, .csv = {len(fuente_csv)}")
+
+    inicio = time.perf_counter()
+    salida = stream_resample(fuente_npy, 0, 200, 5e-5, os.path.join(directorio, 'remuestreo.npy'),
+                             degree=3, chunk_size=1 << 18)
+    print(f"Re-muestreo en flujo: {len(salida)} puntos en {time.perf_counter() - inicio:.3f} s, "
+          f"error máximo contra sin(x): {np.max(np.abs(salida[:, 1] - np.sin(salida[:, 0]))):.2e}")
+    x_mem, y_mem = data_resampling.resample_data_newton(x_datos[:20001], y_datos[:20001], 0, 2, 1e-3, degree=3)
+    salida_csv = stream_resample(fuente_csv, 0, 2, 1e-3, os.path.join(directorio, 'remuestreo_csv.npy'),
+                                 degree=3, chunk_size=1000)
+    print(f"  CSV por bloques de 1000 filas igual al re-muestreo en memoria: "
+          f"{np.array_equal(salida_csv[:, 0], x_mem) and np.array_equal(salida_csv[:, 1], y_mem)}")
+
+    inicio = time.perf_counter()
+    derivadas = stream_derivatives(fuente_bin, os.path.join(directorio, 'derivadas.npy'), chunk_size=1 << 18)
+    print(f"Derivadas en flujo: {len(derivadas)} filas en {time.perf_counter() - inicio:.3f} s, "
+          f"error máximo de la central contra cos(x): {np.nanmax(np.abs(derivadas['central'] - np.cos(derivadas['x']))):.2e}")
+    print(f"  Primera fila: {derivadas[0]}")
+    print(f"  Última fila:  {derivadas[-1]}")
+    del salida, salida_csv, derivadas, fuente_npy, fuente_bin
+    shutil.rmtree(directorio, ignore_errors=True)
+    print("--- Fin de pruebas para: data_streaming.py ---")
@@ -29,6 +29,10 @@ Limitación:
 
 import numpy as np
 
+# Registro con las tres aproximaciones de la derivada en un punto (NaN donde no aplica)
+DERIVATIVE_DTYPE = np.dtype([('x', np.float64), ('sucesiva', np.float64),
+                             ('central', np.float64), ('regresiva', np.float64)])
+
 def is_spacing_equal(x_vals, tolerance=1e-9):
     """Verifica si los valores en el array x_vals están igualmente espaciados."""
     if len(x_vals) < 2:
@@ -36,61 +40,107 @@ def is_spacing_equal(x_vals, tolerance=1e-9):
     diffs = np.diff(x_vals)
     return np.all(np.isclose(diffs, diffs[0], atol=tolerance))
 
-def numerical_derivatives_with_formulas(x_vals, y_vals):
+def numerical_derivatives(x_vals, y_vals, h=None, tolerance=1e-9):
     """
-    Calcula las derivadas numéricas (progresiva, regresiva, central) para un conjunto
-    de puntos (x_vals, y_vals) igualmente espaciados.
-    Retorna una lista de diccionarios, cada uno con las derivadas para un punto x.
+    Calcula las derivadas numéricas (progresiva, regresiva, central) de todos los puntos a la
+    vez, con aritmética de slices.
+
+    Parámetros:
+    x_vals, y_vals: Puntos igualmente espaciados.
+    h (float, opcional): Paso a usar; por defecto x_vals[1] - x_vals[0]. Permite procesar
+                         los datos por bloques con el paso global.
+    tolerance (float): Tolerancia de la verificación de espaciado.
+
+    Retorna:
+    np.ndarray: Array estructurado de dtype DERIVATIVE_DTYPE (campos 'x', 'sucesiva',
+                'central', 'regresiva'), con NaN donde la fórmula no aplica (extremos).
     """
-    if not is_spacing_equal(x_vals):
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    if h is None:
+        if not is_spacing_equal(x_vals, tolerance):
+            raise ValueError("Los valores de x no están igualmente espaciados.")
+    elif len(x_vals) > 1 and not np.all(np.isclose(np.diff(x_vals), h, atol=tolerance)):
         raise ValueError("Los valores de x no están igualmente espaciados.")
-    
     if len(x_vals) != len(y_vals):
         raise ValueError("Los arrays x_vals e y_vals deben tener la misma longitud.")
 
-    if len(x_vals) < 2: # Se necesitan al menos dos puntos para la mayoría de las diferencias
-        # Podríamos retornar vacío o manejarlo de otra forma.
-        # Por ahora, si es menos de 2 puntos, no se pueden calcular muchas diferencias.
-        # Para un solo punto, ninguna diferencia es calculable.
-        # Para el caso de la GUI, ya se valida > 2 puntos.
-        return []
+    n = len(x_vals)
+    results = np.empty(n, dtype=DERIVATIVE_DTYPE)
+    results['x'] = x_vals
+    results['sucesiva'] = np.nan
+    results['central'] = np.nan
+    results['regresiva'] = np.nan
+    if n < 2:
+        return results
+    if h is None:
+        h = x_vals[1] - x_vals[0]
+
+    # Sucesiva en x[0..n-2], regresiva en x[1..n-1], central en x[1..n-2]
+    results['sucesiva'][:-1] = (y_vals[1:] - y_vals[:-1]) / h
+    results['regresiva'][1:] = (y_vals[1:] - y_vals[:-1]) / h
+    results['central'][1:-1] = (y_vals[2:] - y_vals[:-2]) / (2*h)
+    return results
 
+class DerivativeResultsView:
+    """
+    Resultados de numerical_derivatives_with_formulas como secuencia perezosa.
 
-    h = x_vals[1] - x_vals[0]
-    n = len(x_vals)
-    results = []
+    view[i] retorna el diccionario del punto i ({'x': ..., 'sucesiva': (fórmula, valor) o None,
+    'central': ..., 'regresiva': ...}); las fórmulas de texto se generan solo cuando se pide
+    esa fila. Los valores numéricos de todos los puntos están en view.values (array
+    estructurado de numerical_derivatives).
+    """
+
+    def __init__(self, x_vals, y_vals, values):
+        self._x_vals = x_vals
+        self._y_vals = y_vals
+        self.values = values
 
-    for i in range(n):
-        punto_x = x_vals[i]
-        result = {'x': punto_x, 'sucesiva': None, 'central': None, 'regresiva': None}
+    def __len__(self):
+        return len(self.values)
+
+    def __iter__(self):
+        return (self[i] for i in range(len(self)))
+
+    def __getitem__(self, i):
+        n = len(self)
+        if not -n <= i < n:
+            raise IndexError("Índice de punto fuera de rango.")
+        i %= n
+        x_vals, y_vals = self._x_vals, self._y_vals
+        h = x_vals[1] - x_vals[0]
+        row = self.values[i]
+        result = {'x': x_vals[i], 'sucesiva': None, 'central': None, 'regresiva': None}
 
         # Sucesiva: Necesita x[i] y x[i+1]
         if i < n - 1:
-            f_x_s = y_vals[i]
-            f_xh_s = y_vals[i+1]
-            formula_s = f"(f({x_vals[i+1]}) - f({x_vals[i]})) / {h:.4g} = ({f_xh_s:.4g} - {f_x_s:.4g}) / {h:.4g}"
-            resultado_s = (f_xh_s - f_x_s) / h
-            result['sucesiva'] = (formula_s, resultado_s)
+            formula_s = f"(f({x_vals[i+1]}) - f({x_vals[i]})) / {h:.4g} = ({y_vals[i+1]:.4g} - {y_vals[i]:.4g}) / {h:.4g}"
+            result['sucesiva'] = (formula_s, row['sucesiva'])
 
         # Regresiva: Necesita x[i] y x[i-1]
         if i > 0:
-            f_x_r = y_vals[i]
-            f_xp_r = y_vals[i-1]
-            formula_r = f"(f({x_vals[i]}) - f({x_vals[i-1]})) / {h:.4g} = ({f_x_r:.4g} - {f_xp_r:.4g}) / {h:.4g}"
-            resultado_r = (f_x_r - f_xp_r) / h
-            result['regresiva'] = (formula_r, resultado_r)
-            
+            formula_r = f"(f({x_vals[i]}) - f({x_vals[i-1]})) / {h:.4g} = ({y_vals[i]:.4g} - {y_vals[i-1]:.4g}) / {h:.4g}"
+            result['regresiva'] = (formula_r, row['regresiva'])
+
         # Central: Necesita x[i-1] y x[i+1]
         if i > 0 and i < n - 1:
-            f_xp_c = y_vals[i-1]
-            f_xh_c = y_vals[i+1]
-            formula_c = f"(f({x_vals[i+1]}) - f({x_vals[i-1]})) / (2*{h:.4g}) = ({f_xh_c:.4g} - {f_xp_c:.4g}) / {2*h:.4g}"
-            resultado_c = (f_xh_c - f_xp_c) / (2*h)
-            result['central'] = (formula_c, resultado_c)
-            
-        results.append(result)
+            formula_c = f"(f({x_vals[i+1]}) - f({x_vals[i-1]})) / (2*{h:.4g}) = ({y_vals[i+1]:.4g} - {y_vals[i-1]:.4g}) / {2*h:.4g}"
+            result['central'] = (formula_c, row['central'])
 
-    return results
+        return result
+
+def numerical_derivatives_with_formulas(x_vals, y_vals):
+    """
+    Calcula las derivadas numéricas (progresiva, regresiva, central) para un conjunto
+    de puntos (x_vals, y_vals) igualmente espaciados.
+    Retorna una secuencia (DerivativeResultsView) con un diccionario por punto x; los valores
+    se calculan de una vez con numerical_derivatives y las fórmulas al pedir cada fila.
+    """
+    values = numerical_derivatives(x_vals, y_vals)
+    if len(values) < 2: # Para un solo punto, ninguna diferencia es calculable
+        values = values[:0]
+    return DerivativeResultsView(x_vals, y_vals, values)
 
 if __name__ == '__main__':
     print(f"--- Ejecutando pruebas para: finite_differences.py ---")
@@ -118,4 +168,14 @@ if __name__ == '__main__':
     else:
         print("Error en datos de prueba: Los valores de x no están igualmente espaciados.")
     
+    # API vectorizada: arrays de valores, sin fórmulas
+    import time
+    x_grande = np.linspace(0, 10, 10**6)
+    inicio = time.perf_counter()
+    derivadas = numerical_derivatives(x_grande, np.sin(x_grande))
+    print(f"{len(derivadas)} puntos en {time.perf_counter() - inicio:.4f} s; "
+          f"error máximo de la central contra cos(x): {np.nanmax(np.abs(derivadas['central'] - np.cos(x_grande))):.2e}")
+    vista = numerical_derivatives_with_formulas(x_grande, np.sin(x_grande))
+    print(f"Fórmula generada a pedido para la fila 1: {vista[1]['central'][0]}")
+
     print(f"--- Fin de pruebas para: finite_differences.py ---")
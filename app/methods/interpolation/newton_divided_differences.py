@@ -21,73 +21,179 @@ Requisitos:
 
 import numpy as np
 
-def build_divided_difference_table(x_vals, y_vals):
+# Puntos por bloque en la evaluación de Horner sobre arrays (los temporales caben en caché)
+HORNER_CHUNK_SIZE = 65536
+
+def _check_nodes(x_vals, y_vals):
     """
-    Construye la tabla de diferencias divididas de Newton.
-    Retorna una tabla con los valores numéricos.
+    Convierte los datos a arrays de float y valida que tengan la misma longitud.
     """
-    n = len(x_vals)
-    if n != len(y_vals):
+    x_vals = np.asarray(x_vals, dtype=float)
+    y_vals = np.asarray(y_vals, dtype=float)
+    if x_vals.ndim != 1 or y_vals.ndim != 1:
+        raise ValueError("Los arrays x_vals e y_vals deben ser unidimensionales.")
+    if len(x_vals) != len(y_vals):
         raise ValueError("Los arrays x_vals e y_vals deben tener la misma longitud.")
-    if n == 0:
-        return []
-        
-    # Inicializar la tabla con ceros o None, y luego llenar la primera columna
-    # Usaremos una lista de listas para la tabla, y y_vals para la primera columna.
-    # La diagonal superior contendrá los coeficientes b0, b1, ..., bn
-    # La tabla comúnmente se visualiza como triangular.
-    # Para el cálculo, podemos usar una copia de y_vals e ir actualizando.
+    return x_vals, y_vals
 
-    coef_table = np.zeros([n, n])
-    coef_table[:,0] = np.copy(y_vals) # Primera columna son los y_i
+def _column_denominators(x_vals, j):
+    """
+    Denominadores x_{i+j} - x_i de la columna j (i = 0, ..., n-j-1).
+    Lanza ValueError si alguno es (casi) cero, igual que el cálculo celda por celda.
+    """
+    denominators = x_vals[j:] - x_vals[:len(x_vals) - j]
+    close_to_zero = np.isclose(denominators, 0.0)
+    if close_to_zero.any():
+        i = int(np.argmax(close_to_zero))
+        raise ValueError(f"Error: División por cero detectada. x_vals[{i+j}] y x_vals[{i}] son muy cercanos o iguales.")
+    return denominators
+
+def divided_difference_table(x_vals, y_vals):
+    """
+    Construye la tabla de diferencias divididas como un array de NumPy de n x n.
 
+    table[i, j] = f[x_i, ..., x_{i+j}] para i + j < n; el resto de las celdas queda en cero.
+    Cada columna se calcula con una sola operación sobre slices:
+    table[:n-j, j] = (table[1:n-j+1, j-1] - table[:n-j, j-1]) / (x[j:] - x[:n-j])
+
+    Retorna:
+    np.ndarray: La tabla (n x n). La primera fila contiene los coeficientes a0, ..., a_{n-1}.
+    """
+    x_vals, y_vals = _check_nodes(x_vals, y_vals)
+    n = len(x_vals)
+    table = np.zeros((n, n))
+    if n == 0:
+        return table
+    table[:, 0] = y_vals # Primera columna son los y_i
     for j in range(1, n): # Columna de la diferencia dividida (orden j)
-        for i in range(n - j): # Fila (comienza en 0 hasta n-j-1)
-            # f[xi, ..., x_{i+j}] = (f[x_{i+1}, ..., x_{i+j}] - f[xi, ..., x_{i+j-1}]) / (x_{i+j} - xi)
-            numerator = coef_table[i+1, j-1] - coef_table[i, j-1]
-            denominator = x_vals[i+j] - x_vals[i]
-            if np.isclose(denominator, 0.0):
-                raise ValueError(f"Error: División por cero detectada. x_vals[{i+j}] y x_vals[{i}] son muy cercanos o iguales.")
-            coef_table[i,j] = numerator / denominator
-            
-    # La tabla completa (coef_table) se puede retornar si se desea visualizarla entera.
-    # Para este ejemplo, vamos a retornar la tabla como una lista de listas
-    # tal como la GUI podría necesitarla (o la parte relevante).
-    # La función original retornaba la tabla completa y también las fórmulas.
-    # Por simplicidad, esta versión del backend solo retornará la tabla de valores.
-    # La GUI es la que tiene la lógica más compleja para mostrar tablas ahora.
-    # Para que coincida con lo que la GUI espera (value_table, formula_table), 
-    # podemos retornar la tabla de coeficientes y un placeholder para las fórmulas,
-    # o adaptar la GUI.
-    # Para esta corrección, nos enfocamos en que el backend funcione.
-    # La función print_divided_difference_table del script original no se usa en la GUI.
-
-    # Convertir la tabla de coeficientes (NumPy array) a una lista de listas de Python
-    # La GUI espera que la tabla tenga strings '' para celdas no usadas.
-    # La tabla `coef_table` tiene los coeficientes en la parte superior izquierda.
-    # value_table[i][j] para la GUI.
-    value_table_gui_format = [["" for _ in range(n)] for _ in range(n)]
-    for r in range(n):
-        for c in range(n - r):
-            value_table_gui_format[r][c] = coef_table[r,c]
-            
-    # La función original también retornaba una tabla de fórmulas.
-    # Por ahora, para simplificar la corrección del error de print, no la generaremos aquí.
-    # Si la GUI la necesita, se deberá añadir esa lógica o modificar la GUI.
-    formula_table_placeholder = [["" for _ in range(n)] for _ in range(n)] 
-
-    return value_table_gui_format, formula_table_placeholder # Devolver en el formato que espera la GUI
+        denominators = _column_denominators(x_vals, j)
+        table[:n-j, j] = (table[1:n-j+1, j-1] - table[:n-j, j-1]) / denominators
+    return table
+
+def compute_newton_coefficients(x_vals, y_vals, out=None):
+    """
+    Calcula los coeficientes a0, ..., a_{n-1} del polinomio de Newton usando O(n) memoria.
+
+    En lugar de guardar la tabla completa se actualiza un único vector: después del paso j,
+    coef[i] = f[x_{i-j}, ..., x_i] para i >= j, de modo que al terminar coef[j] = f[x_0, ..., x_j].
+
+    Parámetros:
+    x_vals, y_vals: Nodos y valores a interpolar.
+    out (np.ndarray, opcional): Vector de float de longitud n donde escribir el resultado.
+                                Puede ser el mismo y_vals para trabajar completamente en su lugar.
+
+    Retorna:
+    np.ndarray: Los coeficientes (el mismo `out` si se proporcionó).
+    """
+    x_vals, y_vals = _check_nodes(x_vals, y_vals)
+    n = len(x_vals)
+    if out is None:
+        coef = y_vals.copy()
+    else:
+        if out.shape != (n,) or out.dtype != np.float64:
+            raise ValueError("El array 'out' debe ser de float con la misma longitud que x_vals.")
+        coef = out
+        if coef is not y_vals:
+            coef[:] = y_vals
+    _divided_differences_in_place(x_vals, coef)
+    return coef
+
+def _divided_differences_in_place(x_vals, coef, last_diagonal=None):
+    """
+    Convierte coef (inicialmente los y_i) en los coeficientes de Newton, columna por columna.
+    Si se da last_diagonal (longitud n), guarda en ella la última diagonal de la tabla,
+    last_diagonal[k] = f[x_k, ..., x_{n-1}], que es lo que necesita NewtonInterpolator para
+    seguir agregando nodos: después del paso j, coef[n-1] = f[x_{n-1-j}, ..., x_{n-1}].
+    """
+    n = len(x_vals)
+    if last_diagonal is not None and n:
+        last_diagonal[n-1] = coef[n-1]
+    for j in range(1, n):
+        denominators = _column_denominators(x_vals, j)
+        coef[j:] = (coef[j:] - coef[j-1:-1]) / denominators
+        if last_diagonal is not None:
+            last_diagonal[n-1-j] = coef[n-1]
+
+class DividedDifferenceTableView:
+    """
+    Vista perezosa de una tabla de diferencias divididas en el formato que usa la GUI.
+
+    Se indexa como la antigua lista de listas (view[i][j], len(view)): las celdas con
+    i + j < n devuelven el valor de la tabla y las demás devuelven "". No se crea ningún
+    objeto de Python por celda; los valores se leen del array solo cuando se piden.
+    Con table=None la vista representa una tabla n x n vacía (todas las celdas "").
+    """
+
+    def __init__(self, table=None, n=None):
+        self.values = table
+        self._n = len(table) if table is not None else int(n or 0)
+
+    @property
+    def coefficients(self):
+        """Coeficientes del polinomio (primera fila de la tabla) como array de NumPy."""
+        if self.values is None or self._n == 0:
+            return np.empty(0)
+        return self.values[0]
+
+    def __len__(self):
+        return self._n
+
+    def __getitem__(self, i):
+        if not -self._n <= i < self._n:
+            raise IndexError("Índice de fila fuera de rango.")
+        return _DividedDifferenceRowView(self, i % self._n)
+
+    def __iter__(self):
+        return (self[i] for i in range(self._n))
+
+    def tolist(self):
+        """Copia completa en el formato de lista de listas (solo para tablas pequeñas)."""
+        return [list(row) for row in self]
+
+class _DividedDifferenceRowView:
+    """Fila i de una DividedDifferenceTableView."""
+
+    def __init__(self, table_view, i):
+        self._table_view = table_view
+        self._i = i
+
+    def __len__(self):
+        return len(self._table_view)
+
+    def __getitem__(self, j):
+        n = len(self._table_view)
+        if not -n <= j < n:
+            raise IndexError("Índice de columna fuera de rango.")
+        j %= n
+        if self._table_view.values is None or self._i + j >= n:
+            return ""
+        return self._table_view.values[self._i, j]
+
+    def __iter__(self):
+        return (self[j] for j in range(len(self)))
+
+def build_divided_difference_table(x_vals, y_vals):
+    """
+    Construye la tabla de diferencias divididas de Newton.
+    Retorna (value_table, formula_table) en el formato que espera la GUI: value_table[i][j]
+    es f[x_i, ..., x_{i+j}] y las celdas no usadas son "". Ambas son vistas perezosas
+    (DividedDifferenceTableView); la tabla numérica completa está en value_table.values.
+    """
+    table = divided_difference_table(x_vals, y_vals)
+    # La tabla de fórmulas sigue siendo un placeholder vacío
+    return DividedDifferenceTableView(table), DividedDifferenceTableView(None, len(table))
 
 def get_newton_coefficients(value_table):
     """
     Extrae los coeficientes del polinomio (la diagonal superior) desde la tabla de diferencias divididas.
     value_table[0][0] es a0, value_table[0][1] es a1, etc.
     """
+    if isinstance(value_table, DividedDifferenceTableView):
+        return value_table.coefficients.tolist()
     if not value_table:
         return []
     n = len(value_table[0]) # Asumiendo tabla cuadrada o al menos con la primera fila completa
-    # Los coeficientes son la primera fila de la tabla generada por build_divided_difference_table
-    # (después de ser formateada como value_table_gui_format)
+    # Los coeficientes son la primera fila de la tabla en formato de lista de listas
     coeffs = []
     for j in range(n):
         if value_table[0][j] != "": # Tomar hasta donde haya valores
@@ -96,28 +202,209 @@ def get_newton_coefficients(value_table):
             break # Detenerse si encontramos una celda vacía en la primera fila
     return coeffs
 
-def evaluate_newton_polynomial(x_data, coefficients, x_eval):
+def evaluate_newton_polynomial(x_data, coefficients, x_eval, chunk_size=HORNER_CHUNK_SIZE, out=None):
     """
-    Evalúa el polinomio de Newton en un punto dado x_eval.
+    Evalúa el polinomio de Newton en x_eval.
     x_data: Los puntos x originales usados para generar los coeficientes.
     coefficients: Los coeficientes a0, a1, ..., an.
-    x_eval: El punto donde evaluar el polinomio.
+    x_eval: El punto donde evaluar el polinomio (escalar) o un array de puntos de cualquier forma.
+    chunk_size: Para arrays, cantidad de puntos que se procesan juntos en cada pasada de Horner
+                (None = todos a la vez). Bloques pequeños mantienen los datos en caché y acotan
+                la memoria temporal cuando la salida es muy grande.
+    out: Array opcional (de la forma de x_eval) donde escribir el resultado, p. ej. un np.memmap.
+
+    Retorna el valor (float) si x_eval es escalar, o un array de la forma de x_eval.
     """
     n = len(coefficients)
     if n == 0:
         return 0 # O None, o lanzar error
-    
+    if len(x_data) < n - 1:
+        raise ValueError(f"Índice x_data[{n-2}] fuera de rango. Se necesitan al menos {n-1} puntos x_data para {n} coeficientes.")
+
     # P(x) = a0 + a1(x - x0) + a2(x - x0)(x - x1) + ...
     # Se puede evaluar eficientemente usando la forma anidada (Algoritmo de Horner generalizado)
     # P(x) = (...(an(x - x_{n-1}) + a_{n-1})(x-x_{n-2}) + ... + a1)(x-x0) + a0
     # Aquí los x_data son los x_i originales.
-    
-    result = coefficients[n-1] # Empezar con an
-    for i in range(n - 2, -1, -1):
-        if i >= len(x_data):
-             raise ValueError(f"Índice x_data[{i}] fuera de rango. Se necesitan al menos {n-1} puntos x_data para {n} coeficientes.")
-        result = result * (x_eval - x_data[i]) + coefficients[i]
-    return result
+    if np.ndim(x_eval) == 0 and out is None:
+        result = coefficients[n-1] # Empezar con an
+        for i in range(n - 2, -1, -1):
+            result = result * (x_eval - x_data[i]) + coefficients[i]
+        return result
+
+    # Con arrays, la misma recurrencia se aplica a todos los puntos a la vez y en su lugar
+    x_eval = np.asarray(x_eval, dtype=float)
+    coefficients = np.asarray(coefficients, dtype=float)
+    x_data = np.asarray(x_data, dtype=float)
+    if out is None:
+        out = np.empty(x_eval.shape)
+    elif out.shape != x_eval.shape:
+        raise ValueError("El array 'out' debe tener la misma forma que x_eval.")
+    x_flat = x_eval.reshape(-1)
+    out_flat = out.reshape(-1) # Vista si out es contiguo
+    total = x_flat.size
+    step = total if not chunk_size else int(chunk_size)
+    if step < 1 and total:
+        raise ValueError("chunk_size debe ser un entero positivo.")
+    buffer = np.empty(min(step, total))
+    factor = np.empty_like(buffer)
+    for start in range(0, total, max(step, 1)):
+        x_chunk = x_flat[start:start + step]
+        result = buffer[:x_chunk.size]
+        tmp = factor[:x_chunk.size]
+        result.fill(coefficients[n-1])
+        for i in range(n - 2, -1, -1):
+            np.subtract(x_chunk, x_data[i], out=tmp)
+            result *= tmp
+            result += coefficients[i]
+        out_flat[start:start + step] = result
+    if not np.shares_memory(out_flat, out):
+        out[...] = out_flat.reshape(out.shape)
+    return out
+
+class NewtonInterpolator:
+    """
+    Polinomio de Newton que se construye agregando un nodo a la vez.
+
+    Agregar el nodo (x_n, y_n) solo requiere la última diagonal de la tabla de diferencias
+    divididas, d[k] = f[x_k, ..., x_{n-1}]:
+        d'[n] = y_n,  d'[k] = (d'[k+1] - d[k]) / (x_n - x_k)  para k = n-1, ..., 0
+    y el nuevo coeficiente es a_n = d'[0]. Es decir, O(n) operaciones y memoria en lugar de
+    reconstruir la tabla completa en O(n²).
+
+    La evaluación también es incremental en los puntos registrados con set_eval_points:
+    para cada t se guardan P(t) y w(t) = (t - x_0)...(t - x_{n-1}), de modo que al agregar
+    un nodo P(t) += a_n * w(t) y w(t) *= (t - x_n), es decir O(m) para m puntos.
+
+    Parámetros:
+    x_vals, y_vals (array, opcional): Nodos iniciales.
+    eval_points (array, opcional): Puntos donde mantener el polinomio evaluado.
+    """
+
+    def __init__(self, x_vals=None, y_vals=None, eval_points=None):
+        x_vals, y_vals = _check_nodes([] if x_vals is None else x_vals, [] if y_vals is None else y_vals)
+        n = len(x_vals)
+        capacity = max(8, n)
+        self._n = n
+        self._x = np.empty(capacity)
+        self._coef = np.empty(capacity)
+        self._x[:n] = x_vals
+        self._coef[:n] = y_vals
+        last_diagonal = np.empty(n)
+        _divided_differences_in_place(self._x[:n], self._coef[:n], last_diagonal)
+        # La recurrencia de add_point es secuencial: con floats de Python es varias veces más rápida
+        self._diag = last_diagonal.tolist()
+        self._eval_points = None
+        self._eval_values = None
+        self._eval_products = None
+        if eval_points is not None:
+            self.set_eval_points(eval_points)
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def degree(self):
+        """Grado del polinomio (-1 si no hay nodos)."""
+        return self._n - 1
+
+    @property
+    def nodes(self):
+        """Nodos x_0, ..., x_{n-1} (vista de solo lectura)."""
+        return self._read_only(self._x)
+
+    @property
+    def coefficients(self):
+        """Coeficientes a_0, ..., a_{n-1} (vista de solo lectura)."""
+        return self._read_only(self._coef)
+
+    @property
+    def eval_points(self):
+        return self._eval_points
+
+    @property
+    def eval_values(self):
+        """P(t) en los puntos registrados con set_eval_points (vista de solo lectura)."""
+        if self._eval_values is None:
+            return None
+        view = self._eval_values.view()
+        view.flags.writeable = False
+        return view
+
+    def _read_only(self, buffer):
+        view = buffer[:self._n]
+        view.flags.writeable = False
+        return view
+
+    def _grow(self):
+        capacity = 2 * len(self._x)
+        for name in ('_x', '_coef'):
+            new_buffer = np.empty(capacity)
+            new_buffer[:self._n] = getattr(self, name)[:self._n]
+            setattr(self, name, new_buffer)
+
+    def add_point(self, x, y):
+        """
+        Agrega el nodo (x, y) y retorna el nuevo coeficiente a_n.
+        Lanza ValueError si x coincide (o es muy cercano) con un nodo existente o si las
+        diferencias divididas desbordan; en ese caso el interpolador no se modifica.
+        """
+        x, y = float(x), float(y)
+        n = self._n
+        denominators = x - self._x[:n]
+        close_to_zero = np.isclose(denominators, 0.0)
+        if close_to_zero.any():
+            k = int(np.argmax(close_to_zero))
+            raise ValueError(f"Error: División por cero detectada. El nuevo x = {x} y x_vals[{k}] son muy cercanos o iguales.")
+        if n == len(self._x):
+            self._grow()
+
+        # Nueva diagonal de abajo hacia arriba (en una lista aparte para no dejar el estado a medias)
+        old_diag = self._diag
+        gaps = denominators.tolist()
+        diag = old_diag + [y]
+        try:
+            for k in range(n - 1, -1, -1):
+                diag[k] = (diag[k+1] - old_diag[k]) / gaps[k]
+        except OverflowError:
+            raise ValueError("Desbordamiento al calcular las diferencias divididas del nuevo nodo.")
+        self._diag = diag
+        new_coef = diag[0]
+        self._x[n] = x
+        self._coef[n] = new_coef
+        self._n = n + 1
+
+        if self._eval_points is not None:
+            self._eval_values += new_coef * self._eval_products
+            self._eval_products *= self._eval_points - x
+        return new_coef
+
+    def extend(self, x_vals, y_vals):
+        """Agrega varios nodos en orden."""
+        x_vals, y_vals = _check_nodes(x_vals, y_vals)
+        for x, y in zip(x_vals, y_vals):
+            self.add_point(x, y)
+
+    def set_eval_points(self, eval_points):
+        """
+        Registra los puntos donde se mantiene P(t) actualizado tras cada add_point.
+        El cálculo inicial cuesta O(n·m); después cada nodo nuevo cuesta O(m).
+        """
+        t = np.array(eval_points, dtype=float, ndmin=1)
+        products = np.ones_like(t)
+        values = np.zeros_like(t)
+        for k in range(self._n):
+            values += self._coef[k] * products
+            products *= t - self._x[k]
+        self._eval_points = t
+        self._eval_values = values
+        self._eval_products = products
+
+    def __call__(self, x_eval):
+        """Evalúa el polinomio actual en x_eval (escalar o array)."""
+        if self._n == 0:
+            return 0
+        result = evaluate_newton_polynomial(self.nodes, self.coefficients, np.asarray(x_eval, dtype=float))
+        return result if np.ndim(result) else float(result)
 
 if __name__ == '__main__':
     print(f"--- Ejecutando pruebas para: newton_divided_differences.py ---")
@@ -144,7 +431,7 @@ if __name__ == '__main__':
             row_str = f"{x_coords[i]:^12.4g} | "
             for j in range(num_cols - i):
                 val = table_data[i][j]
-                if isinstance(val, (float, np.float_)) and val != "":
+                if isinstance(val, (float, np.float64)) and val != "":
                     row_str += f"{val:^12.4f} | "
                 else:
                     row_str += f"{'':^12} | " 
@@ -176,4 +463,39 @@ if __name__ == '__main__':
     y_interpolated_test_gui = evaluate_newton_polynomial(x_test_ndd, coefficients_test_ndd, x_eval_point_gui)
     print(f"Interpolación en x = {x_eval_point_gui} (Prueba GUI): P(x) = {y_interpolated_test_gui:.4f}")
     
+    # Coeficientes en O(n) memoria y tabla vectorizada con muchos nodos
+    import time
+    n_grande = 5000
+    x_grande = np.arange(n_grande, dtype=float) # Paso 1: las diferencias de orden alto no desbordan
+    y_grande = np.sin(0.1 * x_grande)
+    inicio = time.perf_counter()
+    coef_grande = compute_newton_coefficients(x_grande, y_grande)
+    t_coef = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    tabla_grande, _ = build_divided_difference_table(x_grande, y_grande)
+    t_tabla = time.perf_counter() - inicio
+    print(f"\nCon {n_grande} nodos: coeficientes en O(n) en {t_coef:.3f} s, tabla completa en {t_tabla:.3f} s")
+    print(f"  Coinciden con la primera fila de la tabla: {np.array_equal(coef_grande, tabla_grande.coefficients)}")
+    print(f"  Coeficientes de la prueba anterior (O(n)): {compute_newton_coefficients(x_test_ndd, y_test_ndd)}")
+
+    # Interpolador incremental: se agregan los nodos de uno en uno, como en una adquisición
+    interpolador = NewtonInterpolator(eval_points=[x_eval_point_gui, x_eval_point])
+    for x_nuevo, y_nuevo in zip(x_test_ndd, y_test_ndd):
+        interpolador.add_point(x_nuevo, y_nuevo)
+        print(f"  Grado {interpolador.degree}: P({x_eval_point_gui}) = {interpolador.eval_values[0]:.4f}, "
+              f"P({x_eval_point}) = {interpolador.eval_values[1]:.4f}")
+    print(f"Coeficientes del interpolador incremental: {interpolador.coefficients}")
+
+    n_adquisicion = 2000
+    x_adq = np.arange(n_adquisicion, dtype=float)
+    y_adq = np.sin(0.1 * x_adq)
+    inicio = time.perf_counter()
+    interpolador_adq = NewtonInterpolator()
+    for x_nuevo, y_nuevo in zip(x_adq, y_adq):
+        interpolador_adq.add_point(x_nuevo, y_nuevo)
+    t_incremental = time.perf_counter() - inicio
+    coincide = np.array_equal(interpolador_adq.coefficients, compute_newton_coefficients(x_adq, y_adq))
+    print(f"{n_adquisicion} nodos agregados de a uno en {t_incremental:.3f} s; "
+          f"coeficientes iguales a los de la construcción completa: {coincide}")
+
     print(f"--- Fin de pruebas para: newton_divided_differences.py ---")
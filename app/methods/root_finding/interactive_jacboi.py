@@ -1,11 +1,14 @@
 import numpy as np
+import scipy.sparse as sp
+from .matrix_validation import verificar_matriz_iterativa
+from .iteration_history import crear_historial
 
 def verificar_dominancia_diagonal(A_np):
     """
     Verifica si una matriz A_np es estrictamente diagonal dominante por filas.
 
     Parámetros:
-    A_np (np.array): La matriz a verificar.
+    A_np (np.array o scipy.sparse): La matriz a verificar.
 
     Retorna:
     bool: True si es estrictamente diagonal dominante, False en caso contrario.
@@ -13,28 +16,47 @@ def verificar_dominancia_diagonal(A_np):
     if A_np.ndim != 2 or A_np.shape[0] != A_np.shape[1]:
         return False # Solo aplica a matrices cuadradas
 
-    n = A_np.shape[0]
-    for i in range(n):
-        suma_no_diag = 0
-        for j in range(n):
-            if i == j:
-                continue
-            suma_no_diag += abs(A_np[i, j])
-        
-        if abs(A_np[i, i]) <= suma_no_diag: # Estrictamente dominante requiere >
-            return False # No es estrictamente diagonal dominante
-    return True # Si todas las filas cumplen
-
-def resolver_sistema_jacobi(A_np, b_np, tol, max_iter, x_inicial_np=None):
+    abs_diagonal = np.abs(A_np.diagonal())
+    # abs() funciona tanto para np.array como para matrices dispersas (solo recorre los no nulos)
+    suma_filas = np.asarray(abs(A_np).sum(axis=1)).ravel()
+    suma_no_diag = suma_filas - abs_diagonal
+    # Estrictamente dominante requiere > en todas las filas
+    return bool(np.all(abs_diagonal > suma_no_diag))
+
+def _norma_residuo(residuo):
+    """
+    Norma del residuo. Para un bloque de k lados derechos (matriz n x k) se
+    retorna la mayor de las normas por columna, de modo que la tolerancia se
+    exige a cada sistema por separado.
+    """
+    if residuo.ndim == 1:
+        return np.linalg.norm(residuo)
+    return np.max(np.linalg.norm(residuo, axis=0))
+
+def resolver_sistema_jacobi(A_np, b_np, tol, max_iter, x_inicial_np=None, estimar_condicion=False,
+                            historial=None):
     """
     Resuelve un sistema de ecuaciones lineales Ax = b usando el método de Jacobi clásico.
 
+    Cada barrido se calcula de forma vectorizada como x_{k+1} = D⁻¹(b − R x_k),
+    donde D es la diagonal de A y R = A − D. Si b es una matriz de n x k se
+    resuelven los k sistemas (mismo A, distintos lados derechos) en un solo
+    recorrido; la convergencia se declara cuando todas las columnas cumplen la tolerancia.
+
     Parámetros:
-    A_np (np.array): Matriz de coeficientes.
-    b_np (np.array): Vector de términos independientes.
+    A_np (np.array o scipy.sparse): Matriz de coeficientes. Las matrices dispersas se
+                                    convierten a CSR y solo se recorren sus elementos no nulos.
+    b_np (np.array): Vector de términos independientes (n,) o bloque de lados derechos (n, k).
     tol (float): Tolerancia para la norma del residuo.
     max_iter (int): Número máximo de iteraciones.
-    x_inicial_np (np.array, opcional): Estimación inicial para x. Si es None, se usa un vector de ceros.
+    x_inicial_np (np.array, opcional): Estimación inicial para x, de forma (n,) o (n, k).
+                                       Si es None, se usa un vector de ceros.
+    estimar_condicion (bool, opcional): Si es True, calcula una cota inferior O(nnz) del número
+                                        de condición y rechaza matrices numéricamente singulares.
+    historial (str o HistorialIteraciones, opcional): Modo de almacenamiento del historial
+                                                      ('ninguno', 'normas', 'cada_k', 'ultimos_n',
+                                                      'completo') o una instancia configurada.
+                                                      None equivale a 'completo'.
 
     Retorna:
     dict: Un diccionario con los resultados:
@@ -42,74 +64,78 @@ def resolver_sistema_jacobi(A_np, b_np, tol, max_iter, x_inicial_np=None):
          'iteraciones_realizadas': int, 
          'norma_residuo_final': float, 
          'status': str,
-         'historial_iteraciones': list of dicts [{'iter': int, 'x_k': np.array, 'norma_residuo': float}]}
+         'historial_iteraciones': HistorialIteraciones (se recorre como una lista de dicts
+                                  [{'iter': int, 'x_k': np.array, 'norma_residuo': float}]),
+         'cota_inferior_condicion': float o None}
     str: Mensaje de error si ocurre un problema de validación inicial.
     """
 
     if A_np.ndim != 2 or A_np.shape[0] != A_np.shape[1]:
         return "Error: La matriz A debe ser cuadrada."
-    if b_np.ndim != 1 or b_np.shape[0] != A_np.shape[0]:
+    if b_np.ndim not in (1, 2) or b_np.shape[0] != A_np.shape[0]:
         return "Error: El vector b debe tener la misma dimensión que las filas/columnas de A."
 
-    try:
-        detA = np.linalg.det(A_np)
-        if np.isclose(detA, 0.0):
-            return "Error: La matriz de coeficientes es singular (determinante cercano a cero)."
-    except np.linalg.LinAlgError:
-        return "Error: No se pudo calcular el determinante de A. Verifique que sea una matriz válida."
+    if sp.issparse(A_np):
+        A_np = A_np.tocsr()
+
+    # Controles O(nnz) en lugar de det(A): una factorización O(n³) descartada antes de
+    # iteraciones O(n²), y un determinante que desborda para n grande.
+    mensaje_error, diagnostico = verificar_matriz_iterativa(A_np, estimar_condicion)
+    if mensaje_error:
+        return mensaje_error
+    cota_condicion = diagnostico['cota_inferior_condicion']
 
     n = A_np.shape[0]
     if x_inicial_np is None:
-        x_k = np.zeros(n, dtype=float)
+        x_k = np.zeros(b_np.shape, dtype=float)
     else:
-        if x_inicial_np.shape != (n,):
+        if x_inicial_np.shape not in ((n,), b_np.shape):
             return "Error: La estimación inicial x_inicial tiene dimensiones incorrectas."
-        x_k = np.copy(x_inicial_np).astype(float)
-    
-    x_k_siguiente = np.zeros_like(x_k)
-    historial_iteraciones = []
+        # Un x inicial (n,) se replica para cada lado derecho del bloque
+        x_k = np.array(np.broadcast_to(x_inicial_np.reshape((n,) + (1,) * (b_np.ndim - 1)), b_np.shape), dtype=float)
+
+    try:
+        historial_iteraciones = crear_historial(historial, capacidad=max_iter + 1)
+    except ValueError as e:
+        return f"Error: {e}"
     iter_realizadas_count = 0
     norma_residuo_final_calculada = float('inf')
 
-    residuo_inicial = A_np @ x_k - b_np
-    norma_residuo_inicial = np.linalg.norm(residuo_inicial)
+    diagonal = diagnostico['diagonal']
+    if diagnostico['indice_diagonal_nula'] is not None:
+        i = diagnostico['indice_diagonal_nula']
+        return {
+            'solucion': x_k,
+            'iteraciones_realizadas': iter_realizadas_count,
+            'norma_residuo_final': norma_residuo_final_calculada,
+            'status': f"Error: Elemento diagonal A[{i},{i}] es cero. Imposible dividir para Jacobi.",
+            'historial_iteraciones': historial_iteraciones,
+            'cota_inferior_condicion': cota_condicion
+        }
+    if b_np.ndim == 2:
+        diagonal = diagonal[:, np.newaxis] # Para dividir cada columna del bloque
+
+    residuo = A_np @ x_k - b_np
+    norma_residuo_inicial = _norma_residuo(residuo)
     historial_iteraciones.append({
         'iter': 0,
-        'x_k': np.copy(x_k),
+        'x_k': x_k, # El historial copia el vector a su propio buffer
         'norma_residuo': norma_residuo_inicial
     })
 
     for k_iter_loop in range(1, max_iter + 1):
         iter_realizadas_count = k_iter_loop
-        x_k_anterior = np.copy(x_k)
-
-        for i in range(n):
-            if np.isclose(A_np[i, i], 0.0):
-                return {
-                    'solucion': x_k,
-                    'iteraciones_realizadas': iter_realizadas_count,
-                    'norma_residuo_final': norma_residuo_final_calculada,
-                    'status': f"Error: Elemento diagonal A[{i},{i}] es cero. Imposible dividir para Jacobi.",
-                    'historial_iteraciones': historial_iteraciones
-                }
-
-            sum_axj = 0.0
-            for j in range(n):
-                if i == j:
-                    continue
-                sum_axj += A_np[i, j] * x_k_anterior[j]
-            
-            # Fórmula clásica de Jacobi
-            x_k_siguiente[i] = (b_np[i] - sum_axj) / A_np[i, i]
-        
-        x_k = np.copy(x_k_siguiente)
-
-        residuo_actual_completo = A_np @ x_k - b_np
-        norma_residuo_final_calculada = np.linalg.norm(residuo_actual_completo)
+
+        # Fórmula clásica de Jacobi: R x_k = A x_k − D x_k = residuo + b − D x_k,
+        # por lo que x_{k+1} = (b − R x_k) / D = x_k − residuo / D
+        x_k = x_k - residuo / diagonal
+
+        residuo = A_np @ x_k - b_np
+        norma_residuo_final_calculada = _norma_residuo(residuo)
 
         historial_iteraciones.append({
             'iter': k_iter_loop,
-            'x_k': np.copy(x_k),
+            'x_k': x_k, # El historial copia el vector a su propio buffer
             'norma_residuo': norma_residuo_final_calculada
         })
 
@@ -119,7 +145,8 @@ def resolver_sistema_jacobi(A_np, b_np, tol, max_iter, x_inicial_np=None):
                 'iteraciones_realizadas': k_iter_loop,
                 'norma_residuo_final': norma_residuo_final_calculada,
                 'status': "Convergencia alcanzada (Jacobi Clásico).",
-                'historial_iteraciones': historial_iteraciones
+                'historial_iteraciones': historial_iteraciones,
+                'cota_inferior_condicion': cota_condicion
             }
 
     return {
@@ -127,7 +154,8 @@ def resolver_sistema_jacobi(A_np, b_np, tol, max_iter, x_inicial_np=None):
         'iteraciones_realizadas': iter_realizadas_count,
         'norma_residuo_final': norma_residuo_final_calculada,
         'status': f"No se alcanzó convergencia tras {max_iter} iteraciones (Jacobi Clásico).",
-        'historial_iteraciones': historial_iteraciones
+        'historial_iteraciones': historial_iteraciones,
+        'cota_inferior_condicion': cota_condicion
     }
 
 if __name__ == '__main__':
@@ -169,4 +197,14 @@ if __name__ == '__main__':
         print("Historial (últimas 5 iteraciones de la ejecución o todas si son <=5):")
         hist_usr_j = resultado_usuario_j['historial_iteraciones']
         for item in hist_usr_j[-5:]:
-             print(f"  Iter {item['iter']:02d}: x_k = {np.array2string(item['x_k'], precision=5, suppress_small=True)}, ||residuo|| = {item['norma_residuo']:.4e}") 
\ No newline at end of file
+             print(f"  Iter {item['iter']:02d}: x_k = {np.array2string(item['x_k'], precision=5, suppress_small=True)}, ||residuo|| = {item['norma_residuo']:.4e}") 
+    print("\nCaso 3: Varios lados derechos en un solo recorrido (b de n x k)")
+    B_bloque = np.column_stack([b_test, 2 * b_test, np.ones(3)])
+    resultado_bloque = resolver_sistema_jacobi(A_test, B_bloque, tol_test, max_iter_test)
+    if isinstance(resultado_bloque, str):
+        print(resultado_bloque)
+    else:
+        print(f"Status: {resultado_bloque['status']}")
+        print(f"Soluciones (una por columna):\n{np.array2string(resultado_bloque['solucion'], precision=6)}")
+        print(f"Iteraciones realizadas: {resultado_bloque['iteraciones_realizadas']}")
+        print(f"Norma del residuo final (máxima por columna): {resultado_bloque['norma_residuo_final']:.2e}")
@@ -0,0 +1,240 @@
+"""
+Almacenamiento compacto y configurable del historial de iteraciones de los resolvedores.
+
+Antes cada resolvedor agregaba a una lista un dict con np.copy(x_k) (y, en Newton,
+F(x_k), J(x_k) y delta_k) en cada iteración, con un consumo de memoria
+O(n·iteraciones) u O(n²·iteraciones). HistorialIteraciones guarda los datos en arreglos
+NumPy preasignados y permite elegir qué se conserva:
+
+- 'ninguno':   no se guarda nada.
+- 'normas':    solo los valores escalares (norma del residuo, ||Δx||, ...) de cada iteración.
+- 'cada_k':    escalares de todas las iteraciones y vectores/matrices cada `cada` entradas.
+- 'ultimos_n': escalares de todas las iteraciones y vectores/matrices de las últimas `ultimos`
+               entradas (buffer circular).
+- 'completo':  todo, como el historial original.
+
+El objeto se comporta como la lista de dicts original (len, iteración, índices y
+rebanadas producen dicts {'iter': ..., 'norma_residuo': ..., 'x_k': ...}), por lo que el
+código de la GUI que lo recorre no necesita cambios. Los vectores que el modo elegido
+no conserva simplemente no aparecen en el dict de esa iteración.
+"""
+
+import numpy as np
+
+MODOS_HISTORIAL = ('ninguno', 'normas', 'cada_k', 'ultimos_n', 'completo')
+
+_CAPACIDAD_INICIAL = 16
+
+
+class HistorialIteraciones:
+    """
+    Historial de iteraciones respaldado por arreglos preasignados.
+
+    Parámetros:
+    modo (str): Uno de MODOS_HISTORIAL.
+    cada (int): Intervalo entre entradas con vectores guardados (modo 'cada_k').
+    ultimos (int): Cantidad de entradas recientes con vectores guardados (modo 'ultimos_n').
+    capacidad (int, opcional): Número de entradas esperado (p. ej. max_iter + 1) para
+                               preasignar los arreglos de escalares.
+    """
+
+    def __init__(self, modo='completo', cada=10, ultimos=10, capacidad=None):
+        if modo not in MODOS_HISTORIAL:
+            raise ValueError(f"Modo de historial no reconocido: '{modo}'. "
+                             f"Opciones: {', '.join(MODOS_HISTORIAL)}.")
+        if int(cada) < 1 or int(ultimos) < 1:
+            raise ValueError("Los parámetros 'cada' y 'ultimos' del historial deben ser enteros positivos.")
+        self.modo = modo
+        self.cada = int(cada)
+        self.ultimos = int(ultimos)
+
+        self._longitud = 0
+        self._iters = np.empty(0, dtype=np.int64)
+        self._escalares = {}  # nombre -> (valores float64, presente bool), una fila por entrada
+        self._arreglos = {}   # nombre -> (buffer, presente bool), una fila por ranura
+        self._dueno = np.empty(0, dtype=np.int64)  # entrada almacenada en cada ranura
+        if capacidad:
+            self.reservar(capacidad)
+
+    # --- Escritura ---
+
+    def reservar(self, capacidad):
+        """Preasigna espacio para `capacidad` entradas de escalares."""
+        if self.modo != 'ninguno' and capacidad > self._iters.size:
+            self._redimensionar_escalares(int(capacidad))
+
+    def registrar(self, iteracion, **campos):
+        """
+        Agrega una entrada. Los valores escalares (o None) se guardan en todos los modos
+        salvo 'ninguno'; los np.array se copian a su buffer solo si el modo conserva esa entrada.
+        """
+        if self.modo == 'ninguno':
+            return
+        pos = self._longitud
+        if pos >= self._iters.size:
+            self._redimensionar_escalares(max(_CAPACIDAD_INICIAL, 2 * self._iters.size))
+        self._iters[pos] = iteracion
+        self._longitud += 1
+
+        ranura = self._ranura(pos)
+        if ranura is not None:
+            self._asegurar_ranura(ranura)
+            self._dueno[ranura] = pos
+            for _, presente in self._arreglos.values():
+                presente[ranura] = False
+
+        for nombre, valor in campos.items():
+            if valor is None:
+                continue # Las marcas de presencia de esta entrada ya están en False
+            if np.ndim(valor) > 0:
+                if ranura is not None:
+                    self._guardar_arreglo(nombre, ranura, np.asarray(valor))
+            else:
+                self._guardar_escalar(nombre, pos, valor)
+
+    def append(self, entrada):
+        """Compatibilidad con la lista de dicts original: append({'iter': k, ...})."""
+        campos = dict(entrada)
+        self.registrar(campos.pop('iter'), **campos)
+
+    # --- Lectura ---
+
+    def __len__(self):
+        return self._longitud
+
+    def __iter__(self):
+        for pos in range(self._longitud):
+            yield self._entrada(pos)
+
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return [self._entrada(pos) for pos in range(*indice.indices(self._longitud))]
+        if indice < 0:
+            indice += self._longitud
+        if not 0 <= indice < self._longitud:
+            raise IndexError("Índice de historial fuera de rango.")
+        return self._entrada(indice)
+
+    def __repr__(self):
+        return f"HistorialIteraciones(modo='{self.modo}', entradas={self._longitud})"
+
+    def iteraciones(self):
+        """Números de iteración de todas las entradas (np.array de enteros)."""
+        return self._iters[:self._longitud].copy()
+
+    def valores(self, nombre='norma_residuo'):
+        """Serie de un campo escalar para todas las entradas (NaN donde no se registró)."""
+        if nombre not in self._escalares:
+            return np.full(self._longitud, np.nan)
+        valores, presente = self._escalares[nombre]
+        return np.where(presente[:self._longitud], valores[:self._longitud], np.nan)
+
+    # --- Internos ---
+
+    def _ranura(self, pos):
+        """Ranura de los buffers de vectores para la entrada `pos`, o None si no se guardan."""
+        if self.modo == 'completo':
+            return pos
+        if self.modo == 'cada_k':
+            return pos // self.cada if pos % self.cada == 0 else None
+        if self.modo == 'ultimos_n':
+            return pos % self.ultimos
+        return None
+
+    def _ranuras_maximas(self):
+        if self.modo == 'ultimos_n':
+            return self.ultimos
+        capacidad = max(self._iters.size, 1)
+        return capacidad if self.modo == 'completo' else (capacidad - 1) // self.cada + 1
+
+    def _asegurar_ranura(self, ranura):
+        if ranura < self._dueno.size:
+            return
+        nuevo = min(max(_CAPACIDAD_INICIAL, 2 * self._dueno.size), self._ranuras_maximas())
+        nuevo = max(nuevo, ranura + 1)
+        dueno = np.full(nuevo, -1, dtype=np.int64)
+        dueno[:self._dueno.size] = self._dueno
+        self._dueno = dueno
+        for nombre, (buffer, presente) in self._arreglos.items():
+            self._arreglos[nombre] = self._ampliar_buffer(buffer, presente, nuevo)
+
+    @staticmethod
+    def _ampliar_buffer(buffer, presente, filas):
+        nuevo_buffer = np.empty((filas,) + buffer.shape[1:], dtype=buffer.dtype)
+        nuevo_buffer[:buffer.shape[0]] = buffer
+        nuevo_presente = np.zeros(filas, dtype=bool)
+        nuevo_presente[:presente.size] = presente
+        return nuevo_buffer, nuevo_presente
+
+    def _redimensionar_escalares(self, capacidad):
+        iters = np.empty(capacidad, dtype=np.int64)
+        iters[:self._longitud] = self._iters[:self._longitud]
+        self._iters = iters
+        for nombre, (valores, presente) in self._escalares.items():
+            self._escalares[nombre] = self._ampliar_buffer(valores, presente, capacidad)
+
+    def _guardar_escalar(self, nombre, pos, valor):
+        if nombre not in self._escalares:
+            self._escalares[nombre] = (np.full(self._iters.size, np.nan), np.zeros(self._iters.size, dtype=bool))
+        valores, presente = self._escalares[nombre]
+        valores[pos] = valor
+        presente[pos] = True
+
+    def _guardar_arreglo(self, nombre, ranura, valor):
+        if nombre not in self._arreglos:
+            dtype = np.result_type(valor.dtype, np.float64)
+            self._arreglos[nombre] = (np.empty((self._dueno.size,) + valor.shape, dtype=dtype),
+                                      np.zeros(self._dueno.size, dtype=bool))
+        buffer, presente = self._arreglos[nombre]
+        if buffer.shape[1:] != valor.shape:
+            raise ValueError(f"El campo '{nombre}' cambió de forma: {buffer.shape[1:]} -> {valor.shape}.")
+        buffer[ranura] = valor
+        presente[ranura] = True
+
+    def _entrada(self, pos):
+        entrada = {'iter': int(self._iters[pos])}
+        for nombre, (valores, presente) in self._escalares.items():
+            entrada[nombre] = float(valores[pos]) if presente[pos] else None
+        ranura = self._ranura(pos)
+        if ranura is not None and ranura < self._dueno.size and self._dueno[ranura] == pos:
+            for nombre, (buffer, presente) in self._arreglos.items():
+                entrada[nombre] = buffer[ranura].copy() if presente[ranura] else None
+        return entrada
+
+
+def crear_historial(historial=None, capacidad=None):
+    """
+    Normaliza el parámetro `historial` de los resolvedores.
+
+    Parámetros:
+    historial (str, HistorialIteraciones o None): Modo (ver MODOS_HISTORIAL), una instancia ya
+                                                  configurada (p. ej. con otro `ultimos`), o None
+                                                  para el modo 'completo'.
+    capacidad (int, opcional): Número de entradas esperado para preasignar.
+
+    Retorna:
+    HistorialIteraciones
+
+    Lanza:
+    ValueError: Si el modo no es válido.
+    """
+    if historial is None:
+        historial = 'completo'
+    if isinstance(historial, HistorialIteraciones):
+        if capacidad:
+            historial.reservar(capacidad)
+        return historial
+    if isinstance(historial, str):
+        return HistorialIteraciones(historial, capacidad=capacidad)
+    raise ValueError("El historial debe ser un modo (str) o una instancia de HistorialIteraciones.")
+
+
+if __name__ == '__main__':
+    print("Probando el módulo iteration_history.py...")
+    for modo_prueba in MODOS_HISTORIAL:
+        hist_prueba = HistorialIteraciones(modo_prueba, cada=3, ultimos=2, capacidad=8)
+        for k in range(8):
+            hist_prueba.append({'iter': k, 'x_k': np.full(3, float(k)), 'norma_residuo': 1.0 / (k + 1)})
+        con_vector = [item['iter'] for item in hist_prueba if 'x_k' in item]
+        print(f"Modo {modo_prueba:<10}: {len(hist_prueba)} entradas, iteraciones con x_k guardado: {con_vector}")
+    print(f"Últimas 2 entradas (modo completo): {hist_prueba[-2:]}")
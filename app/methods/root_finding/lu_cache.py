@@ -0,0 +1,146 @@
+"""
+Caché LRU de factorizaciones LU para resolver repetidamente con la misma matriz A.
+
+La ventana de comparación y los scripts por lotes resuelven el mismo A con muchos
+vectores b distintos; factorizar cuesta O(n³) mientras que cada par de sustituciones
+cuesta O(n²). La clave de cada entrada es un hash del contenido de A (forma, tipo y
+datos) junto con la opción de pivoteo, por lo que dos arreglos distintos con los mismos
+valores comparten la factorización. Los factores guardados se marcan como de solo
+lectura para que ningún llamador pueda modificar la copia compartida.
+"""
+
+import hashlib
+from collections import OrderedDict
+import numpy as np
+
+# Presupuesto de memoria por defecto para los factores guardados (en bytes)
+PRESUPUESTO_POR_DEFECTO = 256 * 1024 * 1024
+
+
+class CacheFactorizacionLU:
+    """
+    Caché LRU de factorizaciones (P, L, U, diagnostico) acotada por memoria.
+
+    Parámetros:
+    presupuesto_bytes (int): Memoria máxima ocupada por los factores guardados. Al superarla se
+                             desalojan las entradas usadas hace más tiempo. Una factorización más
+                             grande que el presupuesto completo no se guarda.
+    max_entradas (int, opcional): Límite adicional en el número de entradas.
+    """
+
+    def __init__(self, presupuesto_bytes=PRESUPUESTO_POR_DEFECTO, max_entradas=None):
+        if presupuesto_bytes <= 0:
+            raise ValueError("El presupuesto de memoria de la caché debe ser positivo.")
+        if max_entradas is not None and max_entradas < 1:
+            raise ValueError("max_entradas debe ser un entero positivo o None.")
+        self.presupuesto_bytes = int(presupuesto_bytes)
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()  # clave -> (factorizacion, bytes)
+        self._bytes_usados = 0
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    @staticmethod
+    def clave(A_np, pivoteo):
+        """
+        Clave de contenido de A: hash BLAKE2b de la forma, el tipo y los datos, más la opción
+        de pivoteo (las factorizaciones con y sin pivoteo son distintas).
+        """
+        datos = np.ascontiguousarray(A_np)
+        resumen = hashlib.blake2b(digest_size=20)
+        resumen.update(f"{datos.shape}|{datos.dtype.str}|".encode())
+        resumen.update(memoryview(datos).cast('B'))
+        return resumen.hexdigest(), bool(pivoteo)
+
+    def obtener(self, clave):
+        """
+        Retorna la factorización guardada para `clave` (y la marca como la más reciente),
+        o None si no está. Actualiza los contadores de aciertos y fallos.
+        """
+        entrada = self._entradas.get(clave)
+        if entrada is None:
+            self.fallos += 1
+            return None
+        self._entradas.move_to_end(clave)
+        self.aciertos += 1
+        return entrada[0]
+
+    def guardar(self, clave, P, L, U, diagnostico):
+        """
+        Guarda una factorización. Los arreglos quedan de solo lectura (se retornan sin copiar
+        en los aciertos). Retorna la factorización guardada como tupla (P, L, U, diagnostico).
+        """
+        factores = []
+        for M in (P, L, U):
+            M = np.asarray(M)
+            M.setflags(write=False)
+            factores.append(M)
+        factorizacion = (factores[0], factores[1], factores[2], dict(diagnostico))
+        tamano = sum(M.nbytes for M in factores)
+        if tamano > self.presupuesto_bytes:
+            return factorizacion # No cabe: se usa una sola vez sin desalojar las demás
+
+        if clave in self._entradas:
+            self._bytes_usados -= self._entradas.pop(clave)[1]
+        self._entradas[clave] = (factorizacion, tamano)
+        self._bytes_usados += tamano
+        self._desalojar()
+        return factorizacion
+
+    def _desalojar(self):
+        while self._entradas and (self._bytes_usados > self.presupuesto_bytes or
+                                  (self.max_entradas is not None and len(self._entradas) > self.max_entradas)):
+            _, (_, tamano) = self._entradas.popitem(last=False)
+            self._bytes_usados -= tamano
+            self.desalojos += 1
+
+    def limpiar(self):
+        """Elimina todas las entradas (los contadores se conservan)."""
+        self._entradas.clear()
+        self._bytes_usados = 0
+
+    def estadisticas(self):
+        """
+        Retorna:
+        dict: {'aciertos': int, 'fallos': int, 'desalojos': int, 'entradas': int,
+               'bytes_usados': int, 'presupuesto_bytes': int}
+        """
+        return {
+            'aciertos': self.aciertos,
+            'fallos': self.fallos,
+            'desalojos': self.desalojos,
+            'entradas': len(self._entradas),
+            'bytes_usados': self._bytes_usados,
+            'presupuesto_bytes': self.presupuesto_bytes
+        }
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def __contains__(self, clave):
+        return clave in self._entradas
+
+    def __repr__(self):
+        return (f"CacheFactorizacionLU(entradas={len(self._entradas)}, bytes_usados={self._bytes_usados}, "
+                f"aciertos={self.aciertos}, fallos={self.fallos})")
+
+
+# Caché compartida por la GUI (ventanas LU y de comparación)
+CACHE_LU_COMPARTIDA = CacheFactorizacionLU()
+
+
+if __name__ == '__main__':
+    import scipy.linalg as la
+
+    print("Probando el módulo lu_cache.py...")
+    cache_prueba = CacheFactorizacionLU(presupuesto_bytes=3 * 3 * 3 * 8 * 2) # Cabe el equivalente a dos matrices 3x3
+    A_test = np.array([[2, -3, 1],
+                       [-4, 9,  2],
+                       [6, -12,  -2]], dtype=float)
+    for A_prueba in (A_test, A_test.copy(), 2 * A_test, 3 * A_test, A_test):
+        clave_prueba = cache_prueba.clave(A_prueba, pivoteo=True)
+        if cache_prueba.obtener(clave_prueba) is None:
+            P_t, L_t, U_t = la.lu(A_prueba)
+            cache_prueba.guardar(clave_prueba, P_t, L_t, U_t, {})
+    print(cache_prueba.estadisticas())
@@ -1,10 +1,20 @@
 import numpy as np
 import scipy.linalg as la
+from .matrix_validation import diagnostico_lu, mensaje_singularidad_lu
+
+# A partir de este tamaño resolver_sistema_lu usa la variante por bloques
+N_MINIMO_BLOQUES = 512
+TAM_BLOQUE_POR_DEFECTO = 64
 
 def lu_no_pivot(A):
     """
     Realiza factorización LU sin pivoteo: A = L * U
     Retorna L y U
+
+    Cada paso i es una actualización de rango 1 (complemento de Schur) de todas las filas
+    bajo el pivote: U[i+1:, :] -= l ⊗ U[i, :], con l = U[i+1:, i] / U[i, i]. Se aplica a las
+    filas completas, igual que la eliminación fila por fila, por lo que L y U coinciden bit
+    a bit con las de la versión con bucles.
     """
     n = A.shape[0]
     L = np.eye(n)
@@ -13,50 +23,108 @@ def lu_no_pivot(A):
     for i in range(n):
         if np.isclose(U[i, i], 0):
             raise ZeroDivisionError("Pivote nulo. LU sin pivoteo no puede continuar.")
-        for j in range(i+1, n):
-            factor = U[j, i] / U[i, i]
-            L[j, i] = factor
-            U[j, :] -= factor * U[i, :]
+        factores = U[i+1:, i] / U[i, i]
+        L[i+1:, i] = factores
+        U[i+1:, :] -= np.outer(factores, U[i, :])
     return L, U
 
 
-def resolver_sistema_lu(A_np, b_np, usar_pivoteo=False):
+def lu_no_pivot_bloques(A, tam_bloque=TAM_BLOQUE_POR_DEFECTO):
+    """
+    Factorización LU sin pivoteo por bloques (right-looking), para n grande.
+
+    Para cada bloque de columnas [k0, k1):
+    1. Se factoriza el panel U[k0:, k0:k1] con actualizaciones de rango 1 limitadas al panel.
+    2. Se calcula el bloque de U a la derecha: U12 = L11⁻¹ A12 (sustitución triangular).
+    3. Se actualiza el complemento de Schur: A22 -= L21 @ U12 (un producto de matrices BLAS).
+
+    El resultado coincide con lu_no_pivot salvo errores de redondeo; además los elementos bajo
+    la diagonal de U quedan exactamente en cero.
+
+    Parámetros:
+    A (np.array): Matriz cuadrada.
+    tam_bloque (int): Número de columnas por bloque.
+
+    Retorna:
+    tuple: (L, U)
+    """
+    n = A.shape[0]
+    L = np.eye(n)
+    U = A.copy().astype(float)
+
+    for k0 in range(0, n, tam_bloque):
+        k1 = min(k0 + tam_bloque, n)
+        for i in range(k0, k1):
+            if np.isclose(U[i, i], 0):
+                raise ZeroDivisionError("Pivote nulo. LU sin pivoteo no puede continuar.")
+            factores = U[i+1:, i] / U[i, i]
+            L[i+1:, i] = factores
+            U[i+1:, i] = 0.0
+            U[i+1:, i+1:k1] -= np.outer(factores, U[i, i+1:k1])
+        if k1 < n:
+            U[k0:k1, k1:] = la.solve_triangular(L[k0:k1, k0:k1], U[k0:k1, k1:], lower=True,
+                                                unit_diagonal=True, check_finite=False)
+            U[k1:, k1:] -= L[k1:, k0:k1] @ U[k0:k1, k1:]
+    return L, U
+
+
+def resolver_sistema_lu(A_np, b_np, usar_pivoteo=False, retornar_diagnostico=False, cache=None,
+                        tam_bloque=None):
     """
     Resuelve un sistema de ecuaciones lineales Ax = b usando factorización LU.
+    Si b es una matriz de n x k se resuelven los k sistemas con una sola factorización
+    y sustituciones triangulares por bloques.
 
     Parámetros:
     A_np (np.array): Matriz de coeficientes.
-    b_np (np.array): Vector de términos independientes.
+    b_np (np.array): Vector de términos independientes (n,) o bloque de lados derechos (n, k).
     usar_pivoteo (bool): Si es True, usa scipy.linalg.lu (con pivoteo).
                          Si es False, usa lu_no_pivot (sin pivoteo).
+    retornar_diagnostico (bool): Si es True, agrega al final de la tupla un dict con
+                                 'log_abs_det', 'signo_det' y 'rcond' obtenidos de la factorización.
+    cache (CacheFactorizacionLU, opcional): Caché de factorizaciones (ver lu_cache). La clave incluye
+                                            usar_pivoteo; en un acierto no se refactoriza A.
+    tam_bloque (int, opcional): Sin pivoteo, tamaño de bloque de lu_no_pivot_bloques. Si es None se
+                                usa lu_no_pivot (idéntica a la eliminación clásica) para n menor que
+                                N_MINIMO_BLOQUES y bloques de TAM_BLOQUE_POR_DEFECTO a partir de ahí.
 
     Retorna:
-    tuple: (P, L, U, x, y, b_modificado)
+    tuple: (P, L, U, x, y, b_modificado) o (P, L, U, x, y, b_modificado, diagnostico)
+           Con b de n x k, x, y y b_modificado son matrices de n x k.
     """
     if A_np.ndim != 2 or A_np.shape[0] != A_np.shape[1]:
         return "Error: la matriz A debe ser cuadrada."
-    if b_np.ndim != 1 or b_np.shape[0] != A_np.shape[0]:
+    if b_np.ndim not in (1, 2) or b_np.shape[0] != A_np.shape[0]:
         return "Error: el vector b debe tener la misma dimensión que las filas/columnas de A."
 
-    try:
-        detA = np.linalg.det(A_np)
-        if abs(detA) < 1e-12:
-            return "Error: la matriz A es singular (determinante cercano a cero)."
-    except np.linalg.LinAlgError:
-        return "Error: no se pudo calcular el determinante de A."
-
-    try:
-        if usar_pivoteo:
-            # Usa scipy con pivoteo
-            P, L, U = la.lu(A_np)
-            b_mod = P @ b_np
-        else:
-            # Usa implementación sin pivoteo
-            L, U = lu_no_pivot(A_np)
-            b_mod = b_np  # No se aplica permutación
-            P = np.eye(A_np.shape[0])  # Devolvemos la identidad por compatibilidad
-    except Exception as e:
-        return f"Error durante la factorización LU: {str(e)}"
+    clave_cache = cache.clave(A_np, pivoteo=usar_pivoteo) if cache is not None else None
+    factorizacion = cache.obtener(clave_cache) if cache is not None else None
+    if factorizacion is not None:
+        P, L, U, diagnostico = factorizacion
+    else:
+        try:
+            if usar_pivoteo:
+                # Usa scipy con pivoteo
+                P, L, U = la.lu(A_np)
+            else:
+                # Usa implementación sin pivoteo
+                if tam_bloque is None and A_np.shape[0] >= N_MINIMO_BLOQUES:
+                    tam_bloque = TAM_BLOQUE_POR_DEFECTO
+                L, U = lu_no_pivot(A_np) if tam_bloque is None else lu_no_pivot_bloques(A_np, tam_bloque)
+                P = np.eye(A_np.shape[0])  # Devolvemos la identidad por compatibilidad
+        except Exception as e:
+            return f"Error durante la factorización LU: {str(e)}"
+
+        # La singularidad se deduce de la factorización ya calculada (sin det aparte)
+        diagnostico = diagnostico_lu(A_np, L, U, P if usar_pivoteo else None)
+        mensaje_singular = mensaje_singularidad_lu(diagnostico)
+        if mensaje_singular:
+            return mensaje_singular
+        if cache is not None:
+            P, L, U, diagnostico = cache.guardar(clave_cache, P, L, U, diagnostico)
+
+    # scipy.linalg.lu retorna A = P L U, por lo que L U x = Pᵀ b. Sin pivoteo no se permuta.
+    b_mod = P.T @ b_np if usar_pivoteo else b_np
 
     # Resolver LY = b_mod (hacia adelante)
     try:
@@ -70,6 +138,8 @@ def resolver_sistema_lu(A_np, b_np, usar_pivoteo=False):
     except Exception as e:
         return f"Error durante la sustitución hacia atrás: {str(e)}"
 
+    if retornar_diagnostico:
+        return P, L, U, x, y, b_mod, diagnostico
     return P, L, U, x, y, b_mod
 
 
@@ -104,3 +174,11 @@ if __name__ == '__main__':
         print("Matriz U:\n", U_res)
         print("Vector Y:\n", y_res)
         print("Vector X:\n", x_res)
+
+    print("\nCaso 3: Varios b con la misma A reutilizando la factorización (caché LRU)")
+    from .lu_cache import CacheFactorizacionLU
+    cache_prueba = CacheFactorizacionLU()
+    for b_prueba in (b_test, 2 * b_test, np.ones(3)):
+        resultado_cache = resolver_sistema_lu(A_test, b_prueba, usar_pivoteo=False, cache=cache_prueba)
+        print("Vector X:", resultado_cache[3])
+    print(cache_prueba.estadisticas())
@@ -1,47 +1,60 @@
 import numpy as np                 # Importamos NumPy para manejo de arrays y operaciones numéricas
 import scipy.linalg as la          # Importamos SciPy (linalg) para utilizar la factorización LU
+from .matrix_validation import diagnostico_lu, mensaje_singularidad_lu
 
-def resolver_sistema_lu(A_np, b_np):
+def resolver_sistema_lu(A_np, b_np, retornar_diagnostico=False, cache=None):
     """
     Resuelve un sistema de ecuaciones lineales Ax = b usando factorización LU.
+    Si b es una matriz de n x k se resuelven los k sistemas con una sola factorización
+    y sustituciones triangulares por bloques.
 
     Parámetros:
     A_np (np.array): Matriz de coeficientes.
-    b_np (np.array): Vector de términos independientes.
+    b_np (np.array): Vector de términos independientes (n,) o bloque de lados derechos (n, k).
+    retornar_diagnostico (bool, opcional): Si es True, agrega al final de la tupla un dict con
+                                           'log_abs_det', 'signo_det' y 'rcond' (ver matrix_validation).
+    cache (CacheFactorizacionLU, opcional): Caché de factorizaciones (ver lu_cache). Si A ya se
+                                            factorizó, se reutilizan P, L y U y solo se hacen las
+                                            sustituciones. Los factores retornados son de solo lectura.
 
     Retorna:
-    tuple: (P, L, U, x, y) si la solución es exitosa (P: Permutación, L: Lower, U: Upper, x: Solución, y: Intermedia Ly=Pb).
+    tuple: (P, L, U, x, y) si la solución es exitosa (P: Permutación, L: Lower, U: Upper, x: Solución, y: Intermedia Ly=Pᵀb).
+           Con b de n x k, x e y son matrices de n x k (una columna por lado derecho).
+           (P, L, U, x, y, diagnostico) si retornar_diagnostico es True.
     str: Mensaje de error si ocurre un problema.
     """
 
     # 5. Manejo de errores: verificar que A sea cuadrada y que las dimensiones coincidan con b.
     if A_np.ndim != 2 or A_np.shape[0] != A_np.shape[1]:
         return "Error: la matriz A debe ser cuadrada."
-    if b_np.ndim != 1 or b_np.shape[0] != A_np.shape[0]:
+    if b_np.ndim not in (1, 2) or b_np.shape[0] != A_np.shape[0]:
         return "Error: el vector b debe tener la misma dimensión que las filas/columnas de A."
 
-    # Verificar que la matriz no sea singular.
-    try:
-        # Intentamos calcular el determinante. Si es muy cercano a cero, la matriz es singular.
-        # Usamos try-except porque np.linalg.det puede fallar para matrices no cuadradas (aunque ya lo validamos antes)
-        detA = np.linalg.det(A_np)
-        if abs(detA) < 1e-12: # Umbral más estricto puede ser necesario dependiendo de la escala de los números
-            return "Error: la matriz A es singular (determinante cercano a cero) y no se puede factorizar LU de forma estable."
-    except np.linalg.LinAlgError:
-        # Esto podría ocurrir si la matriz no es cuadrada o tiene otros problemas.
-        return "Error: No se pudo calcular el determinante de A. Verifique que sea una matriz válida."
+    # 2. Factorización LU de la matriz A (o la ya guardada en la caché para este A).
+    clave_cache = cache.clave(A_np, pivoteo=True) if cache is not None else None
+    factorizacion = cache.obtener(clave_cache) if cache is not None else None
+    if factorizacion is not None:
+        P, L, U, diagnostico = factorizacion
+    else:
+        try:
+            P, L, U = la.lu(A_np)
+        except (np.linalg.LinAlgError, ValueError) as e:
+            return f"Error durante la factorización LU: {str(e)}"
 
+        # Verificar que la matriz no sea singular usando la propia factorización:
+        # log|det| sale de la diagonal de U y rcond de la estimación de LAPACK (gecon),
+        # sin calcular un determinante aparte que además desborda para n grande.
+        diagnostico = diagnostico_lu(A_np, L, U, P)
+        mensaje_singular = mensaje_singularidad_lu(diagnostico)
+        if mensaje_singular:
+            return mensaje_singular
+        if cache is not None:
+            P, L, U, diagnostico = cache.guardar(clave_cache, P, L, U, diagnostico)
 
-    # 2. Factorización LU de la matriz A.
+    # 3. Sustitución hacia adelante: resolver L * y = Pᵀ * b.
+    # scipy.linalg.lu retorna A = P L U, por lo que L U x = Pᵀ b
     try:
-        P, L, U = la.lu(A_np)
-    except np.linalg.LinAlgError as e:
-        return f"Error durante la factorización LU: {str(e)}"
-
-    # 3. Sustitución hacia adelante: resolver L * y = P * b.
-    # El resultado de P.dot(b_np) es b_permutado
-    try:
-        b_permutado = P @ b_np # Usamos @ para dot product en versiones recientes de numpy
+        b_permutado = P.T @ b_np # Usamos @ para dot product en versiones recientes de numpy
         y = la.solve_triangular(L, b_permutado, lower=True, unit_diagonal=False) # L puede no tener 1s en la diagonal con la.lu
     except np.linalg.LinAlgError as e:
         return f"Error durante la sustitución hacia adelante: {str(e)}"
@@ -56,6 +69,8 @@ def resolver_sistema_lu(A_np, b_np):
     except ValueError as e:
         return f"Error de dimensiones en sustitución hacia atrás: {str(e)}"
 
+    if retornar_diagnostico:
+        return P, L, U, x, y, diagnostico
     return P, L, U, x, y
 
 # El siguiente código es para probar el módulo directamente si se ejecuta este archivo.
@@ -73,14 +88,12 @@ if __name__ == '__main__':
     if isinstance(resultado, str):
         print(resultado)  # Imprime el mensaje de error
     else:
-        P_res, L_res, U_res, x_res = resultado
+        P_res, L_res, U_res, x_res, y_res = resultado
         print("Matriz P (Permutación):\n", P_res)
         print("Matriz L (Triangular Inferior):\n", L_res)
         print("Matriz U (Triangular Superior):\n", U_res)
         print("Vector x (Solución):\n", x_res)
-        # Verificación opcional: A @ x debe ser cercano a b
-        # print("Verificación A @ x = ", A_test @ x_res)
-        # print("Vector b original = ", b_test)
+        print("Verificación A @ x = ", A_test @ x_res)
 
     print("\nCaso 2: Matriz singular")
     A_singular = np.array([[1, 1], [1, 1]], dtype=float)
@@ -95,6 +108,15 @@ if __name__ == '__main__':
     print(resultado_no_cuadrada)
 
     print("\nCaso 4: Dimensiones b incorrectas")
-    b_dim_mal = np.array([1,2,3], dtype=float)
+    b_dim_mal = np.array([1,2], dtype=float)
     resultado_b_dim_mal = resolver_sistema_lu(A_test, b_dim_mal) # Usando A_test que es 3x3
     print(resultado_b_dim_mal)
+
+    print("\nCaso 5: Varios lados derechos (b de n x k) con una sola factorización")
+    B_bloque = np.column_stack([b_test, 2 * b_test, np.ones(3)])
+    resultado_bloque = resolver_sistema_lu(A_test, B_bloque)
+    if isinstance(resultado_bloque, str):
+        print(resultado_bloque)
+    else:
+        print("Soluciones X (una por columna):\n", resultado_bloque[3])
+        print("Residuo máximo:", np.max(np.abs(A_test @ resultado_bloque[3] - B_bloque)))
@@ -0,0 +1,183 @@
+"""
+Validaciones compartidas de la matriz de coeficientes para los resolvedores lineales.
+
+Reemplaza el cálculo previo de np.linalg.det(A) en cada punto de entrada:
+- Para LU, la singularidad y el condicionamiento (log|det|, estimación del número
+  de condición recíproco) se obtienen de la factorización que ya se calcula.
+- Para los métodos iterativos (Jacobi, SOR) se usan controles O(nnz): diagonal nula,
+  filas/columnas nulas y, opcionalmente, una cota inferior económica del número de condición.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+from scipy.linalg.lapack import get_lapack_funcs
+
+# Por debajo de este rcond la matriz se considera numéricamente singular
+RCOND_MINIMO = np.finfo(float).eps
+
+
+def _signo_permutacion(P):
+    """
+    Calcula det(P) (+1 o -1) de una permutación contando sus ciclos.
+
+    P puede ser el vector de índices (p. ej. de scipy.linalg.lu(..., p_indices=True)), y el
+    recuento es O(n), o la matriz de permutación n x n, que se recorre completa para extraer
+    ese vector y cuesta O(n²) (despreciable frente a los O(n³) de la factorización).
+    """
+    P = np.asarray(P)
+    perm = P if P.ndim == 1 else np.argmax(P, axis=0)
+    visitado = np.zeros(perm.size, dtype=bool)
+    transposiciones = 0
+    for inicio in range(perm.size):
+        longitud = 0
+        j = inicio
+        while not visitado[j]:
+            visitado[j] = True
+            j = perm[j]
+            longitud += 1
+        if longitud > 0:
+            transposiciones += longitud - 1
+    return -1.0 if transposiciones % 2 else 1.0
+
+
+def diagnostico_lu(A_np, L, U, P=None):
+    """
+    Obtiene singularidad y condicionamiento de A a partir de su factorización A = P L U.
+
+    Parámetros:
+    A_np (np.array): Matriz original (solo se usa su norma 1).
+    L (np.array): Factor triangular inferior con diagonal unitaria.
+    U (np.array): Factor triangular superior.
+    P (np.array, opcional): Matriz de permutación o su vector de índices. None equivale a la identidad.
+
+    Retorna:
+    dict: {'log_abs_det': float,   # log|det(A)|, sin desbordamiento para n grande
+           'signo_det': float,     # +1, -1 o 0 si algún pivote es nulo
+           'rcond': float}         # estimación LAPACK (gecon) de 1 / cond_1(A)
+    """
+    diag_U = np.diagonal(U)
+    abs_diag_U = np.abs(diag_U)
+    signo_P = 1.0 if P is None else _signo_permutacion(P)
+
+    if np.any(abs_diag_U == 0.0):
+        return {'log_abs_det': -np.inf, 'signo_det': 0.0, 'rcond': 0.0}
+
+    log_abs_det = float(np.sum(np.log(abs_diag_U)))
+    signo_det = signo_P * float(np.prod(np.sign(diag_U)))
+
+    # gecon trabaja sobre los factores empaquetados (L sin su diagonal unitaria + U);
+    # la permutación no altera la norma 1 de la inversa.
+    lu_empaquetado = np.asarray(np.tril(L, -1) + U, dtype=float)
+    gecon, = get_lapack_funcs(('gecon',), (lu_empaquetado,))
+    rcond, info = gecon(lu_empaquetado, np.linalg.norm(A_np, 1), norm='1')
+    if info != 0:
+        rcond = 0.0
+    return {'log_abs_det': log_abs_det, 'signo_det': signo_det, 'rcond': float(rcond)}
+
+
+def mensaje_singularidad_lu(diagnostico):
+    """
+    Retorna un mensaje de error si el diagnóstico de LU indica una matriz singular
+    o numéricamente singular; None en caso contrario.
+    """
+    if diagnostico['rcond'] < RCOND_MINIMO:
+        return (f"Error: la matriz A es singular o está mal condicionada "
+                f"(rcond ≈ {diagnostico['rcond']:.2e}) y no se puede factorizar LU de forma estable.")
+    return None
+
+
+def _normas_filas_columnas(A_np):
+    """Normas 2 de filas y columnas, recorriendo solo los elementos almacenados."""
+    if sp.issparse(A_np):
+        cuadrados = A_np.multiply(A_np)
+        normas_filas = np.sqrt(np.asarray(cuadrados.sum(axis=1)).ravel())
+        normas_columnas = np.sqrt(np.asarray(cuadrados.sum(axis=0)).ravel())
+        max_abs = abs(A_np).max() if A_np.nnz > 0 else 0.0
+    else:
+        normas_filas = np.linalg.norm(A_np, axis=1)
+        normas_columnas = np.linalg.norm(A_np, axis=0)
+        max_abs = np.max(np.abs(A_np)) if A_np.size > 0 else 0.0
+    return normas_filas, normas_columnas, float(max_abs)
+
+
+def cota_inferior_condicion(A_np):
+    """
+    Cota inferior económica (O(nnz)) del número de condición en norma 2.
+
+    Como σ_min ≤ ||A e_j||₂ para toda columna (y análogamente para filas) y
+    σ_max ≥ max|a_ij|, se cumple cond₂(A) ≥ max|a_ij| / min(normas de filas y columnas).
+    Retorna np.inf si alguna fila o columna es nula (matriz singular).
+    """
+    normas_filas, normas_columnas, max_abs = _normas_filas_columnas(A_np)
+    minima = min(np.min(normas_filas), np.min(normas_columnas))
+    if minima == 0.0:
+        return np.inf
+    return max_abs / minima
+
+
+def verificar_matriz_iterativa(A_np, estimar_condicion=False):
+    """
+    Controles previos O(nnz) para los métodos iterativos (sin calcular det(A)).
+
+    Parámetros:
+    A_np (np.array o scipy.sparse): Matriz cuadrada de coeficientes.
+    estimar_condicion (bool): Si es True, calcula también la cota inferior del
+                              número de condición y rechaza matrices numéricamente singulares.
+
+    Retorna:
+    tuple: (mensaje_error, diagnostico)
+        mensaje_error (str o None): Error de validación que impide iterar (fila/columna nula
+                                    o condición ≥ 1/eps), o None.
+        diagnostico (dict): {'diagonal': np.array,
+                             'indice_diagonal_nula': int o None,  # primer A[i,i] ≈ 0
+                             'cota_inferior_condicion': float o None}
+    """
+    diagonal = A_np.diagonal().astype(float)
+    indices_diag_cero = np.flatnonzero(np.isclose(diagonal, 0.0))
+    diagnostico = {
+        'diagonal': diagonal,
+        'indice_diagonal_nula': int(indices_diag_cero[0]) if indices_diag_cero.size > 0 else None,
+        'cota_inferior_condicion': None
+    }
+
+    if sp.issparse(A_np):
+        filas_con_datos = np.diff(A_np.tocsr().indptr) > 0
+        columnas_con_datos = np.diff(A_np.tocsc().indptr) > 0
+    else:
+        no_nulos = A_np != 0
+        filas_con_datos = np.any(no_nulos, axis=1)
+        columnas_con_datos = np.any(no_nulos, axis=0)
+    if not (np.all(filas_con_datos) and np.all(columnas_con_datos)):
+        return "Error: La matriz de coeficientes es singular (tiene una fila o columna nula).", diagnostico
+
+    if estimar_condicion:
+        cota = cota_inferior_condicion(A_np)
+        diagnostico['cota_inferior_condicion'] = cota
+        if cota * RCOND_MINIMO >= 1.0:
+            return (f"Error: La matriz de coeficientes es numéricamente singular "
+                    f"(cond₂(A) ≥ {cota:.2e})."), diagnostico
+
+    return None, diagnostico
+
+
+if __name__ == '__main__':
+    import scipy.linalg as la
+
+    print("Probando el módulo matrix_validation.py...")
+    A_test = np.array([[2, -3, 1],
+                       [-4, 9,  2],
+                       [6, -12,  -2]], dtype=float)
+    P_t, L_t, U_t = la.lu(A_test)
+    diag_t = diagnostico_lu(A_test, L_t, U_t, P_t)
+    print(f"log|det| = {diag_t['log_abs_det']:.6f}, signo = {diag_t['signo_det']:+.0f}, "
+          f"rcond = {diag_t['rcond']:.4e}")
+    print(f"det(A) reconstruido = {diag_t['signo_det'] * np.exp(diag_t['log_abs_det']):.6f} "
+          f"(np.linalg.det = {np.linalg.det(A_test):.6f})")
+
+    A_singular = np.array([[1, 1], [1, 1]], dtype=float)
+    P_s, L_s, U_s = la.lu(A_singular)
+    print(mensaje_singularidad_lu(diagnostico_lu(A_singular, L_s, U_s, P_s)))
+
+    print(verificar_matriz_iterativa(np.array([[4.0, 0.0], [0.0, 0.0]]))[0])
+    error_it, diag_it = verificar_matriz_iterativa(A_test, estimar_condicion=True)
+    print(f"Error: {error_it}, cota inferior de cond₂: {diag_it['cota_inferior_condicion']:.3f}")
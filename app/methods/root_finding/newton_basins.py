@@ -0,0 +1,274 @@
+"""
+Cuencas de atracción del método de Newton-Raphson.
+
+Se aplica la iteración de resolver_sistema_newton_raphson (paso x_{k+1} = x_k + w·δ_k con
+J(x_k) δ_k = −F(x_k)) desde todos los puntos de una malla de valores iniciales a la vez:
+los k puntos forman las columnas de una matriz X de n x k, F y J se evalúan sobre el lote
+completo y los k sistemas lineales n x n se resuelven juntos (regla de Cramer vectorizada
+para n = 2, una sola llamada a np.linalg.solve en otro caso). Cada punto tiene su propia máscara de estado; los que ya convergieron o
+fallaron salen del lote activo, de modo que cada iteración solo trabaja con los pendientes.
+
+F_func(X) debe aceptar un lote de n x k y retornar n x k (p. ej. `x, y = vec` seguido de
+expresiones NumPy, o app.utils.expressions.SistemaCompilado); J_func(X) debe retornar
+n x n x k. Si J_func es None, J se aproxima por diferencias hacia adelante sobre el lote.
+"""
+
+import time
+import numpy as np
+
+# Estado de cada punto inicial
+EN_CURSO, CONVERGIO, SINGULAR, DIVERGIO = 0, 1, 2, 3
+# ||x_k||∞ a partir de la cual la iteración se considera divergente
+LIMITE_DIVERGENCIA = 1e12
+
+
+def _jacobiano_por_lotes(F_func, X, FX):
+    """J(X) por diferencias hacia adelante: n evaluaciones de F sobre el lote. Retorna n x n x k."""
+    n = X.shape[0]
+    J = np.empty((FX.shape[0], n, X.shape[1]))
+    for j in range(n):
+        h = np.sqrt(np.finfo(float).eps) * np.maximum(np.abs(X[j]), 1.0)
+        X_h = X.copy()
+        X_h[j] += h
+        J[:, j, :] = (np.asarray(F_func(X_h), dtype=float) - FX) / (X_h[j] - X[j])
+    return J
+
+
+def _resolver_lote(J, B):
+    """
+    Resuelve J[:, :, i] δ_i = B[:, i] para todo i. Retorna (δ de n x k, máscara de los J regulares);
+    las columnas de δ de los J singulares no son válidas. Para n = 2 se usa la regla de Cramer
+    (np.linalg.solve tiene un costo fijo por matriz que domina en sistemas tan pequeños).
+    """
+    if J.shape[0] == 2:
+        determinante = J[0, 0] * J[1, 1] - J[0, 1] * J[1, 0]
+        regular = np.isfinite(determinante) & (determinante != 0)
+        delta = np.array([J[1, 1] * B[0] - J[0, 1] * B[1],
+                          J[0, 0] * B[1] - J[1, 0] * B[0]]) / determinante
+        return delta, regular
+    J_lote = np.moveaxis(J, -1, 0)
+    determinante = np.linalg.det(J_lote)
+    regular = np.isfinite(determinante) & (determinante != 0)
+    delta = np.full(B.shape, np.nan)
+    delta[:, regular] = np.linalg.solve(J_lote[regular], B.T[regular][:, :, np.newaxis])[:, :, 0].T
+    return delta, regular
+
+
+def resolver_newton_por_lotes(F_func, J_func, X_inicial, tol=1e-6, max_iter=100, w_factor=1.0):
+    """
+    Aplica Newton-Raphson desde cada columna de X_inicial de forma simultánea.
+
+    Los criterios de parada por punto son los de resolver_sistema_newton_raphson:
+    ||F(x_k)||₂ < tol, o ||x_{k+1} − x_k||∞ < tol después del paso.
+
+    Parámetros:
+    F_func (callable): F(X) sobre un lote de n x k.
+    J_func (callable o None): J(X) sobre un lote, de n x n x k. None = diferencias finitas.
+    X_inicial (np.array): Puntos iniciales, uno por columna (n x k).
+    tol (float): Tolerancia.
+    max_iter (int): Número máximo de iteraciones.
+    w_factor (float): Factor de relajación (0 < w ≤ 1).
+
+    Retorna:
+    dict: {'soluciones': np.array,        # n x k, último iterado de cada punto
+           'iteraciones': np.array,       # k, iteraciones realizadas (como 'iteraciones_realizadas')
+           'estado': np.array,            # k, EN_CURSO (sin convergencia tras max_iter),
+                                          #    CONVERGIO, SINGULAR o DIVERGIO
+           'norma_residuo': np.array,     # k, ||F|| en la última evaluación
+           'evaluaciones_punto': int}     # Suma sobre las iteraciones del tamaño del lote activo
+    str: Mensaje de error si la entrada no es válida o F/J no aceptan lotes.
+    """
+    X_inicial = np.asarray(X_inicial, dtype=float)
+    if X_inicial.ndim != 2:
+        return "Error: X_inicial debe ser una matriz de n x k (un punto inicial por columna)."
+    n, k = X_inicial.shape
+
+    X = X_inicial.copy()
+    iteraciones = np.zeros(k, dtype=int)
+    estado = np.full(k, EN_CURSO, dtype=np.int8)
+    norma_residuo = np.full(k, np.inf)
+    activos = np.arange(k)
+    evaluaciones_punto = 0
+
+    with np.errstate(all='ignore'):
+        for pasos in range(max_iter + 1): # Todos los puntos activos llevan `pasos` pasos
+            if activos.size == 0:
+                break
+            X_a = X[:, activos]
+            try:
+                FX = np.asarray(F_func(X_a), dtype=float)
+            except Exception as e:
+                return f"Error al evaluar F sobre el lote de puntos iniciales: {str(e)}"
+            if FX.shape != (n, activos.size):
+                return (f"Error: F retornó un arreglo de forma {FX.shape} para un lote de forma {X_a.shape}; "
+                        f"F debe evaluarse por componentes sobre arreglos.")
+            evaluaciones_punto += activos.size
+            norma_F = np.linalg.norm(FX, axis=0)
+            norma_residuo[activos] = norma_F
+            if pasos == max_iter:
+                break # Igual que el resolvedor individual, F(x_{max_iter}) no se prueba como criterio
+
+            # Convergencia por ||F(x_k)|| y divergencia (F no finita o iterado fuera de rango)
+            convergio = norma_F < tol
+            iteraciones[activos[convergio]] += 1 # Como en el resolvedor individual, cuenta la iteración de la prueba
+            diverge = ~np.isfinite(norma_F) | (np.max(np.abs(X_a), axis=0) > LIMITE_DIVERGENCIA)
+            estado[activos[convergio]] = CONVERGIO
+            estado[activos[diverge & ~convergio]] = DIVERGIO
+            sigue = ~(convergio | diverge)
+            activos, X_a, FX = activos[sigue], X_a[:, sigue], FX[:, sigue]
+            if activos.size == 0:
+                break
+
+            try:
+                JX = (_jacobiano_por_lotes(F_func, X_a, FX) if J_func is None
+                      else np.asarray(J_func(X_a), dtype=float))
+            except Exception as e:
+                return f"Error al evaluar J sobre el lote de puntos iniciales: {str(e)}"
+            if JX.shape != (n, n, activos.size):
+                return (f"Error: J retornó un arreglo de forma {JX.shape}; se esperaba "
+                        f"{(n, n, activos.size)}.")
+
+            # Los k sistemas J δ = −F de una vez; los J singulares o no finitos se apartan antes
+            delta, regular = _resolver_lote(JX, -FX)
+            estado[activos[~regular]] = SINGULAR
+            if not np.all(regular):
+                activos, X_a, delta = activos[regular], X_a[:, regular], delta[:, regular]
+            if activos.size == 0:
+                break
+
+            X_siguiente = X_a + w_factor * delta
+            X[:, activos] = X_siguiente
+            iteraciones[activos] += 1
+
+            # Convergencia por ||x_{k+1} − x_k||∞
+            paso_pequeno = np.max(np.abs(X_siguiente - X_a), axis=0) < tol
+            estado[activos[paso_pequeno]] = CONVERGIO
+            activos = activos[~paso_pequeno]
+
+    return {
+        'soluciones': X,
+        'iteraciones': iteraciones,
+        'estado': estado,
+        'norma_residuo': norma_residuo,
+        'evaluaciones_punto': evaluaciones_punto
+    }
+
+
+def agrupar_raices(soluciones, tol_raices):
+    """
+    Agrupa las soluciones (n x k) en raíces distintas: dos soluciones a distancia ∞ menor que
+    tol_raices se consideran la misma raíz.
+
+    Retorna:
+    tuple: (raices, indice) con raices de R x n (ordenadas por el número de puntos que las
+           alcanzan, de mayor a menor) e indice de forma (k,) con la raíz de cada columna.
+    """
+    k = soluciones.shape[1]
+    indice = np.full(k, -1, dtype=int)
+    raices = []
+    pendientes = np.arange(k)
+    while pendientes.size:
+        raiz = soluciones[:, pendientes[0]]
+        cerca = np.max(np.abs(soluciones[:, pendientes] - raiz[:, np.newaxis]), axis=0) < tol_raices
+        # La raíz se representa por el promedio de su grupo
+        raices.append(np.mean(soluciones[:, pendientes[cerca]], axis=1))
+        indice[pendientes[cerca]] = len(raices) - 1
+        pendientes = pendientes[~cerca]
+
+    if not raices:
+        return np.empty((0, soluciones.shape[0])), indice
+    orden = np.argsort(-np.bincount(indice, minlength=len(raices)), kind='stable')
+    nuevo_indice = np.empty_like(orden)
+    nuevo_indice[orden] = np.arange(len(orden))
+    return np.array(raices)[orden], nuevo_indice[indice]
+
+
+def mapa_cuencas(F_func, J_func, limites_x, limites_y, resolucion=300, tol=1e-6, max_iter=50, w_factor=1.0,
+                 tol_raices=None):
+    """
+    Mapa de cuencas de atracción de Newton-Raphson sobre un rectángulo de puntos iniciales.
+
+    Parámetros:
+    F_func, J_func (callable): Ver resolver_newton_por_lotes.
+    limites_x, limites_y (tuple): (mínimo, máximo) de cada eje.
+    resolucion (int o tuple): Puntos por eje, o (puntos en x, puntos en y).
+    tol, max_iter, w_factor: Ver resolver_newton_por_lotes.
+    tol_raices (float, opcional): Distancia para identificar dos soluciones como la misma raíz.
+                                  Por defecto 1e-3 veces la diagonal del rectángulo (o 100·tol si es mayor).
+
+    Retorna:
+    dict: {'X': np.array, 'Y': np.array,     # Malla de puntos iniciales (ny x nx)
+           'indice_raiz': np.array,          # ny x nx, raíz alcanzada (−1 si no convergió)
+           'iteraciones': np.array,          # ny x nx
+           'estado': np.array,               # ny x nx, ver resolver_newton_por_lotes
+           'raices': np.array,               # R x 2
+           'puntos_por_raiz': np.array,      # R
+           'puntos': int,
+           'tiempo_segundos': float}
+    str: Mensaje de error.
+    """
+    nx, ny = (resolucion, resolucion) if np.isscalar(resolucion) else resolucion
+    if int(nx) < 2 or int(ny) < 2:
+        return "Error: La resolución del mapa debe ser de al menos 2 puntos por eje."
+    if not (limites_x[0] < limites_x[1] and limites_y[0] < limites_y[1]):
+        return "Error: Los límites del mapa deben cumplir mínimo < máximo en cada eje."
+
+    inicio = time.perf_counter()
+    X, Y = np.meshgrid(np.linspace(limites_x[0], limites_x[1], int(nx)),
+                       np.linspace(limites_y[0], limites_y[1], int(ny)))
+    resultado = resolver_newton_por_lotes(F_func, J_func, np.vstack([X.ravel(), Y.ravel()]), tol, max_iter,
+                                          w_factor)
+    if isinstance(resultado, str):
+        return resultado
+
+    if tol_raices is None:
+        diagonal = np.hypot(limites_x[1] - limites_x[0], limites_y[1] - limites_y[0])
+        tol_raices = max(1e-3 * diagonal, 100 * tol)
+    convergidos = resultado['estado'] == CONVERGIO
+    raices, indice_convergidos = agrupar_raices(resultado['soluciones'][:, convergidos], tol_raices)
+    indice_raiz = np.full(X.size, -1, dtype=int)
+    indice_raiz[convergidos] = indice_convergidos
+
+    return {
+        'X': X,
+        'Y': Y,
+        'indice_raiz': indice_raiz.reshape(X.shape),
+        'iteraciones': resultado['iteraciones'].reshape(X.shape),
+        'estado': resultado['estado'].reshape(X.shape),
+        'raices': raices,
+        'puntos_por_raiz': np.bincount(indice_convergidos, minlength=len(raices)),
+        'puntos': X.size,
+        'tiempo_segundos': time.perf_counter() - inicio
+    }
+
+
+if __name__ == '__main__':
+    from .newton_raphson_no_line_relaxation import (ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2,
+                                                    resolver_sistema_newton_raphson)
+
+    print("Probando el módulo newton_basins.py...")
+    print("\nCaso 1: Lote pequeño comparado con el resolvedor punto a punto")
+    X_prueba = np.array([[1.5, 1.0, -3.0, 4.0],
+                         [3.5, 1.0, 2.0, -1.0]])
+    lote = resolver_newton_por_lotes(ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2, X_prueba, 1e-10, 50)
+    for columna in range(X_prueba.shape[1]):
+        individual = resolver_sistema_newton_raphson(ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2,
+                                                     X_prueba[:, columna], 1e-10, 50)
+        print(f"  x0 = {X_prueba[:, columna]}: lote -> {np.array2string(lote['soluciones'][:, columna], precision=6)}"
+              f" ({lote['iteraciones'][columna]} it.), individual -> "
+              f"{np.array2string(individual['solucion'], precision=6)} ({individual['iteraciones_realizadas']} it.)")
+
+    print("\nCaso 2: Mapa de cuencas de 500 x 500 puntos iniciales")
+    mapa = mapa_cuencas(ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2, (-6, 6), (-6, 6), resolucion=500)
+    if isinstance(mapa, str):
+        print(mapa)
+    else:
+        print(f"  {mapa['puntos']} puntos en {mapa['tiempo_segundos']:.2f} s")
+        for raiz, cantidad in zip(mapa['raices'], mapa['puntos_por_raiz']):
+            print(f"  Raíz {np.array2string(raiz, precision=6)}: {cantidad} puntos iniciales")
+        print(f"  Sin convergencia: {np.count_nonzero(mapa['indice_raiz'] < 0)} puntos")
+
+    print("\nCaso 3: Mismo mapa (100 x 100) con J por diferencias finitas")
+    mapa_fd = mapa_cuencas(ejemplo_F_sistema_2x2, None, (-6, 6), (-6, 6), resolucion=100)
+    if not isinstance(mapa_fd, str):
+        print(f"  Raíces encontradas: {len(mapa_fd['raices'])}, {mapa_fd['tiempo_segundos']:.2f} s")
@@ -0,0 +1,316 @@
+"""
+Newton-Krylov sin Jacobiano (JFNK) para sistemas no lineales grandes.
+
+Cada paso de Newton J(x_k) δ_k = −F(x_k) se resuelve de forma inexacta con GMRES, que solo
+necesita productos J v. Estos se aproximan con una diferencia de F,
+
+    J(x) v ≈ (F(x + ε v) − F(x)) / ε,   ε = sqrt(eps) · (1 + ||x||) / ||v||,
+
+por lo que J nunca se forma ni se almacena: el costo en memoria es O(n · reinicio) y cada
+iteración de GMRES cuesta una evaluación de F. La tolerancia relativa de GMRES (término de
+forzamiento η_k) sigue las reglas de Eisenstat y Walker: es laxa lejos de la solución, donde
+resolver el paso con precisión no compensa, y se ajusta a medida que ||F|| disminuye, lo que
+conserva la convergencia superlineal de Newton.
+"""
+
+import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from .iteration_history import crear_historial
+
+FORZAMIENTOS = ('ew1', 'ew2')
+# Pasos cortos consecutivos (||δ||∞ < tol) con ||F|| >= tol antes de declarar estancamiento
+PASOS_CORTOS_ESTANCAMIENTO = 3
+# Valores de Eisenstat-Walker para la elección 2: η_k = γ (||F_k|| / ||F_{k-1}||)^α
+_GAMMA_EW = 0.9
+_ALFA_EW = 2.0
+
+
+def _forzamiento(forzamiento, eta_previo, norma_Fx, norma_previa, norma_lineal_previa, eta_max, tol):
+    """
+    Término de forzamiento η_k de la iteración actual, con las salvaguardas de Eisenstat-Walker
+    (η_k no decrece bruscamente mientras η_{k-1} sea grande) y la de Kelley (η_k ≥ 0.5·tol/||F(x_k)||).
+    """
+    if not isinstance(forzamiento, str):
+        eta = float(forzamiento)
+    elif norma_previa is None:
+        eta = eta_max if eta_previo is None else eta_previo
+    elif forzamiento == 'ew1':
+        # Elección 1: concordancia entre la reducción real de ||F|| y la del modelo lineal
+        eta = abs(norma_Fx - norma_lineal_previa) / norma_previa
+        salvaguarda = eta_previo ** ((1 + np.sqrt(5)) / 2)
+        if salvaguarda > 0.1:
+            eta = max(eta, salvaguarda)
+    else:
+        eta = _GAMMA_EW * (norma_Fx / norma_previa) ** _ALFA_EW
+        salvaguarda = _GAMMA_EW * eta_previo ** _ALFA_EW
+        if salvaguarda > 0.1:
+            eta = max(eta, salvaguarda)
+    # Cerca de la solución el error de redondeo de J v (del orden de sqrt(eps)·||J||) impide residuos
+    # lineales menores que tol: no se pide más precisión de la necesaria para ||F(x_{k+1})|| < tol
+    return min(eta_max, max(eta, 0.5 * tol / norma_Fx))
+
+
+def _como_operador(precondicionador, n):
+    """Convierte el precondicionador (matriz, LinearOperator o función v -> M⁻¹v) en LinearOperator."""
+    if precondicionador is None or isinstance(precondicionador, spla.LinearOperator):
+        return precondicionador
+    if sp.issparse(precondicionador) or isinstance(precondicionador, np.ndarray):
+        return spla.aslinearoperator(precondicionador)
+    return spla.LinearOperator((n, n), matvec=precondicionador, dtype=float)
+
+
+def resolver_sistema_newton_krylov(F_func, x_inicial, tol=1e-6, max_iter=100, w_factor=1.0, historial=None,
+                                   forzamiento='ew2', eta_max=0.9, reinicio_gmres=30, max_iter_gmres=None,
+                                   precondicionador=None):
+    """
+    Resuelve F(x) = 0 con Newton-Krylov sin Jacobiano (GMRES con productos J v por diferencias).
+
+    Parámetros:
+    F_func (callable): Función F(x) de R^n en R^n.
+    x_inicial (np.array): Vector inicial de n componentes.
+    tol (float): Tolerancia para ||F(x_k)||. Un paso ||x_{k+1} − x_k||∞ < tol solo cuenta como
+                 convergencia si además ||F(x_{k+1})|| < tol: con GMRES inexacto y F mal escalada un
+                 paso corto no garantiza un residuo pequeño. Si se repiten PASOS_CORTOS_ESTANCAMIENTO
+                 pasos cortos sin que ||F|| baje de tol, se reporta estancamiento.
+    max_iter (int): Número máximo de iteraciones de Newton.
+    w_factor (float): Factor de relajación del paso (0 < w ≤ 1).
+    historial (str o HistorialIteraciones, opcional): Ver iteration_history. Para n grande conviene
+                                                      'normas' o 'ultimos_n'.
+    forzamiento (str o float): 'ew1' o 'ew2' (elecciones 1 y 2 de Eisenstat-Walker), o un η fijo
+                               (acotado inferiormente por 0.5·tol/||F(x_k)||).
+    eta_max (float): Cota superior de η_k (0 < eta_max < 1).
+    reinicio_gmres (int): Dimensión del subespacio de Krylov antes de reiniciar GMRES.
+    max_iter_gmres (int, opcional): Máximo de ciclos de reinicio de GMRES por paso. Por defecto
+                                    los necesarios para n productos J v.
+    precondicionador (opcional): Aproximación de J⁻¹ como matriz, LinearOperator o función
+                                 v -> M⁻¹v (p. ej. la factorización de la parte lineal de F).
+
+    Retorna:
+    dict: Un diccionario con los resultados:
+        {'solucion': np.array,
+         'iteraciones_realizadas': int,
+         'norma_residuo_final': float,
+         'status': str,
+         'historial_iteraciones': HistorialIteraciones (entradas {'iter', 'x_k', 'norma_residuo',
+                                  'delta_k', 'norma_delta_x', 'eta_k', 'iteraciones_krylov'};
+                                  no se guarda J),
+         'evaluaciones_F': int,        # incluye las de los productos J v
+         'iteraciones_krylov': int,    # total de iteraciones de GMRES
+         'pasos_inexactos': int}       # pasos en que GMRES no alcanzó η_k (se usa su mejor aproximación)
+    str: Mensaje de error si ocurre un problema de validación inicial.
+    """
+    if x_inicial is None or not isinstance(x_inicial, np.ndarray) or x_inicial.ndim != 1:
+        return "Error: Se requiere un vector inicial válido (arreglo de una dimensión)."
+    if isinstance(forzamiento, str) and forzamiento not in FORZAMIENTOS:
+        return (f"Error: Término de forzamiento no reconocido: '{forzamiento}'. "
+                f"Opciones: {', '.join(FORZAMIENTOS)} o un número en (0, 1).")
+    if not isinstance(forzamiento, str) and not 0 < forzamiento < 1:
+        return "Error: Un término de forzamiento fijo debe estar en (0, 1)."
+    if not 0 < eta_max < 1:
+        return "Error: eta_max debe estar en (0, 1)."
+    if int(reinicio_gmres) < 1:
+        return "Error: reinicio_gmres debe ser un entero positivo."
+
+    n = x_inicial.size
+    x = x_inicial.astype(float)
+    try:
+        historial_iteraciones = crear_historial(historial, capacidad=max_iter + 1)
+    except ValueError as e:
+        return f"Error: {e}"
+    try:
+        M = _como_operador(precondicionador, n)
+    except Exception as e:
+        return f"Error en el precondicionador: {str(e)}"
+
+    evaluaciones_F = 0
+
+    def evaluar_F(punto):
+        nonlocal evaluaciones_F
+        evaluaciones_F += 1
+        return np.asarray(F_func(punto), dtype=float)
+
+    try:
+        current_Fx = evaluar_F(x)
+    except Exception as e:
+        return f"Error al evaluar la función F en el punto inicial: {str(e)}"
+    if current_Fx.shape != (n,):
+        return f"Error: F(x) debe tener {n} componentes y tiene forma {current_Fx.shape}."
+    current_norma_Fx = np.linalg.norm(current_Fx)
+    historial_iteraciones.append({
+        'iter': 0,
+        'x_k': x,
+        'norma_residuo': current_norma_Fx,
+        'delta_k': None,
+        'norma_delta_x': None
+    })
+
+    reinicio = min(int(reinicio_gmres), n)
+    ciclos_gmres = max_iter_gmres if max_iter_gmres is not None else max(1, -(-n // reinicio))
+    iter_realizadas_count = 0
+    iteraciones_krylov = 0
+    pasos_inexactos = 0
+    eta = None
+    norma_previa = None
+    norma_lineal_previa = None   # ||F(x_{k-1}) + J(x_{k-1}) δ_{k-1}||, para la elección 1
+    pasos_cortos = 0             # pasos consecutivos con ||δ||∞ < tol y ||F|| >= tol
+    status_final = f"No se alcanzó convergencia tras {max_iter} iteraciones."
+
+    for k in range(1, max_iter + 1):
+        iter_realizadas_count = k
+
+        if current_norma_Fx < tol:
+            status_final = f"Convergencia alcanzada en {k} iteraciones (norma de F(x_k) < tol)."
+            historial_iteraciones.append({
+                'iter': k,
+                'x_k': x,
+                'norma_residuo': current_norma_Fx,
+                'delta_k': None,
+                'norma_delta_x': None
+            })
+            break
+
+        eta = _forzamiento(forzamiento, eta, current_norma_Fx, norma_previa, norma_lineal_previa, eta_max, tol)
+        norma_x = np.linalg.norm(x)
+        Fx_base = current_Fx
+        x_base = x
+
+        def producto_jacobiano(v):
+            v = np.ravel(v)
+            norma_v = np.linalg.norm(v)
+            if norma_v == 0:
+                return np.zeros(n)
+            epsilon = np.sqrt(np.finfo(float).eps) * (1 + norma_x) / norma_v
+            return (evaluar_F(x_base + epsilon * v) - Fx_base) / epsilon
+
+        J_operador = spla.LinearOperator((n, n), matvec=producto_jacobiano, dtype=float)
+        iteraciones_paso = 0
+
+        def contar_iteracion(_):
+            nonlocal iteraciones_paso
+            iteraciones_paso += 1
+
+        try:
+            current_delta_paso, info = spla.gmres(J_operador, -current_Fx, rtol=eta, atol=0.0, restart=reinicio,
+                                                  maxiter=ciclos_gmres, M=M, callback=contar_iteracion,
+                                                  callback_type='pr_norm')
+        except Exception as e:
+            status_final = f"Error al calcular el paso en iteración {k}: {str(e)}"
+            historial_iteraciones.append({
+                'iter': k,
+                'x_k': x,
+                'norma_residuo': current_norma_Fx,
+                'delta_k': None,
+                'norma_delta_x': None,
+                'eta_k': eta
+            })
+            break
+        iteraciones_krylov += iteraciones_paso
+        if info != 0:
+            pasos_inexactos += 1
+        if forzamiento == 'ew1':
+            norma_lineal_previa = np.linalg.norm(current_Fx + producto_jacobiano(current_delta_paso))
+
+        x_siguiente = x + w_factor * current_delta_paso
+        norma_delta_x_val = np.linalg.norm(x_siguiente - x, np.inf)
+        historial_iteraciones.append({
+            'iter': k,
+            'x_k': x,
+            'norma_residuo': current_norma_Fx,
+            'delta_k': current_delta_paso,
+            'norma_delta_x': norma_delta_x_val,
+            'eta_k': eta,
+            'iteraciones_krylov': iteraciones_paso
+        })
+
+        try:
+            Fx_siguiente = evaluar_F(x_siguiente)
+        except Exception as e:
+            status_final = f"Error al evaluar F en iteración {k}: {str(e)}"
+            break
+        norma_previa = current_norma_Fx
+        x, current_Fx, current_norma_Fx = x_siguiente, Fx_siguiente, np.linalg.norm(Fx_siguiente)
+
+        if norma_delta_x_val < tol:
+            if current_norma_Fx < tol:
+                status_final = f"Convergencia alcanzada en {k} iteraciones (||x_k - x_{{k-1}}|| < tol y norma de F(x_k) < tol)."
+                break
+            pasos_cortos += 1
+            if pasos_cortos >= PASOS_CORTOS_ESTANCAMIENTO:
+                status_final = (f"Estancamiento en la iteración {k}: {pasos_cortos} pasos con ||x_k - x_{{k-1}}|| < tol "
+                                f"pero ||F(x_k)|| = {current_norma_Fx:.3e} >= tol.")
+                break
+        else:
+            pasos_cortos = 0
+
+        if k == max_iter:
+            status_final = f"No se alcanzó convergencia tras {max_iter} iteraciones (ningún criterio cumplido)."
+
+    return {
+        'solucion': x,
+        'iteraciones_realizadas': iter_realizadas_count,
+        'norma_residuo_final': current_norma_Fx,
+        'status': status_final,
+        'historial_iteraciones': historial_iteraciones,
+        'evaluaciones_F': evaluaciones_F,
+        'iteraciones_krylov': iteraciones_krylov,
+        'pasos_inexactos': pasos_inexactos
+    }
+
+
+def ejemplo_bratu_2d(m, lam=1.0):
+    """
+    Problema de Bratu en el cuadrado unitario, −Δu = λ eᵘ con u = 0 en el borde, discretizado con
+    diferencias finitas en una malla interior de m x m (n = m² incógnitas).
+
+    Retorna:
+    tuple: (F_func, L) con F(u) = L u − λ eᵘ y L la matriz dispersa del laplaciano (−Δ).
+    """
+    h = 1.0 / (m + 1)
+    T = sp.diags([-1.0, 2.0, -1.0], [-1, 0, 1], shape=(m, m))
+    identidad = sp.identity(m)
+    L = ((sp.kron(identidad, T) + sp.kron(T, identidad)) / h ** 2).tocsr()
+
+    def F_func(u):
+        return L @ u - lam * np.exp(u)
+
+    return F_func, L
+
+
+if __name__ == '__main__':
+    import time
+    from .newton_raphson_no_line_relaxation import ejemplo_F_sistema_2x2
+
+    print("Probando el módulo newton_krylov.py (Newton-Krylov sin Jacobiano)...")
+
+    print("\nCaso 1: Sistema de ejemplo 2x2")
+    resultado = resolver_sistema_newton_krylov(ejemplo_F_sistema_2x2, np.array([1.5, 3.5]), 1e-10)
+    if isinstance(resultado, str):
+        print(resultado)
+    else:
+        print(f"Status: {resultado['status']}")
+        print(f"Solución x final: {np.array2string(resultado['solucion'], precision=8)}")
+        print(f"Evaluaciones de F: {resultado['evaluaciones_F']}, iteraciones de GMRES: "
+              f"{resultado['iteraciones_krylov']}")
+        for item in resultado['historial_iteraciones']:
+            if item.get('eta_k') is not None:
+                print(f"  Iter {item['iter']:02d}: ||F|| = {item['norma_residuo']:.4e}, eta = {item['eta_k']:.3e}, "
+                      f"GMRES: {item['iteraciones_krylov']:.0f} it.")
+
+    print("\nCaso 2: Bratu 2D con 10^4 incógnitas, sin y con precondicionador (laplaciano factorizado)")
+    F_bratu, L_bratu = ejemplo_bratu_2d(100)
+    lu_laplaciano = spla.splu(L_bratu.tocsc())
+    for nombre, M_prueba in (("sin precondicionador", None), ("precondicionado", lu_laplaciano.solve)):
+        for forzamiento_prueba in ('ew1', 'ew2', 1e-4):
+            inicio = time.perf_counter()
+            resultado_bratu = resolver_sistema_newton_krylov(F_bratu, np.zeros(L_bratu.shape[0]), 1e-8,
+                                                             historial='normas', forzamiento=forzamiento_prueba,
+                                                             precondicionador=M_prueba)
+            if isinstance(resultado_bratu, str):
+                print(resultado_bratu)
+                continue
+            print(f"  {nombre:<20} forzamiento {str(forzamiento_prueba):<5}: "
+                  f"{resultado_bratu['iteraciones_realizadas']} it. de Newton, "
+                  f"{resultado_bratu['iteraciones_krylov']} de GMRES, {resultado_bratu['evaluaciones_F']} "
+                  f"evaluaciones de F, ||F|| = {resultado_bratu['norma_residuo_final']:.2e}, "
+                  f"{time.perf_counter() - inicio:.2f} s")
@@ -1,16 +1,131 @@
+import warnings
 import numpy as np
+import scipy.linalg as la
+from .iteration_history import crear_historial
+from .numerical_jacobian import JacobianoNumerico
 
-def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_iter=100, w_factor=1.0):
+def _factorizar_jacobiano(J):
+    """
+    Factoriza J = P L U (LAPACK getrf) para reutilizarla en varios pasos con lu_solve.
+    Lanza np.linalg.LinAlgError si J es singular, igual que np.linalg.solve.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', la.LinAlgWarning)
+        lu, piv = la.lu_factor(J)
+    if np.any(np.diagonal(lu) == 0):
+        raise np.linalg.LinAlgError("Singular matrix")
+    return lu, piv
+
+BUSQUEDAS_LINEALES = ('armijo', 'interpolacion')
+# Constante de descenso suficiente de Armijo sobre φ(α) = ||F(x_k + α δ_k)||²
+_C_ARMIJO = 1e-4
+# Peso de las iteraciones previas en la referencia no monótona de Zhang-Hager (0 = Armijo monótono)
+_ETA_NO_MONOTONO = 0.85
+# α mínimo, relativo a w_factor, antes de abandonar la búsqueda y dar el mejor α probado
+_ALFA_MINIMO = 1e-3
+
+def _busqueda_lineal(F_func, x, delta, norma_Fx, phi_referencia, metodo, alfa_inicial, max_retrocesos,
+                     alfa_minimo):
+    """
+    Busca α con descenso suficiente de φ(α) = ||F(x + α δ)||²: φ(α) ≤ φ_ref − 2·c·α φ(0), que es la
+    condición de Armijo con φ'(0) = −2 φ(0) (la derivada exacta cuando δ = −J(x)⁻¹ F(x) con J
+    evaluado en x). Con φ_ref = φ(0) es la condición monótona; una φ_ref mayor (promedio de las
+    iteraciones previas) acepta pasos que suben ||F|| momentáneamente.
+
+    'armijo' reduce α a la mitad en cada retroceso; 'interpolacion' toma el mínimo del polinomio
+    cuadrático (primer retroceso) o cúbico (siguientes) que interpola los valores de φ ya
+    calculados, acotado a [0.1 α, 0.5 α].
+
+    Retorna:
+    tuple: (aceptado, alfa, x_prueba, F_prueba, alfas, normas) con alfas y normas las listas de
+           todos los α probados y de ||F|| en cada uno. Si ningún α cumple la condición tras
+           max_retrocesos retrocesos o α baja de alfa_minimo, aceptado es False y alfa, x_prueba,
+           F_prueba son los del α probado con menor ||F|| (None si F no fue finita en ninguno).
+    """
+    phi_0 = norma_Fx ** 2
+    derivada_0 = -2.0 * phi_0
+    alfas, normas = [], []
+    alfa, alfa_previo, phi_previo = alfa_inicial, None, None
+    mejor_prueba = (np.inf, None, None, None) # (||F||, α, x, F) de la mejor prueba finita
+    for _ in range(max_retrocesos + 1):
+        x_prueba = x + alfa * delta
+        F_prueba = F_func(x_prueba)
+        norma_prueba = np.linalg.norm(F_prueba)
+        alfas.append(alfa)
+        normas.append(norma_prueba)
+        if norma_prueba < mejor_prueba[0]:
+            mejor_prueba = (norma_prueba, alfa, x_prueba, F_prueba)
+        phi = norma_prueba ** 2
+        if np.isfinite(phi) and phi <= phi_referencia + _C_ARMIJO * alfa * derivada_0:
+            return True, alfa, x_prueba, F_prueba, alfas, normas
+
+        if metodo == 'armijo' or not np.isfinite(phi):
+            alfa_nuevo = 0.5 * alfa
+        elif alfa_previo is None:
+            # Mínimo de la parábola con φ(0), φ'(0) y φ(α)
+            alfa_nuevo = -derivada_0 * alfa ** 2 / (2 * (phi - phi_0 - derivada_0 * alfa))
+        else:
+            # Mínimo de la cúbica con φ(0), φ'(0), φ(α) y φ(α_previo)
+            r1 = phi - phi_0 - derivada_0 * alfa
+            r2 = phi_previo - phi_0 - derivada_0 * alfa_previo
+            a = (r1 / alfa ** 2 - r2 / alfa_previo ** 2) / (alfa - alfa_previo)
+            b = (-alfa_previo * r1 / alfa ** 2 + alfa * r2 / alfa_previo ** 2) / (alfa - alfa_previo)
+            if a == 0:
+                alfa_nuevo = -derivada_0 / (2 * b)
+            else:
+                discriminante = b ** 2 - 3 * a * derivada_0
+                alfa_nuevo = (-b + np.sqrt(max(discriminante, 0.0))) / (3 * a)
+        if not np.isfinite(alfa_nuevo):
+            alfa_nuevo = 0.5 * alfa
+        alfa_previo, phi_previo = alfa, phi
+        alfa = min(max(alfa_nuevo, 0.1 * alfa), 0.5 * alfa)
+        if alfa < alfa_minimo:
+            break
+    return False, mejor_prueba[1], mejor_prueba[2], mejor_prueba[3], alfas, normas
+
+def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_iter=100, w_factor=1.0,
+                                    historial=None, reusar_jacobiano=1, razon_contraccion=0.5,
+                                    metodo_jacobiano='adelante', evaluacion_jacobiano='auto',
+                                    busqueda_lineal=None, max_retrocesos=20):
     """
     Resuelve un sistema de ecuaciones no lineales F(x) = 0 usando el método de Newton-Raphson con relajación.
 
     Parámetros:
     F_func (callable): Función que calcula el vector F(x) de ecuaciones no lineales.
-    J_func (callable): Función que calcula la matriz jacobiana J(x) de F.
+    J_func (callable o None): Función que calcula la matriz jacobiana J(x) de F. Si es None, J se
+                              aproxima numéricamente (ver numerical_jacobian.JacobianoNumerico).
     x_inicial (np.array): Vector de estimación inicial para las incógnitas.
     tol (float): Tolerancia para la norma del residuo.
     max_iter (int): Número máximo de iteraciones.
-    w_factor (float): Factor de relajación (0 < w ≤ 1). 1 = paso completo.
+    w_factor (float): Factor de relajación (0 < w ≤ 1). 1 = paso completo. Con búsqueda lineal es
+                      el primer α que se prueba en cada iteración.
+    historial (str o HistorialIteraciones, opcional): Qué se guarda de cada iteración ('ninguno',
+                      'normas', 'cada_k', 'ultimos_n', 'completo'). J(x_k) ocupa O(n²) por
+                      iteración, por lo que para sistemas grandes conviene 'normas' o 'ultimos_n'.
+                      None equivale a 'completo'.
+    reusar_jacobiano (int): Número máximo de pasos que se resuelven con una misma factorización de J
+                            (método de la cuerda / Shamanskii). 1 = Newton clásico, J nuevo en cada paso.
+    razon_contraccion (float): Con reusar_jacobiano > 1, si ||F(x_k)|| > razon_contraccion · ||F(x_{k-1})||
+                               la convergencia se considera degradada y J se evalúa y factoriza de nuevo.
+    metodo_jacobiano (str): Con J_func=None, 'adelante', 'central' o 'complejo' (paso complejo).
+    evaluacion_jacobiano (str): Con J_func=None, cómo se evalúan las columnas: 'auto', 'vectorizada',
+                                'secuencial', 'hilos' o 'procesos'.
+    busqueda_lineal (str, opcional): None = paso fijo x_{k+1} = x_k + w δ_k. 'armijo' (retroceso
+                                     α ← α/2) o 'interpolacion' (retroceso cuadrático/cúbico) eligen
+                                     α_k en cada iteración con descenso suficiente de ||F||² (ver
+                                     _busqueda_lineal); F en el punto aceptado se reutiliza en la
+                                     iteración siguiente. La referencia de descenso es un promedio de
+                                     ||F||² de las iteraciones previas (no monótona). Si ningún α la
+                                     cumple antes de bajar de 1e-3·w se da el α probado con menor
+                                     ||F||, la referencia se reinicia y la iteración siguiente da el
+                                     paso fijo w δ_k, de modo que cerca de un mínimo local de ||F||
+                                     que no es raíz el método puede escapar con un salto largo. Solo
+                                     se aplica en iteraciones con J nuevo: con una factorización
+                                     reutilizada δ_k no es el paso de Newton en x_k y se da el paso fijo.
+                                     En problemas donde el paso completo ya converge (p. ej. el
+                                     sistema 2x2 de ejemplo) las pruebas rechazadas cuestan más
+                                     evaluaciones de F que el paso fijo; rinde cuando w δ_k diverge.
+    max_retrocesos (int): Máximo de reducciones de α por iteración antes de abandonar la búsqueda.
 
     Retorna:
     dict: Un diccionario con los resultados:
@@ -18,22 +133,50 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
          'iteraciones_realizadas': int, 
          'norma_residuo_final': float, 
          'status': str,
-         'historial_iteraciones': list of dicts [{'iter': int, 'x_k': np.array, 'norma_residuo': float}]}
+         'historial_iteraciones': HistorialIteraciones (se recorre como una lista de dicts
+                                  [{'iter': int, 'x_k': np.array, 'norma_residuo': float,
+                                    'alfa_k': float, ...}]; con búsqueda lineal también
+                                  'pruebas_busqueda', 'paso_sin_descenso' (1 si la búsqueda no
+                                  encontró descenso y se dio el mejor α probado) y los arreglos 'alfas_prueba' y
+                                  'normas_prueba' de longitud max_retrocesos + 1, completados con NaN),
+         'evaluaciones_F': int,         # Sin contar las del Jacobiano numérico
+         'evaluaciones_jacobiano': int,
+         'factorizaciones': int,
+         'jacobiano_numerico': dict o None}  # {'metodo', 'evaluacion', 'evaluaciones_F'} si J_func=None
+    En las iteraciones que reutilizan la factorización, 'Jx_k' es None y 'jacobiano_nuevo' es 0.
     """
     if x_inicial is None or not isinstance(x_inicial, np.ndarray):
         return "Error: Se requiere un vector inicial válido."
+    if int(reusar_jacobiano) < 1:
+        return "Error: reusar_jacobiano debe ser un entero positivo."
+    if busqueda_lineal is not None and busqueda_lineal not in BUSQUEDAS_LINEALES:
+        return (f"Error: Búsqueda lineal no reconocida: '{busqueda_lineal}'. "
+                f"Opciones: None, {', '.join(BUSQUEDAS_LINEALES)}.")
+    if int(max_retrocesos) < 0:
+        return "Error: max_retrocesos debe ser un entero no negativo."
+    jacobiano_aproximado = None
+    if J_func is None:
+        try:
+            jacobiano_aproximado = JacobianoNumerico(F_func, metodo_jacobiano, evaluacion_jacobiano)
+        except ValueError as e:
+            return f"Error: {e}"
     
     x = np.copy(x_inicial).astype(float)
-    historial_iteraciones = []
+    try:
+        historial_iteraciones = crear_historial(historial, capacidad=max_iter + 1)
+    except ValueError as e:
+        return f"Error: {e}"
     
     # Guardar estado inicial (iteración 0)
+    evaluaciones_F = 0
     try:
         Fx_inicial = F_func(x)
+        evaluaciones_F += 1
         norma_inicial = np.linalg.norm(Fx_inicial)
         historial_iteraciones.append({
             'iter': 0,
-            'x_k': np.copy(x),
-            'Fx_k': np.copy(Fx_inicial),
+            'x_k': x, # El historial copia los arreglos a su propio buffer
+            'Fx_k': Fx_inicial,
             'norma_residuo': norma_inicial,
             'Jx_k': None, 
             'delta_k': None,
@@ -43,6 +186,14 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
         return f"Error al evaluar la función F en el punto inicial: {str(e)}"
     
     iter_realizadas_count = 0
+    evaluaciones_jacobiano = 0
+    factorizaciones = 0
+    factorizacion_J = None   # (lu, piv) de la última J factorizada
+    usos_factorizacion = 0   # Pasos resueltos con factorizacion_J
+    norma_previa = None      # ||F(x_{k-1})||, para detectar una contracción degradada
+    Fx_conocido = Fx_inicial # F(x) del x actual si ya se calculó (punto inicial o aceptado por la búsqueda)
+    phi_referencia, peso_referencia = 0.0, 0.0 # Promedio ponderado de ||F(x_k)||² (Zhang-Hager)
+    salto_pendiente = False
     # norma_residuo_final = norma_inicial # Se actualiza en el bucle
     status_final = f"No se alcanzó convergencia tras {max_iter} iteraciones."
     
@@ -56,14 +207,17 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
         current_delta_paso = None
         
         try:
-            current_Fx = F_func(x) # Esto es F(x_k)
+            if Fx_conocido is None:
+                Fx_conocido = F_func(x)
+                evaluaciones_F += 1
+            current_Fx = Fx_conocido # Esto es F(x_k)
             current_norma_Fx = np.linalg.norm(current_Fx)
         except Exception as e:
             status_final = f"Error al evaluar F en iteración {k}: {str(e)}"
             # Añadir historial parcial antes de salir
             historial_iteraciones.append({
                 'iter': k,
-                'x_k': np.copy(x_previo), # x_k antes del fallo
+                'x_k': x_previo, # x_k antes del fallo
                 'Fx_k': current_Fx, # Podría ser None si F_func falló
                 'norma_residuo': current_norma_Fx, # Podría ser None
                 'Jx_k': None,
@@ -78,7 +232,7 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
             # Registrar esta iteración final antes de salir
             historial_iteraciones.append({
                 'iter': k,
-                'x_k': np.copy(x_previo), # x_k actual
+                'x_k': x_previo, # x_k actual
                 'Fx_k': current_Fx,
                 'norma_residuo': current_norma_Fx,
                 'Jx_k': None, # J y delta no se calcularon si ya convergió por F(x_k)
@@ -87,14 +241,23 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
             })
             break # Salir del bucle for
 
+        necesita_jacobiano = (factorizacion_J is None or usos_factorizacion >= reusar_jacobiano or
+                              (norma_previa is not None and current_norma_Fx > razon_contraccion * norma_previa))
         try:
-            current_Jx = J_func(x) # J(x_k)
-            current_delta_paso = np.linalg.solve(current_Jx, -current_Fx) # delta_k
+            if necesita_jacobiano:
+                # J(x_k); la aproximación numérica reutiliza F(x_k) ya calculado
+                current_Jx = J_func(x) if jacobiano_aproximado is None else jacobiano_aproximado(x, current_Fx)
+                evaluaciones_jacobiano += 1
+                factorizacion_J = _factorizar_jacobiano(current_Jx)
+                factorizaciones += 1
+                usos_factorizacion = 0
+            current_delta_paso = la.lu_solve(factorizacion_J, -current_Fx) # delta_k
+            usos_factorizacion += 1
         except np.linalg.LinAlgError as e:
             status_final = f"Error: Jacobiano singular en iteración {k}: {str(e)}"
             historial_iteraciones.append({
                 'iter': k,
-                'x_k': np.copy(x_previo),
+                'x_k': x_previo,
                 'Fx_k': current_Fx,
                 'norma_residuo': current_norma_Fx,
                 'Jx_k': current_Jx, # Puede ser el Jacobiano que causó el error
@@ -106,7 +269,7 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
             status_final = f"Error al calcular el paso en iteración {k}: {str(e)}"
             historial_iteraciones.append({
                 'iter': k,
-                'x_k': np.copy(x_previo),
+                'x_k': x_previo,
                 'Fx_k': current_Fx,
                 'norma_residuo': current_norma_Fx,
                 'Jx_k': current_Jx, # Puede ser None si J_func falló antes
@@ -115,7 +278,58 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
             })
             break # Salir del bucle for
         
-        x = x_previo + w_factor * current_delta_paso # Esto es x_{k+1}
+        alfa_k = w_factor
+        pruebas = None
+        if busqueda_lineal is None or not necesita_jacobiano or salto_pendiente:
+            # Con una factorización reutilizada δ_k no es el paso de Newton en x_k y φ'(0) = −2 φ(0)
+            # no se cumple: se da el paso fijo y la prueba de contracción decide si renovar J.
+            # Tras una búsqueda sin descenso también se da el paso fijo, para salir del mínimo local
+            x = x_previo + w_factor * current_delta_paso # Esto es x_{k+1}
+            Fx_conocido = None
+            salto_pendiente = False
+        else:
+            # Referencia no monótona: C_k = (η Q_{k-1} C_{k-1} + φ_k) / Q_k, Q_k = η Q_{k-1} + 1
+            phi_k = current_norma_Fx ** 2
+            peso_previo = _ETA_NO_MONOTONO * peso_referencia
+            peso_referencia = peso_previo + 1.0
+            phi_referencia = (peso_previo * phi_referencia + phi_k) / peso_referencia
+            try:
+                aceptado, alfa_k, x_prueba, F_prueba, alfas, normas = _busqueda_lineal(
+                    F_func, x_previo, current_delta_paso, current_norma_Fx, phi_referencia,
+                    busqueda_lineal, w_factor, int(max_retrocesos), _ALFA_MINIMO * w_factor)
+            except Exception as e:
+                status_final = f"Error al evaluar F en la búsqueda lineal de la iteración {k}: {str(e)}"
+                break
+            evaluaciones_F += len(alfas)
+            pruebas = {
+                'pruebas_busqueda': len(alfas),
+                'alfas_prueba': np.pad(np.array(alfas, dtype=float), (0, int(max_retrocesos) + 1 - len(alfas)),
+                                       constant_values=np.nan),
+                'normas_prueba': np.pad(np.array(normas, dtype=float), (0, int(max_retrocesos) + 1 - len(normas)),
+                                        constant_values=np.nan),
+                'paso_sin_descenso': float(not aceptado)
+            }
+            if x_prueba is None:
+                status_final = (f"Error: La búsqueda lineal no encontró un paso con descenso suficiente de ||F|| "
+                                f"en la iteración {k} ({len(alfas)} pruebas) y F no es finita en ningún α probado.")
+                historial_iteraciones.append({
+                    'iter': k,
+                    'x_k': x_previo,
+                    'Fx_k': current_Fx,
+                    'norma_residuo': current_norma_Fx,
+                    'Jx_k': current_Jx,
+                    'delta_k': current_delta_paso,
+                    'norma_delta_x': None,
+                    'jacobiano_nuevo': float(necesita_jacobiano),
+                    **pruebas
+                })
+                break
+            if not aceptado:
+                # Sin descenso suficiente se da el mejor α probado y la referencia no monótona se
+                # reinicia en la iteración siguiente, para que un paso que sube ||F|| no la infle
+                peso_referencia = 0.0
+                salto_pendiente = True
+            x, Fx_conocido = x_prueba, np.asarray(F_prueba) # x_{k+1} y F(x_{k+1}), ya evaluada
         
         # Calcular norma de la diferencia entre x_k (ahora x) y x_{k-1} (x_previo)
         norma_delta_x_val = np.linalg.norm(x - x_previo, np.inf) if x_previo is not None else None
@@ -123,13 +337,17 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
         # Actualizar el historial con todos los datos de la iteración k (usando x_previo como x_k)
         historial_iteraciones.append({
             'iter': k,
-            'x_k': np.copy(x_previo),    # x_k
+            'x_k': x_previo,    # x_k
             'Fx_k': current_Fx,           # Valor de F(x_k)
             'norma_residuo': current_norma_Fx, # Norma de F(x_k)
-            'Jx_k': current_Jx,           # Jacobiano J(x_k)
+            'Jx_k': current_Jx,           # Jacobiano J(x_k) (None si se reutilizó una factorización previa)
             'delta_k': current_delta_paso, # Paso delta_k calculado
-            'norma_delta_x': norma_delta_x_val # Norma ||x_{k+1} - x_k||
+            'norma_delta_x': norma_delta_x_val, # Norma ||x_{k+1} - x_k||
+            'jacobiano_nuevo': float(necesita_jacobiano),
+            'alfa_k': alfa_k,                   # x_{k+1} = x_k + alfa_k * delta_k
+            **(pruebas or {})
         })
+        norma_previa = current_norma_Fx
         
         # Condición de parada por diferencia entre iteraciones sucesivas de x
         if norma_delta_x_val is not None and norma_delta_x_val < tol:
@@ -148,7 +366,12 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
     # Determinar la norma del residuo final basándose en el último x calculado
     # Si el bucle terminó antes de max_iter, 'x' es la solución.
     # Si el bucle completó max_iter, 'x' es x_{max_iter+1}.
-    final_Fx = F_func(x) # F(solución final) o F(x_{max_iter+1})
+    if jacobiano_aproximado is not None:
+        jacobiano_aproximado.cerrar()
+    if Fx_conocido is None:
+        Fx_conocido = F_func(x) # F(solución final) o F(x_{max_iter+1})
+        evaluaciones_F += 1
+    final_Fx = Fx_conocido
     norma_residuo_final_calculada = np.linalg.norm(final_Fx)
     
     return {
@@ -156,7 +379,234 @@ def resolver_sistema_newton_raphson(F_func, J_func, x_inicial, tol=1e-6, max_ite
         'iteraciones_realizadas': iter_realizadas_count,
         'norma_residuo_final': norma_residuo_final_calculada, # Usar la norma del F(x) final
         'status': status_final,
-        'historial_iteraciones': historial_iteraciones
+        'historial_iteraciones': historial_iteraciones,
+        'evaluaciones_F': evaluaciones_F,
+        'evaluaciones_jacobiano': evaluaciones_jacobiano,
+        'factorizaciones': factorizaciones,
+        'jacobiano_numerico': None if jacobiano_aproximado is None else {
+            'metodo': jacobiano_aproximado.metodo,
+            'evaluacion': jacobiano_aproximado.modo_evaluacion,
+            'evaluaciones_F': jacobiano_aproximado.evaluaciones_F
+        }
+    }
+
+ACTUALIZACIONES_BROYDEN = ('buena', 'mala')
+# Pasos cortos consecutivos (||s||∞ < tol) con ||F|| >= tol antes de declarar estancamiento en Broyden
+PASOS_CORTOS_ESTANCAMIENTO = 3
+
+def _inversa_jacobiano(J):
+    """Inversa de J a partir de su factorización LU (lanza np.linalg.LinAlgError si es singular)."""
+    return la.lu_solve(_factorizar_jacobiano(J), np.eye(J.shape[0]))
+
+def resolver_sistema_broyden(F_func, J_func, x_inicial, tol=1e-6, max_iter=100, w_factor=1.0,
+                             historial=None, actualizacion='buena', razon_estancamiento=0.9,
+                             max_estancamiento=3, metodo_jacobiano='adelante', evaluacion_jacobiano='auto'):
+    """
+    Resuelve F(x) = 0 con el método cuasi-Newton de Broyden.
+
+    J solo se evalúa e invierte al inicio (y al reiniciar); después la inversa H ≈ J⁻¹ se
+    corrige en O(n²) con la fórmula de Sherman-Morrison, usando s = x_{k+1} − x_k e
+    y = F(x_{k+1}) − F(x_k):
+    - 'buena': H += (s − H y) (sᵀ H) / (sᵀ H y)   (actualización de rango 1 de J)
+    - 'mala':  H += (s − H y) yᵀ / (yᵀ y)         (actualización de rango 1 directa de H)
+    Cada iteración requiere una sola evaluación de F. Si ||F(x_{k+1})|| > razon_estancamiento ·
+    ||F(x_k)|| durante max_estancamiento iteraciones seguidas (o la actualización no está
+    definida), J se evalúa de nuevo en el punto actual.
+
+    Un paso corto (||x_{k+1} − x_k||∞ < tol) solo cuenta como convergencia si además
+    ||F(x_{k+1})|| < tol: H es una aproximación y puede dar pasos cortos lejos de la raíz. Si el
+    paso corto vino de H actualizada, J se evalúa de nuevo; tras PASOS_CORTOS_ESTANCAMIENTO
+    pasos cortos seguidos sin que ||F|| baje de tol se reporta estancamiento.
+
+    Parámetros:
+    F_func, J_func, x_inicial, tol, max_iter, w_factor, historial: Igual que en
+        resolver_sistema_newton_raphson (J_func=None aproxima J numéricamente).
+    actualizacion (str): 'buena' o 'mala'.
+    razon_estancamiento (float): Reducción mínima de ||F|| por iteración para no contar estancamiento.
+    max_estancamiento (int): Iteraciones seguidas de estancamiento antes de reiniciar J.
+    metodo_jacobiano, evaluacion_jacobiano (str): Aproximación de J si J_func es None.
+
+    Retorna:
+    dict: Mismo formato que resolver_sistema_newton_raphson ('Jx_k' solo aparece en las
+          iteraciones que evalúan J), más:
+        {'evaluaciones_F': int,
+         'evaluaciones_jacobiano': int,
+         'reinicios_jacobiano': int,
+         'jacobiano_numerico': dict o None}
+    str: Mensaje de error si ocurre un problema de validación inicial.
+    """
+    if x_inicial is None or not isinstance(x_inicial, np.ndarray):
+        return "Error: Se requiere un vector inicial válido."
+    if actualizacion not in ACTUALIZACIONES_BROYDEN:
+        return (f"Error: Actualización de Broyden no reconocida: '{actualizacion}'. "
+                f"Opciones: {', '.join(ACTUALIZACIONES_BROYDEN)}.")
+    jacobiano_aproximado = None
+    if J_func is None:
+        try:
+            jacobiano_aproximado = JacobianoNumerico(F_func, metodo_jacobiano, evaluacion_jacobiano)
+        except ValueError as e:
+            return f"Error: {e}"
+
+    x = np.copy(x_inicial).astype(float)
+    try:
+        historial_iteraciones = crear_historial(historial, capacidad=max_iter + 1)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    try:
+        current_Fx = np.asarray(F_func(x), dtype=float)
+    except Exception as e:
+        return f"Error al evaluar la función F en el punto inicial: {str(e)}"
+    current_norma_Fx = np.linalg.norm(current_Fx)
+    evaluaciones_F = 1
+    historial_iteraciones.append({
+        'iter': 0,
+        'x_k': x,
+        'Fx_k': current_Fx,
+        'norma_residuo': current_norma_Fx,
+        'Jx_k': None,
+        'delta_k': None,
+        'norma_delta_x': None
+    })
+
+    iter_realizadas_count = 0
+    evaluaciones_jacobiano = 0
+    reinicios_jacobiano = 0
+    H = None                 # Aproximación de J(x_k)⁻¹
+    iteraciones_estancado = 0
+    reiniciar_jacobiano = False # La última actualización de H no estaba definida (o dio un paso corto)
+    pasos_cortos = 0            # Pasos consecutivos con ||s||∞ < tol y ||F|| >= tol
+    status_final = f"No se alcanzó convergencia tras {max_iter} iteraciones."
+
+    for k in range(1, max_iter + 1):
+        iter_realizadas_count = k
+
+        if current_norma_Fx < tol:
+            status_final = f"Convergencia alcanzada en {k} iteraciones (norma de F(x_k) < tol)."
+            historial_iteraciones.append({
+                'iter': k,
+                'x_k': x,
+                'Fx_k': current_Fx,
+                'norma_residuo': current_norma_Fx,
+                'Jx_k': None,
+                'delta_k': None,
+                'norma_delta_x': None
+            })
+            break
+
+        current_Jx = None
+        try:
+            if H is None or reiniciar_jacobiano or iteraciones_estancado >= max_estancamiento:
+                if H is not None:
+                    reinicios_jacobiano += 1
+                current_Jx = J_func(x) if jacobiano_aproximado is None else jacobiano_aproximado(x, current_Fx)
+                evaluaciones_jacobiano += 1
+                H = _inversa_jacobiano(current_Jx)
+                iteraciones_estancado = 0
+                reiniciar_jacobiano = False
+            current_delta_paso = -(H @ current_Fx)
+        except np.linalg.LinAlgError as e:
+            status_final = f"Error: Jacobiano singular en iteración {k}: {str(e)}"
+            historial_iteraciones.append({
+                'iter': k,
+                'x_k': x,
+                'Fx_k': current_Fx,
+                'norma_residuo': current_norma_Fx,
+                'Jx_k': current_Jx,
+                'delta_k': None,
+                'norma_delta_x': None
+            })
+            break
+        except Exception as e:
+            status_final = f"Error al calcular el paso en iteración {k}: {str(e)}"
+            historial_iteraciones.append({
+                'iter': k,
+                'x_k': x,
+                'Fx_k': current_Fx,
+                'norma_residuo': current_norma_Fx,
+                'Jx_k': current_Jx,
+                'delta_k': None,
+                'norma_delta_x': None
+            })
+            break
+
+        x_siguiente = x + w_factor * current_delta_paso
+        s_paso = x_siguiente - x
+        norma_delta_x_val = np.linalg.norm(s_paso, np.inf)
+        historial_iteraciones.append({
+            'iter': k,
+            'x_k': x,
+            'Fx_k': current_Fx,
+            'norma_residuo': current_norma_Fx,
+            'Jx_k': current_Jx,
+            'delta_k': current_delta_paso,
+            'norma_delta_x': norma_delta_x_val
+        })
+
+        try:
+            Fx_siguiente = np.asarray(F_func(x_siguiente), dtype=float)
+            evaluaciones_F += 1
+        except Exception as e:
+            status_final = f"Error al evaluar F en iteración {k}: {str(e)}"
+            break
+
+        # Actualización de Sherman-Morrison de la inversa
+        y_cambio = Fx_siguiente - current_Fx
+        H_y = H @ y_cambio
+        if actualizacion == 'buena':
+            sT_H = s_paso @ H
+            denominador = sT_H @ y_cambio
+            vector_fila = sT_H
+        else:
+            denominador = y_cambio @ y_cambio
+            vector_fila = y_cambio
+        if abs(denominador) > np.finfo(float).eps * np.linalg.norm(s_paso) * np.linalg.norm(y_cambio):
+            H += np.outer((s_paso - H_y) / denominador, vector_fila)
+        else:
+            reiniciar_jacobiano = True # Actualización no definida: H quedó desactualizada, reiniciar J
+
+        norma_siguiente = np.linalg.norm(Fx_siguiente)
+        if norma_siguiente > razon_estancamiento * current_norma_Fx:
+            iteraciones_estancado += 1
+        else:
+            iteraciones_estancado = 0
+
+        x, current_Fx, current_norma_Fx = x_siguiente, Fx_siguiente, norma_siguiente
+
+        if norma_delta_x_val < tol:
+            if current_norma_Fx < tol:
+                status_final = f"Convergencia alcanzada en {k} iteraciones (||x_k - x_{{k-1}}|| < tol y norma de F(x_k) < tol)."
+                break
+            pasos_cortos += 1
+            if pasos_cortos >= PASOS_CORTOS_ESTANCAMIENTO:
+                status_final = (f"Estancamiento en la iteración {k}: {pasos_cortos} pasos con ||x_k - x_{{k-1}}|| < tol "
+                                f"pero ||F(x_k)|| = {current_norma_Fx:.3e} >= tol.")
+                break
+            if current_Jx is None:
+                reiniciar_jacobiano = True # El paso corto vino de H actualizada: comprobar con J nuevo
+        else:
+            pasos_cortos = 0
+
+        if k == max_iter:
+            status_final = f"No se alcanzó convergencia tras {max_iter} iteraciones (ningún criterio cumplido)."
+
+    if jacobiano_aproximado is not None:
+        jacobiano_aproximado.cerrar()
+
+    return {
+        'solucion': x,
+        'iteraciones_realizadas': iter_realizadas_count,
+        'norma_residuo_final': current_norma_Fx, # F(x) final ya se evaluó en la última iteración
+        'status': status_final,
+        'historial_iteraciones': historial_iteraciones,
+        'evaluaciones_F': evaluaciones_F,
+        'evaluaciones_jacobiano': evaluaciones_jacobiano,
+        'reinicios_jacobiano': reinicios_jacobiano,
+        'jacobiano_numerico': None if jacobiano_aproximado is None else {
+            'metodo': jacobiano_aproximado.metodo,
+            'evaluacion': jacobiano_aproximado.modo_evaluacion,
+            'evaluaciones_F': jacobiano_aproximado.evaluaciones_F
+        }
     }
 
 # Funciones predefinidas para el ejemplo
@@ -215,3 +665,70 @@ if __name__ == '__main__':
         hist = resultado['historial_iteraciones']
         for item in hist[-5:]:
             print(f"  Iter {item['iter']:02d}: x_k = {np.array2string(item['x_k'], precision=5, suppress_small=True)}, ||residuo|| = {item['norma_residuo']:.4e}")
+
+    print("\nCaso 2: Reutilizando la factorización del Jacobiano (cuerda / Shamanskii)")
+    for m_reuso in (1, 3, 10):
+        resultado_reuso = resolver_sistema_newton_raphson(
+            ejemplo_F_sistema_2x2,
+            ejemplo_J_sistema_2x2,
+            np.array([1.5, 3.5]),
+            1e-10,
+            max_iter_test,
+            reusar_jacobiano=m_reuso
+        )
+        if isinstance(resultado_reuso, str):
+            print(resultado_reuso)
+        else:
+            print(f"  m = {m_reuso:2d}: {resultado_reuso['status']} Solución: "
+                  f"{np.array2string(resultado_reuso['solucion'], precision=8)}, evaluaciones de J: "
+                  f"{resultado_reuso['evaluaciones_jacobiano']}, factorizaciones: {resultado_reuso['factorizaciones']}")
+
+    print("\nCaso 3: Jacobiano automático (J_func=None)")
+    for metodo_prueba in ('adelante', 'central', 'complejo'):
+        resultado_auto = resolver_sistema_newton_raphson(ejemplo_F_sistema_2x2, None, np.array([1.5, 3.5]), 1e-10,
+                                                         max_iter_test, metodo_jacobiano=metodo_prueba)
+        if isinstance(resultado_auto, str):
+            print(resultado_auto)
+        else:
+            info_j = resultado_auto['jacobiano_numerico']
+            print(f"  {metodo_prueba:<9}: {resultado_auto['status']} Solución: "
+                  f"{np.array2string(resultado_auto['solucion'], precision=8)}, evaluación {info_j['evaluacion']}, "
+                  f"{info_j['evaluaciones_F']} puntos de F para J")
+
+    print("\nCaso 4: Broyden (una evaluación de F por iteración)")
+    for actualizacion_prueba in ACTUALIZACIONES_BROYDEN:
+        resultado_broyden = resolver_sistema_broyden(ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2,
+                                                     np.array([1.5, 3.5]), 1e-10, max_iter_test,
+                                                     actualizacion=actualizacion_prueba)
+        if isinstance(resultado_broyden, str):
+            print(resultado_broyden)
+        else:
+            print(f"  {actualizacion_prueba:<5}: {resultado_broyden['status']} Solución: "
+                  f"{np.array2string(resultado_broyden['solucion'], precision=8)}, evaluaciones de F: "
+                  f"{resultado_broyden['evaluaciones_F']}, de J: {resultado_broyden['evaluaciones_jacobiano']}, "
+                  f"reinicios: {resultado_broyden['reinicios_jacobiano']}")
+
+    print("\nCaso 5: Búsqueda lineal desde un punto lejano (F = [atan(x) + 0.1y, atan(y) - 0.1x])")
+    F_atan = lambda v: np.array([np.arctan(v[0]) + 0.1 * v[1], np.arctan(v[1]) - 0.1 * v[0]])
+    J_atan = lambda v: np.array([[1 / (1 + v[0]**2), 0.1], [-0.1, 1 / (1 + v[1]**2)]])
+    for busqueda_prueba in (None, 'armijo', 'interpolacion'):
+        resultado_busqueda = resolver_sistema_newton_raphson(F_atan, J_atan, np.array([4.0, -3.0]), 1e-10,
+                                                             max_iter_test, busqueda_lineal=busqueda_prueba)
+        if isinstance(resultado_busqueda, str):
+            print(resultado_busqueda)
+        else:
+            print(f"  {str(busqueda_prueba):<13}: {resultado_busqueda['status']} Evaluaciones de F: "
+                  f"{resultado_busqueda['evaluaciones_F']}")
+
+    print("\nCaso 6: Búsqueda lineal cerca de un mínimo local de ||F|| (sistema 2x2 desde x0 = (-3, 2))")
+    for busqueda_prueba in (None, 'armijo', 'interpolacion'):
+        resultado_busqueda = resolver_sistema_newton_raphson(ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2,
+                                                             np.array([-3.0, 2.0]), 1e-10, max_iter_test,
+                                                             busqueda_lineal=busqueda_prueba)
+        if isinstance(resultado_busqueda, str):
+            print(resultado_busqueda)
+        else:
+            pasos_sin_descenso = sum(int(item.get('paso_sin_descenso') or 0)
+                                     for item in resultado_busqueda['historial_iteraciones'])
+            print(f"  {str(busqueda_prueba):<13}: {resultado_busqueda['status']} Evaluaciones de F: "
+                  f"{resultado_busqueda['evaluaciones_F']}, búsquedas sin descenso: {pasos_sin_descenso}")
@@ -1,10 +1,252 @@
+import time
 import numpy as np
+import scipy.sparse as sp
+import scipy.sparse.linalg as spla
+from scipy.linalg import solve_triangular
+from scipy.sparse import csgraph
+from .matrix_validation import verificar_matriz_iterativa
+from .iteration_history import crear_historial
 # sys ya no es necesario aquí, los errores/estados se retornan
 
-def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None):
+def _matriz_sor_dispersa(A_csr, diagonal, w_factor):
+    """
+    Construye M = D/w + L (L: parte estrictamente inferior de A) en formato CSR.
+    Un barrido de SOR equivale a x_{k+1} = x_k + M⁻¹(b − A x_k), de modo que el
+    recorrido secuencial fila por fila se reduce a una sustitución hacia adelante
+    sobre los elementos no nulos almacenados.
+    """
+    return (sp.tril(A_csr, k=-1) + sp.diags(diagonal / w_factor)).tocsr()
+
+VARIANTES_SOR = ('clasico', 'rojo_negro', 'multicolor', 'ssor')
+
+def _matrices_ssor(A_np, diagonal, w_factor):
+    """
+    Construye M_inf = D/w + L y M_sup = D/w + U (densas o CSR según A).
+    Un paso de SSOR es un barrido hacia adelante con M_inf seguido de uno hacia
+    atrás con M_sup, ambos como sustituciones triangulares.
+    """
+    if sp.issparse(A_np):
+        D_w = sp.diags(diagonal / w_factor)
+        return (sp.tril(A_np, k=-1) + D_w).tocsr(), (sp.triu(A_np, k=1) + D_w).tocsr()
+    D_w = np.diag(diagonal / w_factor)
+    return np.tril(A_np, -1) + D_w, np.triu(A_np, 1) + D_w
+
+def _resolver_triangular(M, r, inferior):
+    """Resuelve M y = r con M triangular, densa o dispersa."""
+    if sp.issparse(M):
+        return spla.spsolve_triangular(M, r, lower=inferior)
+    return solve_triangular(M, r, lower=inferior, check_finite=False)
+
+def _grafo_adyacencia(A_np):
+    """
+    Patrón simétrico de A sin la diagonal, en CSR: las filas i y j son vecinas si
+    a_ij ≠ 0 o a_ji ≠ 0, es decir, si la actualización de una lee a la otra.
+    """
+    patron = (A_np != 0) if sp.issparse(A_np) else sp.csr_matrix(A_np != 0)
+    patron = patron.astype(np.int8)
+    grafo = (patron + patron.T).tocsr()
+    grafo.setdiag(0)
+    grafo.eliminate_zeros()
+    return grafo
+
+def colorear_matriz(A_np):
+    """
+    Coloreo voraz del grafo de A. Las filas de un mismo color no se acoplan entre sí,
+    por lo que cada clase de color puede actualizarse de una sola vez con NumPy.
+
+    Parámetros:
+    A_np (np.array o scipy.sparse): Matriz cuadrada.
+
+    Retorna:
+    np.array: Color (entero desde 0) de cada fila.
+    """
+    grafo = _grafo_adyacencia(A_np)
+    indptr, indices = grafo.indptr, grafo.indices
+    n = grafo.shape[0]
+    colores = np.full(n, -1, dtype=np.int64)
+    marca = np.full(n + 1, -1, dtype=np.int64) # marca[c] == i si un vecino de i ya usa el color c
+    for i in range(n):
+        colores_vecinos = colores[indices[indptr[i]:indptr[i + 1]]]
+        marca[colores_vecinos[colores_vecinos >= 0]] = i
+        c = 0
+        while marca[c] == i:
+            c += 1
+        colores[i] = c
+    return colores
+
+def colorear_rojo_negro(A_np):
+    """
+    Ordenamiento rojo-negro (2 colores) mediante un recorrido en anchura por niveles,
+    como en las mallas estructuradas (p. ej. el esquema de 5 puntos).
+
+    Parámetros:
+    A_np (np.array o scipy.sparse): Matriz cuadrada.
+
+    Retorna:
+    np.array o None: Color (0 = rojo, 1 = negro) de cada fila, o None si el grafo de A
+                     no es bipartito y no admite dos colores.
+    """
+    grafo = _grafo_adyacencia(A_np)
+    n = grafo.shape[0]
+    _, etiquetas = csgraph.connected_components(grafo, directed=False)
+    colores = np.full(n, -1, dtype=np.int64)
+    # Una raíz por componente conexa; todas empiezan en el nivel 0
+    _, raices = np.unique(etiquetas, return_index=True)
+    frontera = raices
+    nivel = 0
+    while frontera.size > 0:
+        colores[frontera] = nivel % 2
+        vecinos = grafo[frontera].indices
+        frontera = np.unique(vecinos[colores[vecinos] < 0])
+        nivel += 1
+
+    filas, columnas = grafo.nonzero()
+    if np.any(colores[filas] == colores[columnas]):
+        return None
+    return colores
+
+# Hasta este tamaño el radio espectral se obtiene con los valores propios exactos de B_J densa
+_N_MAXIMO_ESTIMACION_DENSA = 200
+
+def _es_simetrica(A_np):
+    if sp.issparse(A_np):
+        return abs(A_np - A_np.T).max() <= 1e-12 * abs(A_np).max()
+    return np.allclose(A_np, A_np.T, rtol=0.0, atol=1e-12 * np.max(np.abs(A_np)))
+
+def estimar_w_optimo(A_np, diagonal, tol=1e-2, max_iter=10, max_vectores=20):
+    """
+    Estima el factor de relajación óptimo de SOR con la fórmula de Young
+    ω = 2 / (1 + sqrt(1 − ρ²)), donde ρ es el radio espectral de la matriz de iteración
+    de Jacobi B_J = I − D⁻¹A. La fórmula es exacta para matrices consistentemente
+    ordenadas (p. ej. mallas con ordenamiento natural o rojo-negro); para otras es una
+    aproximación razonable.
+
+    ρ se calcula:
+    - con los valores propios exactos de B_J si n es pequeño;
+    - con unas pocas iteraciones de Lanczos (eigsh) sobre D^{-1/2}(D − A)D^{-1/2}, semejante
+      a B_J, si A es simétrica con diagonal positiva. Solo se pide el mayor valor propio: en
+      las matrices consistentemente ordenadas los valores propios aparecen en pares ±ρ;
+    - con unas pocas iteraciones de Arnoldi (eigs) sobre B_J en otro caso (el de mayor módulo).
+    En los dos últimos casos solo se usan productos A·v y el costo está acotado por
+    max_vectores·(max_iter + 1) productos; la estimación no debe costar más que el propio SOR.
+    Si ARPACK no converge se usa la mejor aproximación disponible (los valores de Ritz ya
+    convergidos o, si no hay ninguno, el cociente de Rayleigh de la última iteración) y se
+    indica en 'convergio' / 'advertencia'.
+
+    Parámetros:
+    A_np (np.array o scipy.sparse): Matriz de coeficientes (CSR si es dispersa).
+    diagonal (np.array): Diagonal de A, sin elementos nulos.
+    tol (float): Tolerancia relativa de la estimación de ρ.
+    max_iter (int): Máximo de reinicios de Lanczos/Arnoldi.
+    max_vectores (int): Dimensión máxima del subespacio de Krylov (ncv de ARPACK).
+
+    Retorna:
+    dict: {'w_factor': float,                 # ω elegido (1.0 si ρ ≥ 1 o no se pudo estimar)
+           'radio_espectral_jacobi': float,   # ρ(B_J) estimado (NaN si no se pudo estimar)
+           'metodo': str,                     # 'exacto', 'lanczos' o 'arnoldi'
+           'convergio': bool,                 # False si ρ es una aproximación parcial
+           'advertencia': str o None,
+           'productos_matriz_vector': int,    # costo de la estimación
+           'tiempo_segundos': float}
+    """
+    inicio = time.perf_counter()
+    n = A_np.shape[0]
+    productos = [0]
+    convergio = True
+    advertencia = None
+
+    if n <= _N_MAXIMO_ESTIMACION_DENSA:
+        metodo = 'exacto'
+        A_densa = A_np.toarray() if sp.issparse(A_np) else A_np
+        radio = float(np.max(np.abs(np.linalg.eigvals(np.eye(n) - A_densa / diagonal[:, np.newaxis]))))
+    else:
+        if np.all(diagonal > 0) and _es_simetrica(A_np):
+            metodo = 'lanczos'
+            raiz_d = np.sqrt(diagonal)
+
+            def producto(v):
+                productos[0] += 1
+                v = np.ravel(v)
+                return v - (A_np @ (v / raiz_d)) / raiz_d
+        else:
+            metodo = 'arnoldi'
+
+            def producto(v):
+                productos[0] += 1
+                v = np.ravel(v)
+                return v - (A_np @ v) / diagonal
+
+        operador = spla.LinearOperator((n, n), matvec=producto, dtype=float)
+        ncv = min(max(int(max_vectores), 3), n - 1)
+        v0 = np.ones(n)
+        try:
+            if metodo == 'lanczos':
+                extremos = spla.eigsh(operador, k=1, which='LA', tol=tol, maxiter=max_iter, ncv=ncv,
+                                      v0=v0, return_eigenvectors=False)
+            else:
+                extremos = spla.eigs(operador, k=1, which='LM', tol=tol, maxiter=max_iter, ncv=ncv,
+                                     v0=v0, return_eigenvectors=False)
+            radio = float(np.max(np.abs(extremos)))
+        except spla.ArpackNoConvergence as e:
+            convergio = False
+            if len(e.eigenvalues):
+                radio = float(np.max(np.abs(e.eigenvalues)))
+            else:
+                # Sin valores de Ritz convergidos: un paso de potencia desde v0 da una cota inferior de ρ
+                Bv = producto(v0)
+                radio = float(abs(v0 @ Bv) / (v0 @ v0))
+            advertencia = (f"{metodo.capitalize()} no convergió en {productos[0]} productos A·v; "
+                           f"se usa la estimación parcial ρ ≈ {radio:.6f}.")
+
+    if not np.isfinite(radio) or radio >= 1.0:
+        w_factor = 1.0
+        if advertencia is None:
+            advertencia = (f"ρ(B_J) ≈ {radio:.6f} ≥ 1: la fórmula de Young no aplica, se usa ω = 1 "
+                           f"(Gauss-Seidel).")
+    else:
+        w_factor = 2.0 / (1.0 + np.sqrt(1.0 - radio ** 2))
+    return {
+        'w_factor': float(w_factor),
+        'radio_espectral_jacobi': radio,
+        'metodo': metodo,
+        'convergio': convergio,
+        'advertencia': advertencia,
+        'productos_matriz_vector': productos[0],
+        'tiempo_segundos': time.perf_counter() - inicio
+    }
+
+def _clases_de_color(A_np, b_np, diagonal, colores):
+    """Índices, filas de A, diagonal y b de cada clase de color (se extraen una sola vez)."""
+    clases = []
+    for c in range(int(colores.max()) + 1):
+        indices = np.flatnonzero(colores == c)
+        clases.append((indices, A_np[indices], diagonal[indices], b_np[indices]))
+    return clases
+
+def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None, estimar_condicion=False,
+                         historial=None, variante='clasico'):
     """
     Resuelve un sistema de ecuaciones lineales Ax = b usando el método de
     Sobrerrelajación Sucesiva (SOR) o Gauss-Seidel si w_factor = 1.
+    Con w_factor = "auto" el factor se estima con la fórmula de Young a partir del radio
+    espectral de la matriz de Jacobi (ver estimar_w_optimo).
+
+    A_np puede ser un np.array o una matriz dispersa de scipy (se convierte a CSR).
+    En el caso disperso cada barrido solo recorre los elementos no nulos almacenados.
+    Si estimar_condicion es True se calcula una cota inferior O(nnz) del número de
+    condición y se rechazan las matrices numéricamente singulares.
+    El parámetro historial elige cuánto se guarda de cada iteración ('ninguno', 'normas',
+    'cada_k', 'ultimos_n', 'completo' o una instancia de HistorialIteraciones); por
+    defecto se guarda todo.
+
+    El parámetro variante elige el barrido:
+    - 'clasico':    Gauss-Seidel/SOR fila por fila en el orden natural.
+    - 'rojo_negro': ordenamiento de dos colores (mallas estructuradas); cada color se
+                    actualiza en bloque con NumPy. Falla si el grafo de A no es bipartito.
+    - 'multicolor': coloreo voraz del grafo de A; cada clase de color se actualiza en bloque.
+    - 'ssor':       SOR simétrico, un barrido hacia adelante seguido de uno hacia atrás.
+    Con un ordenamiento por colores se resuelve el mismo sistema, pero el número de
+    iteraciones puede diferir del orden natural.
 
     Retorna:
     dict: Un diccionario con los resultados:
@@ -12,7 +254,13 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
          'iteraciones_realizadas': int, 
          'norma_residuo_final': float, 
          'status': str,
-         'historial_iteraciones': list of dicts [{'iter': int, 'x_k': np.array, 'norma_residuo': float}]}
+         'historial_iteraciones': HistorialIteraciones (se recorre como una lista de dicts
+                                  [{'iter': int, 'x_k': np.array, 'norma_residuo': float}]),
+         'cota_inferior_condicion': float o None,
+         'variante': str,
+         'numero_colores': int o None,
+         'w_factor_usado': float,
+         'estimacion_w': dict o None}   # resultado de estimar_w_optimo si w_factor = "auto"
     str: Mensaje de error si ocurre un problema de validación inicial.
     """
 
@@ -22,13 +270,20 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
         return "Error: El vector b debe tener la misma dimensión que las filas/columnas de A."
     # if not (0 < w_factor < 2): # Podríamos ser menos estrictos o dejar al usuario experimentar
     #     return "Advertencia: El factor de relajación w para SOR usualmente está en (0, 2)."
+    if variante not in VARIANTES_SOR:
+        return f"Error: Variante de SOR no reconocida: '{variante}'. Opciones: {', '.join(VARIANTES_SOR)}."
+    if isinstance(w_factor, str) and w_factor != 'auto':
+        return f"Error: El factor de relajación debe ser un número o 'auto' (se recibió '{w_factor}')."
 
-    try:
-        detA = np.linalg.det(A_np)
-        if np.isclose(detA, 0.0):
-            return "Error: La matriz de coeficientes es singular (determinante cercano a cero)."
-    except np.linalg.LinAlgError:
-        return "Error: No se pudo calcular el determinante de A. Verifique que sea una matriz válida."
+    es_dispersa = sp.issparse(A_np)
+    if es_dispersa:
+        A_np = A_np.tocsr()
+
+    # Controles O(nnz) en lugar de det(A) (ver matrix_validation)
+    mensaje_error, diagnostico = verificar_matriz_iterativa(A_np, estimar_condicion)
+    if mensaje_error:
+        return mensaje_error
+    cota_condicion = diagnostico['cota_inferior_condicion']
 
     n = A_np.shape[0]
     if x_inicial_np is None:
@@ -37,8 +292,46 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
         if x_inicial_np.shape != (n,):
             return "Error: La estimación inicial x_inicial tiene dimensiones incorrectas."
         x_k = np.copy(x_inicial_np).astype(float)
-    
-    historial_iteraciones = []
+
+    try:
+        historial_iteraciones = crear_historial(historial, capacidad=max_iter + 1)
+    except ValueError as e:
+        return f"Error: {e}"
+
+    if diagnostico['indice_diagonal_nula'] is not None:
+        i = diagnostico['indice_diagonal_nula']
+        return {
+            'solucion': x_k,
+            'iteraciones_realizadas': 0,
+            'norma_residuo_final': np.linalg.norm(A_np @ x_k - b_np),
+            'status': f"Error: Elemento diagonal A[{i},{i}] es cero. Imposible dividir.",
+            'historial_iteraciones': historial_iteraciones,
+            'cota_inferior_condicion': cota_condicion,
+            'variante': variante,
+            'numero_colores': None,
+            'w_factor_usado': None if w_factor == 'auto' else w_factor,
+            'estimacion_w': None
+        }
+
+    diagonal = diagnostico['diagonal']
+    estimacion_w = None
+    if w_factor == 'auto':
+        estimacion_w = estimar_w_optimo(A_np, diagonal)
+        w_factor = estimacion_w['w_factor']
+    M_sor = None
+    clases_color = None
+    if variante in ('rojo_negro', 'multicolor'):
+        colores = colorear_rojo_negro(A_np) if variante == 'rojo_negro' else colorear_matriz(A_np)
+        if colores is None:
+            return ("Error: El grafo de la matriz no es bipartito, no admite ordenamiento rojo-negro "
+                    "(use la variante 'multicolor').")
+        clases_color = _clases_de_color(A_np, b_np, diagonal, colores)
+    elif variante == 'ssor':
+        M_sor, M_sor_superior = _matrices_ssor(A_np, diagonal, w_factor)
+    elif es_dispersa:
+        M_sor = _matriz_sor_dispersa(A_np, diagonal, w_factor)
+    numero_colores = len(clases_color) if clases_color is not None else None
+
     iter_realizadas_count = 0
     norma_residuo_final_calculada = float('inf')
 
@@ -47,44 +340,46 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
     norma_residuo_inicial = np.linalg.norm(residuo_inicial)
     historial_iteraciones.append({
         'iter': 0,
-        'x_k': np.copy(x_k),
+        'x_k': x_k, # El historial copia el vector a su propio buffer
         'norma_residuo': norma_residuo_inicial
     })
     
     # Si la estimación inicial ya es buena, podríamos parar.
     # Sin embargo, el bucle realizará al menos una iteración de cálculo.
+    residuo_actual_completo = residuo_inicial
 
     for k_iter_loop in range(1, max_iter + 1):
         iter_realizadas_count = k_iter_loop
-        x_k_anterior = np.copy(x_k) # x de la iteración (k)
-
-        for i in range(n): # Para cada componente de x
-            if np.isclose(A_np[i, i], 0.0):
-                # Añadir estado actual al historial antes de fallar
-                residuo_actual = A_np @ x_k - b_np # Usar x_k parcialmente actualizado
-                norma_r_actual = np.linalg.norm(residuo_actual)
-                # No se añade al historial principal de iteraciones completas, sino que se retorna error.
-                return {
-                    'solucion': x_k,
-                    'iteraciones_realizadas': iter_realizadas_count,
-                    'norma_residuo_final': norma_r_actual,
-                    'status': f"Error: Elemento diagonal A[{i},{i}] es cero en iteración {k_iter_loop}. Imposible dividir.",
-                    'historial_iteraciones': historial_iteraciones # Solo hasta la iteración anterior completa
-                }
-
-            sum_j_menor_i = 0.0
-            for j in range(i):
-                sum_j_menor_i += A_np[i, j] * x_k[j]  # Usa x_k[j] ya actualizado en esta iteración (k+1)
+
+        if clases_color is not None:
+            # Las filas de un color no se acoplan entre sí: cada clase se actualiza en bloque
+            # con los valores ya actualizados de los colores anteriores.
+            for indices, A_color, diagonal_color, b_color in clases_color:
+                x_k[indices] += w_factor * (b_color - A_color @ x_k) / diagonal_color
+        elif variante == 'ssor':
+            # Barrido hacia adelante (D/w + L) y luego hacia atrás (D/w + U)
+            x_k = x_k - _resolver_triangular(M_sor, residuo_actual_completo, inferior=True)
+            x_k = x_k - _resolver_triangular(M_sor_superior, A_np @ x_k - b_np, inferior=False)
+        elif es_dispersa:
+            # Barrido completo como sustitución hacia adelante: (D/w + L) Δx = b − A x_k
+            x_k = x_k - spla.spsolve_triangular(M_sor, residuo_actual_completo, lower=True)
+        else:
+            x_k_anterior = np.copy(x_k) # x de la iteración (k)
+
+            for i in range(n): # Para cada componente de x (la diagonal ya se verificó no nula)
+                sum_j_menor_i = 0.0
+                for j in range(i):
+                    sum_j_menor_i += A_np[i, j] * x_k[j]  # Usa x_k[j] ya actualizado en esta iteración (k+1)
             
-            sum_j_mayor_i = 0.0
-            for j in range(i + 1, n):
-                sum_j_mayor_i += A_np[i, j] * x_k_anterior[j] # Usa x_k_anterior[j] de la iteración (k)
+                sum_j_mayor_i = 0.0
+                for j in range(i + 1, n):
+                    sum_j_mayor_i += A_np[i, j] * x_k_anterior[j] # Usa x_k_anterior[j] de la iteración (k)
 
-            # x_i sin relajación (término de Gauss-Seidel puro)
-            x_i_gs = (b_np[i] - sum_j_menor_i - sum_j_mayor_i) / A_np[i, i]
+                # x_i sin relajación (término de Gauss-Seidel puro)
+                x_i_gs = (b_np[i] - sum_j_menor_i - sum_j_mayor_i) / A_np[i, i]
             
-            # Aplicar relajación SOR
-            x_k[i] = (1 - w_factor) * x_k_anterior[i] + w_factor * x_i_gs
+                # Aplicar relajación SOR
+                x_k[i] = (1 - w_factor) * x_k_anterior[i] + w_factor * x_i_gs
 
         # Después de actualizar todas las componentes de x_k para la iteración k_iter_loop
         residuo_actual_completo = A_np @ x_k - b_np
@@ -92,7 +387,7 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
 
         historial_iteraciones.append({
             'iter': k_iter_loop,
-            'x_k': np.copy(x_k),
+            'x_k': x_k, # El historial copia el vector a su propio buffer
             'norma_residuo': norma_residuo_final_calculada
         })
 
@@ -102,7 +397,12 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
                 'iteraciones_realizadas': k_iter_loop,
                 'norma_residuo_final': norma_residuo_final_calculada,
                 'status': "Convergencia alcanzada.",
-                'historial_iteraciones': historial_iteraciones
+                'historial_iteraciones': historial_iteraciones,
+                'cota_inferior_condicion': cota_condicion,
+                'variante': variante,
+                'numero_colores': numero_colores,
+                'w_factor_usado': w_factor,
+                'estimacion_w': estimacion_w
             }
 
     # Si se alcanza este punto, no hubo convergencia en max_iter
@@ -111,7 +411,12 @@ def resolver_sistema_sor(A_np, b_np, w_factor, tol, max_iter, x_inicial_np=None)
         'iteraciones_realizadas': iter_realizadas_count,
         'norma_residuo_final': norma_residuo_final_calculada,
         'status': f"No se alcanzó convergencia tras {max_iter} iteraciones.",
-        'historial_iteraciones': historial_iteraciones
+        'historial_iteraciones': historial_iteraciones,
+        'cota_inferior_condicion': cota_condicion,
+        'variante': variante,
+        'numero_colores': numero_colores,
+        'w_factor_usado': w_factor,
+        'estimacion_w': estimacion_w
     }
 
 if __name__ == '__main__':
@@ -195,3 +500,43 @@ if __name__ == '__main__':
         hist_usr_sor = resultado_usuario_sor['historial_iteraciones']
         for item in hist_usr_sor[-5:]:
              print(f"  Iter {item['iter']:02d}: x_k = {np.array2string(item['x_k'], precision=5, suppress_small=True)}, ||residuo|| = {item['norma_residuo']:.4e}")
+
+    print("\nCaso 6: Matriz dispersa (CSR) con w=1.2")
+    A_dispersa = sp.csr_matrix(A_test)
+    resultado_disperso = resolver_sistema_sor(A_dispersa, b_test, 1.2, tol_test, max_iter_test)
+    if isinstance(resultado_disperso, str):
+        print(resultado_disperso)
+    else:
+        print(f"Status: {resultado_disperso['status']}")
+        print(f"Solución x final: {np.array2string(resultado_disperso['solucion'], precision=6)}")
+        print(f"Iteraciones realizadas: {resultado_disperso['iteraciones_realizadas']}")
+        print(f"Norma del residuo final: {resultado_disperso['norma_residuo_final']:.2e}")
+
+    print("\nCaso 7: Variantes rojo-negro, multicolor y SSOR (Poisson 2D de 5 puntos, CSR)")
+    m_malla = 30
+    T_malla = sp.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(m_malla, m_malla))
+    S_malla = sp.diags([-1.0, -1.0], [-1, 1], shape=(m_malla, m_malla))
+    A_poisson = (sp.kron(sp.identity(m_malla), T_malla) + sp.kron(S_malla, sp.identity(m_malla))).tocsr()
+    b_poisson = np.ones(m_malla * m_malla)
+    for variante_prueba in VARIANTES_SOR:
+        resultado_variante = resolver_sistema_sor(A_poisson, b_poisson, 1.8, 1e-8, 1000, variante=variante_prueba)
+        if isinstance(resultado_variante, str):
+            print(resultado_variante)
+        else:
+            print(f"  {variante_prueba:<10}: {resultado_variante['status']} Iteraciones: "
+                  f"{resultado_variante['iteraciones_realizadas']}, colores: {resultado_variante['numero_colores']}, "
+                  f"||residuo|| = {resultado_variante['norma_residuo_final']:.2e}")
+    print(resolver_sistema_sor(A_test, b_test, 1.2, tol_test, max_iter_test, variante='rojo_negro'))
+
+    print("\nCaso 8: Factor de relajación automático (w_factor='auto')")
+    for A_auto, nombre_auto in ((A_test, "3x3 densa"), (A_poisson, "Poisson 2D CSR")):
+        resultado_auto = resolver_sistema_sor(A_auto, b_test if A_auto is A_test else b_poisson, 'auto', 1e-8, 1000)
+        if isinstance(resultado_auto, str):
+            print(resultado_auto)
+        else:
+            est = resultado_auto['estimacion_w']
+            print(f"  {nombre_auto}: ρ(B_J) ≈ {est['radio_espectral_jacobi']:.6f} ({est['metodo']}, "
+                  f"{est['productos_matriz_vector']} productos A·v, {est['tiempo_segundos'] * 1e3:.1f} ms) -> "
+                  f"ω = {resultado_auto['w_factor_usado']:.4f}, iteraciones: {resultado_auto['iteraciones_realizadas']}")
+            if est['advertencia']:
+                print(f"    Advertencia: {est['advertencia']}")
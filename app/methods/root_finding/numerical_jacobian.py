@@ -0,0 +1,190 @@
+"""
+Jacobiano numérico para los métodos de Newton cuando no se dispone de J(x) analítico.
+
+Fórmulas (columna j, e_j = j-ésimo vector canónico):
+- 'adelante': (F(x + h e_j) − F(x)) / h,           h = sqrt(eps)·max(|x_j|, 1). n evaluaciones de F.
+- 'central':  (F(x + h e_j) − F(x − h e_j)) / 2h,  h = eps^(1/3)·max(|x_j|, 1). 2n evaluaciones.
+- 'complejo': Im(F(x + i h e_j)) / h,              h = 1e-20. n evaluaciones, sin cancelación
+              (exacto a precisión de máquina), pero F debe aceptar números complejos y ser
+              analítica (sin abs, max, comparaciones, ...).
+
+Los puntos perturbados forman las columnas de una matriz X de n x m. Formas de evaluarlos:
+- 'vectorizada': una sola llamada F(X), válida si F opera por componentes sobre arreglos
+                 (p. ej. `x, y = vec` seguido de expresiones NumPy) y retorna una matriz de n_f x m.
+- 'secuencial':  una llamada por columna.
+- 'hilos' / 'procesos': una llamada por columna en un ThreadPoolExecutor / ProcessPoolExecutor,
+                 para funciones F costosas tipo caja negra (los procesos requieren que F sea
+                 serializable con pickle, es decir, definida a nivel de módulo).
+- 'auto':        intenta la forma vectorizada la primera vez, la verifica contra evaluaciones
+                 individuales de la primera y la última columna y, si falla, usa la secuencial;
+                 la decisión se recuerda.
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+import numpy as np
+
+METODOS_JACOBIANO = ('adelante', 'central', 'complejo')
+EVALUACIONES_JACOBIANO = ('auto', 'vectorizada', 'secuencial', 'hilos', 'procesos')
+
+_PASO_COMPLEJO = 1e-20
+
+
+class JacobianoNumerico:
+    """
+    Calcula J(x) por diferencias finitas o paso complejo. Se usa como J_func: jac(x),
+    o jac(x, Fx) para reutilizar F(x) ya calculado en la fórmula hacia adelante.
+
+    Parámetros:
+    F_func (callable): Función F(x) del sistema.
+    metodo (str): Uno de METODOS_JACOBIANO.
+    evaluacion (str): Uno de EVALUACIONES_JACOBIANO.
+    max_trabajadores (int, opcional): Tamaño del pool para 'hilos' o 'procesos'.
+    paso (float, opcional): Paso relativo h fijo en lugar del valor por defecto de cada método.
+
+    El pool (si se usa) se crea en la primera llamada y se libera con cerrar() o al salir
+    de un bloque `with`.
+    """
+
+    def __init__(self, F_func, metodo='adelante', evaluacion='auto', max_trabajadores=None, paso=None):
+        if metodo not in METODOS_JACOBIANO:
+            raise ValueError(f"Método de Jacobiano no reconocido: '{metodo}'. "
+                             f"Opciones: {', '.join(METODOS_JACOBIANO)}.")
+        if evaluacion not in EVALUACIONES_JACOBIANO:
+            raise ValueError(f"Evaluación de Jacobiano no reconocida: '{evaluacion}'. "
+                             f"Opciones: {', '.join(EVALUACIONES_JACOBIANO)}.")
+        self.F_func = F_func
+        self.metodo = metodo
+        self.evaluacion = evaluacion
+        self.max_trabajadores = max_trabajadores
+        self.paso = paso
+        self.evaluaciones_F = 0  # Puntos en los que se evaluó F (una columna = un punto)
+        self._modo = None if evaluacion == 'auto' else evaluacion
+        self._ejecutor = None
+        self._ultimo_lote = None  # Lote evaluado por 'auto' al decidir, para no repetirlo
+
+    def __call__(self, x, Fx=None):
+        x = np.asarray(x, dtype=float)
+        n = x.size
+        identidad = np.eye(n)
+
+        if self.metodo == 'complejo':
+            h = self.paso if self.paso is not None else _PASO_COMPLEJO
+            valores = self._evaluar_columnas(x[:, np.newaxis] + 1j * h * identidad)
+            return np.imag(valores) / h
+
+        escala = np.maximum(np.abs(x), 1.0)
+        if self.metodo == 'central':
+            h = (self.paso if self.paso is not None else np.finfo(float).eps ** (1 / 3)) * escala
+            adelante = x[:, np.newaxis] + h * identidad
+            atras = x[:, np.newaxis] - h * identidad
+            valores = self._evaluar_columnas(np.hstack([adelante, atras]))
+            # Paso efectivo, exactamente representable (evita el error de redondeo de x + h)
+            return (valores[:, :n] - valores[:, n:]) / (np.diagonal(adelante) - np.diagonal(atras))
+
+        h = (self.paso if self.paso is not None else np.sqrt(np.finfo(float).eps)) * escala
+        adelante = x[:, np.newaxis] + h * identidad
+        if Fx is None:
+            Fx = self._evaluar_punto(x)
+        valores = self._evaluar_columnas(adelante)
+        return (valores - np.asarray(Fx)[:, np.newaxis]) / (np.diagonal(adelante) - x)
+
+    @property
+    def modo_evaluacion(self):
+        """Forma de evaluación en uso ('vectorizada', 'secuencial', ...), o None si 'auto' aún no decide."""
+        return self._modo
+
+    def cerrar(self):
+        """Libera el pool de hilos o procesos, si se creó."""
+        if self._ejecutor is not None:
+            self._ejecutor.shutdown()
+            self._ejecutor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # --- Internos ---
+
+    def _evaluar_punto(self, punto):
+        self.evaluaciones_F += 1
+        return np.asarray(self.F_func(punto))
+
+    def _evaluar_columnas(self, puntos):
+        """Evalúa F en cada columna de `puntos` (n x m) y retorna una matriz n_f x m."""
+        m = puntos.shape[1]
+        if self._modo is None:
+            self._modo = self._decidir_modo(puntos)
+            if self._modo == 'vectorizada':
+                lote, self._ultimo_lote = self._ultimo_lote, None
+                return lote # Ya calculado y verificado al decidir
+
+        if self._modo == 'vectorizada':
+            self.evaluaciones_F += m
+            return np.asarray(self.F_func(puntos))
+        if self._modo in ('hilos', 'procesos'):
+            if self._ejecutor is None:
+                Pool = ThreadPoolExecutor if self._modo == 'hilos' else ProcessPoolExecutor
+                self._ejecutor = Pool(max_workers=self.max_trabajadores)
+            trabajadores = self.max_trabajadores or os.cpu_count() or 1
+            self.evaluaciones_F += m
+            columnas = self._ejecutor.map(self.F_func, puntos.T, chunksize=max(1, m // (4 * trabajadores)))
+            return np.column_stack([np.asarray(c) for c in columnas])
+        return np.column_stack([self._evaluar_punto(p) for p in puntos.T])
+
+    def _decidir_modo(self, puntos):
+        """
+        Prueba F(X) sobre el lote completo y la compara con F en la primera y la última columna
+        (una F que reduce sobre toda la entrada, p. ej. vec.max() sin eje, puede coincidir en una
+        sola columna). Retorna 'vectorizada' (guardando el lote en _ultimo_lote) o 'secuencial'.
+        """
+        m = puntos.shape[1]
+        try:
+            with np.errstate(all='ignore'):
+                lote = np.asarray(self.F_func(puntos))
+            self.evaluaciones_F += m
+        except Exception:
+            return 'secuencial'
+        if lote.ndim != 2 or lote.shape[1] != m:
+            return 'secuencial'
+        for columna in sorted({0, m - 1}):
+            referencia = self._evaluar_punto(puntos[:, columna])
+            if referencia.shape != lote[:, columna].shape or not np.allclose(
+                    lote[:, columna], referencia, rtol=1e-12, atol=0.0, equal_nan=True):
+                return 'secuencial'
+        self._ultimo_lote = lote
+        return 'vectorizada'
+
+    def __repr__(self):
+        return (f"JacobianoNumerico(metodo='{self.metodo}', evaluacion='{self.evaluacion}', "
+                f"modo={self._modo!r}, evaluaciones_F={self.evaluaciones_F})")
+
+
+def jacobiano_numerico(F_func, x, Fx=None, metodo='adelante', evaluacion='auto', paso=None):
+    """
+    Calcula J(x) una sola vez (ver JacobianoNumerico). Para varias evaluaciones seguidas
+    conviene crear un JacobianoNumerico y reutilizarlo, así la decisión de 'auto' y el pool
+    se conservan.
+    """
+    with JacobianoNumerico(F_func, metodo, evaluacion, paso=paso) as jacobiano:
+        return jacobiano(x, Fx)
+
+
+if __name__ == '__main__':
+    from .newton_raphson_no_line_relaxation import ejemplo_F_sistema_2x2, ejemplo_J_sistema_2x2
+
+    print("Probando el módulo numerical_jacobian.py...")
+    x_prueba = np.array([1.5, 3.5])
+    J_exacto = ejemplo_J_sistema_2x2(x_prueba)
+    print(f"J analítico:\n{J_exacto}")
+    for metodo_prueba in METODOS_JACOBIANO:
+        jac_prueba = JacobianoNumerico(ejemplo_F_sistema_2x2, metodo_prueba)
+        J_aprox = jac_prueba(x_prueba)
+        print(f"  {metodo_prueba:<9}: error máximo = {np.max(np.abs(J_aprox - J_exacto)):.2e}, "
+              f"evaluación: {jac_prueba.modo_evaluacion}, puntos evaluados: {jac_prueba.evaluaciones_F}")
+
+    with JacobianoNumerico(ejemplo_F_sistema_2x2, 'central', evaluacion='hilos', max_trabajadores=2) as jac_hilos:
+        J_hilos = jac_hilos(x_prueba)
+    print(f"  central con hilos: error máximo = {np.max(np.abs(J_hilos - J_exacto)):.2e}")
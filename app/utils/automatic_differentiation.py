@@ -0,0 +1,286 @@
+"""
+Diferenciación automática en modo hacia adelante de sistemas ingresados por el usuario.
+
+A partir del árbol validado de cada expresión (ver expressions.analizar_expresion) se genera
+una sola función de Python, en código lineal, que calcula a la vez F(x) y J(x): cada
+subexpresión produce una variable con su valor y una con su derivada respecto de cada
+variable independiente (números duales, uno por dirección). Las subexpresiones repetidas,
+dentro de una ecuación o entre ecuaciones, se calculan una sola vez, y las derivadas
+idénticamente nulas se eliminan al generar el código. Así J cuesta del orden de dos
+evaluaciones de F, sin derivar a mano ni aproximar por diferencias.
+"""
+
+import ast
+import numpy as np
+from .expressions import analizar_expresion, CONSTANTES_PERMITIDAS, SistemaCompilado
+
+_UNO = '1.0'
+
+# Derivada de las ufuncs de un argumento, como texto en función del argumento `a` y del valor `v`
+_DERIVADAS_UNARIAS = {
+    'sin': lambda a, v: f"_np.cos({a})",
+    'cos': lambda a, v: f"-_np.sin({a})",
+    'tan': lambda a, v: f"(1.0 + {v} * {v})",
+    'arcsin': lambda a, v: f"(1.0 / _np.sqrt(1.0 - {a} * {a}))",
+    'arccos': lambda a, v: f"(-1.0 / _np.sqrt(1.0 - {a} * {a}))",
+    'arctan': lambda a, v: f"(1.0 / (1.0 + {a} * {a}))",
+    'sinh': lambda a, v: f"_np.cosh({a})",
+    'cosh': lambda a, v: f"_np.sinh({a})",
+    'tanh': lambda a, v: f"(1.0 - {v} * {v})",
+    'arcsinh': lambda a, v: f"(1.0 / _np.sqrt({a} * {a} + 1.0))",
+    'arccosh': lambda a, v: f"(1.0 / _np.sqrt({a} * {a} - 1.0))",
+    'arctanh': lambda a, v: f"(1.0 / (1.0 - {a} * {a}))",
+    'exp': lambda a, v: v,
+    'expm1': lambda a, v: f"({v} + 1.0)",
+    'exp2': lambda a, v: f"({v} * _np.log(2.0))",
+    'log': lambda a, v: f"(1.0 / {a})",
+    'log2': lambda a, v: f"(1.0 / ({a} * _np.log(2.0)))",
+    'log10': lambda a, v: f"(1.0 / ({a} * _np.log(10.0)))",
+    'log1p': lambda a, v: f"(1.0 / (1.0 + {a}))",
+    'sqrt': lambda a, v: f"(0.5 / {v})",
+    'cbrt': lambda a, v: f"(1.0 / (3.0 * {v} * {v}))",
+    'square': lambda a, v: f"(2.0 * {a})",
+    'reciprocal': lambda a, v: f"(-{v} * {v})",
+    'absolute': lambda a, v: f"_np.sign({a})",
+    'fabs': lambda a, v: f"_np.sign({a})",
+    'negative': lambda a, v: "(-1.0)",
+    'positive': lambda a, v: _UNO,
+    'conjugate': lambda a, v: _UNO,
+    'deg2rad': lambda a, v: f"{np.pi / 180.0!r}",
+    'radians': lambda a, v: f"{np.pi / 180.0!r}",
+    'rad2deg': lambda a, v: f"{180.0 / np.pi!r}",
+    'degrees': lambda a, v: f"{180.0 / np.pi!r}",
+}
+# Funciones escalonadas: derivada nula (en casi todo punto)
+_DERIVADA_NULA = {'sign', 'floor', 'ceil', 'trunc', 'rint', 'heaviside', 'floor_divide'}
+# Ufuncs de dos argumentos equivalentes a un operador
+_UFUNCS_OPERADOR = {'add': ast.Add, 'subtract': ast.Sub, 'multiply': ast.Mult, 'divide': ast.Div,
+                    'true_divide': ast.Div, 'power': ast.Pow, 'float_power': ast.Pow, 'mod': ast.Mod,
+                    'remainder': ast.Mod}
+
+
+class _GeneradorTangentes:
+    """Genera el código lineal (valor + derivadas) de un conjunto de expresiones."""
+
+    def __init__(self, variables):
+        self.variables = variables
+        self.lineas = []
+        self._subexpresiones = {}  # ast.dump(nodo) -> (valor, derivadas): eliminación de subexpresiones comunes
+        self._contador = 0
+
+    def _nueva(self, expresion):
+        """Asigna `expresion` a una variable temporal y retorna su nombre."""
+        nombre = f"_t{self._contador}"
+        self._contador += 1
+        self.lineas.append(f"    {nombre} = {expresion}")
+        return nombre
+
+    def _producto(self, a, b):
+        if a is None or b is None:
+            return None
+        if a == _UNO:
+            return b
+        if b == _UNO:
+            return a
+        return self._nueva(f"{a} * {b}")
+
+    def _suma(self, positivos, negativos=()):
+        positivos = [t for t in positivos if t is not None]
+        negativos = [t for t in negativos if t is not None]
+        if not positivos and not negativos:
+            return None
+        if not negativos and len(positivos) == 1:
+            return positivos[0]
+        texto = ' + '.join(positivos) if positivos else '0.0'
+        for t in negativos:
+            texto += f" - {t}"
+        return self._nueva(texto)
+
+    def visitar(self, nodo):
+        clave = ast.dump(nodo)
+        if clave not in self._subexpresiones:
+            self._subexpresiones[clave] = self._visitar(nodo)
+        return self._subexpresiones[clave]
+
+    def _constante(self, texto):
+        return texto, [None] * len(self.variables)
+
+    def _visitar(self, nodo):
+        if isinstance(nodo, ast.Constant):
+            return self._constante(f"({nodo.value!r})")
+        if isinstance(nodo, ast.Name):
+            if nodo.id in CONSTANTES_PERMITIDAS:
+                return self._constante(f"_np.{nodo.id}")
+            return nodo.id, [_UNO if v == nodo.id else None for v in self.variables]
+        if isinstance(nodo, ast.Attribute): # np.pi, np.e
+            return self._constante(f"_np.{nodo.attr}")
+        if isinstance(nodo, ast.UnaryOp):
+            a, da = self.visitar(nodo.operand)
+            if isinstance(nodo.op, ast.UAdd):
+                return a, da
+            return self._nueva(f"-{a}"), [None if d is None else self._nueva(f"-{d}") for d in da]
+        if isinstance(nodo, ast.BinOp):
+            return self._binaria(type(nodo.op), self.visitar(nodo.left), self.visitar(nodo.right))
+        if isinstance(nodo, ast.Call):
+            return self._llamada(nodo)
+        raise ValueError(f"No se puede derivar '{ast.unparse(nodo)}'.")
+
+    def _binaria(self, operador, izquierdo, derecho):
+        (a, da), (b, db) = izquierdo, derecho
+        if operador in (ast.Add, ast.Sub):
+            v = self._nueva(f"{a} {'+' if operador is ast.Add else '-'} {b}")
+            if operador is ast.Add:
+                return v, [self._suma([x, y]) for x, y in zip(da, db)]
+            return v, [self._suma([x], [y]) for x, y in zip(da, db)]
+        if operador is ast.Mult:
+            v = self._nueva(f"{a} * {b}")
+            return v, [self._suma([self._producto(x, b), self._producto(a, y)]) for x, y in zip(da, db)]
+        if operador is ast.Div:
+            v = self._nueva(f"{a} / {b}")
+            # d(a/b) = (da − v·db) / b
+            return v, [None if x is None and y is None else
+                       self._nueva(f"({self._suma([x], [self._producto(v, y)])}) / {b}") for x, y in zip(da, db)]
+        if operador is ast.Pow:
+            v = self._nueva(f"{a} ** {b}")
+            if all(y is None for y in db):
+                # Exponente constante: d(a^c) = c · a^(c−1) · da
+                if all(x is None for x in da):
+                    return v, da
+                factor = self._nueva(f"{b} * {a} ** ({b} - 1)")
+                return v, [self._producto(factor, x) for x in da]
+            # Caso general: d(a^b) = a^b · (db · ln a + b · da / a)
+            log_a = self._nueva(f"_np.log({a})")
+            b_sobre_a = self._nueva(f"{b} / {a}") if any(x is not None for x in da) else None
+            return v, [self._producto(v, self._suma([self._producto(y, log_a), self._producto(b_sobre_a, x)]))
+                       for x, y in zip(da, db)]
+        if operador is ast.Mod:
+            # a % b = a − b·floor(a/b): la derivada es da − floor(a/b)·db
+            v = self._nueva(f"{a} % {b}")
+            piso = self._nueva(f"_np.floor({a} / {b})") if any(y is not None for y in db) else None
+            return v, [self._suma([x], [self._producto(piso, y)]) for x, y in zip(da, db)]
+        if operador is ast.FloorDiv:
+            return self._nueva(f"{a} // {b}"), [None] * len(self.variables)
+        raise ValueError("Operador no soportado por la diferenciación automática.")
+
+    def _llamada(self, nodo):
+        nombre = nodo.func.id if isinstance(nodo.func, ast.Name) else nodo.func.attr
+        argumentos = [self.visitar(argumento) for argumento in nodo.args]
+        if nombre in _UFUNCS_OPERADOR and len(argumentos) == 2:
+            return self._binaria(_UFUNCS_OPERADOR[nombre], *argumentos)
+
+        valores = [a for a, _ in argumentos]
+        v = self._nueva(f"_np.{nombre}({', '.join(valores)})")
+        if nombre in _DERIVADA_NULA or all(d is None for _, ds in argumentos for d in ds):
+            return v, [None] * len(self.variables)
+
+        if len(argumentos) == 1 and nombre in _DERIVADAS_UNARIAS:
+            a, da = argumentos[0]
+            derivada = _DERIVADAS_UNARIAS[nombre](a, v)
+            factor = derivada if derivada == _UNO else self._nueva(derivada)
+            return v, [self._producto(factor, x) for x in da]
+        if len(argumentos) == 2:
+            (a, da), (b, db) = argumentos
+            if nombre == 'arctan2':
+                # d atan2(a, b) = (b·da − a·db) / (a² + b²)
+                denominador = self._nueva(f"{a} * {a} + {b} * {b}")
+                return v, [None if x is None and y is None else
+                           self._nueva(f"({self._suma([self._producto(b, x)], [self._producto(a, y)])}) / {denominador}")
+                           for x, y in zip(da, db)]
+            if nombre == 'hypot':
+                return v, [None if x is None and y is None else
+                           self._nueva(f"({self._suma([self._producto(a, x), self._producto(b, y)])}) / {v}")
+                           for x, y in zip(da, db)]
+            if nombre in ('maximum', 'minimum', 'fmax', 'fmin'):
+                comparacion = '>=' if nombre in ('maximum', 'fmax') else '<='
+                return v, [None if x is None and y is None else
+                           self._nueva(f"_np.where({a} {comparacion} {b}, {x or '0.0'}, {y or '0.0'})")
+                           for x, y in zip(da, db)]
+        raise ValueError(f"La diferenciación automática no soporta la función '{nombre}' con "
+                         f"{len(argumentos)} argumento(s).")
+
+
+class SistemaDiferenciable:
+    """
+    Sistema F(vec) con Jacobiano exacto por diferenciación automática (modo hacia adelante).
+
+    evaluar(vec) retorna (F, J) en una sola pasada. F(vec) y J(vec) pueden usarse como
+    F_func y J_func de los resolvedores de Newton: se guarda el último punto evaluado, así
+    que la secuencia habitual F(x_k), J(x_k) cuesta una única evaluación fusionada. Para un
+    lote de puntos (p. ej. la malla de un gráfico), F(vec) usa la función compilada sin
+    derivadas.
+
+    Parámetros:
+    textos (list de str): Una expresión por ecuación.
+    variables (tuple de str): Variables independientes.
+
+    Lanza:
+    ValueError: Si una expresión no es válida o usa una función que no se sabe derivar.
+    """
+
+    def __init__(self, textos, variables=('x', 'y')):
+        self.sistema = SistemaCompilado(textos, variables)
+        self.variables = self.sistema.variables
+        generador = _GeneradorTangentes(self.variables)
+        resultados = [generador.visitar(analizar_expresion(texto, self.variables)) for texto in self.sistema.textos]
+        valores = ', '.join(v for v, _ in resultados)
+        filas = ', '.join('(' + ', '.join(d or '0.0' for d in ds) + ',)' for _, ds in resultados)
+        self.codigo = (f"def _f_y_jacobiano({', '.join(self.variables)}):\n" + '\n'.join(generador.lineas) +
+                       f"\n    return ({valores},), ({filas},)\n")
+        espacio = {'__builtins__': {}, '_np': np}
+        exec(compile(self.codigo, '<diferenciacion automatica>', 'exec'), espacio)
+        self._funcion = espacio['_f_y_jacobiano']
+        self.evaluaciones = 0
+        self._ultimo_punto = None
+        self._ultimo_resultado = None
+
+    def evaluar(self, vec):
+        """Retorna (F, J) con F de forma (m, ...) y J de forma (m, n, ...)."""
+        if len(vec) != len(self.variables):
+            raise ValueError(f"Se esperaban {len(self.variables)} variables y se recibieron {len(vec)}.")
+        self.evaluaciones += 1
+        valores, derivadas = self._funcion(*vec)
+        forma = np.broadcast_shapes(np.shape(vec[0]), *(np.shape(v) for v in valores),
+                                    *(np.shape(d) for fila in derivadas for d in fila))
+        if forma == ():
+            return np.array(valores), np.array(derivadas)
+        F = np.array([np.broadcast_to(v, forma) for v in valores])
+        J = np.array([[np.broadcast_to(d, forma) for d in fila] for fila in derivadas])
+        return F, J
+
+    def _evaluar_en_cache(self, vec):
+        punto = np.asarray(vec)
+        if (self._ultimo_punto is None or punto.shape != self._ultimo_punto.shape or
+                not np.array_equal(punto, self._ultimo_punto)):
+            self._ultimo_resultado = self.evaluar(punto)
+            self._ultimo_punto = punto.copy()
+        return self._ultimo_resultado
+
+    def F(self, vec):
+        if np.ndim(vec) > 1:
+            return self.sistema(vec)
+        return self._evaluar_en_cache(vec)[0].copy()
+
+    def J(self, vec):
+        return self._evaluar_en_cache(vec)[1].copy()
+
+    __call__ = F
+
+    def __repr__(self):
+        return f"SistemaDiferenciable({self.sistema.textos}, variables={self.variables})"
+
+
+if __name__ == '__main__':
+    print("Probando el módulo automatic_differentiation.py...")
+    sistema_prueba = SistemaDiferenciable(["x**2 + x*y - 10", "y + 3*x*y**2 - 57"])
+    F_p, J_p = sistema_prueba.evaluar(np.array([2.0, 3.0]))
+    print(f"F(2, 3) = {F_p}\nJ(2, 3) =\n{J_p}")
+    print("Código generado:")
+    print(sistema_prueba.codigo)
+
+    sistema_trig = SistemaDiferenciable(["sin(x*y) + exp(x*y) - y**x", "np.arctan2(y, x) + sqrt(x*y)"])
+    punto = np.array([0.7, 1.3])
+    _, J_ad = sistema_trig.evaluar(punto)
+    h = 1e-6
+    J_fd = np.column_stack([(sistema_trig.F(punto + h * e) - sistema_trig.F(punto - h * e)) / (2 * h)
+                            for e in np.eye(2)])
+    print(f"Diferencia con diferencias centrales: {np.max(np.abs(J_ad - J_fd)):.2e}")
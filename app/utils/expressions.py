@@ -0,0 +1,197 @@
+"""
+Compilación de expresiones matemáticas ingresadas por el usuario (p. ej. "x**2 + x*y - 10").
+
+Antes la GUI llamaba a eval() sobre el texto en cada evaluación, por lo que cada iteración
+de Newton y cada punto de la malla del gráfico volvían a analizar y compilar las
+expresiones. Aquí cada expresión se analiza una sola vez con el módulo ast, se valida
+contra una lista blanca (números, variables, operadores aritméticos, ufuncs de NumPy y
+las constantes pi y e) y se compila a una función de Python. Como todo se evalúa con
+ufuncs, las funciones aceptan escalares o arreglos completos (se vectorizan solas).
+
+Las funciones de NumPy pueden escribirse con o sin prefijo: "sin(x)" o "np.sin(x)".
+"""
+
+import ast
+import types
+import numpy as np
+
+# Ufuncs de NumPy disponibles en las expresiones (sin, cos, exp, log, sqrt, arctan2, ...)
+FUNCIONES_PERMITIDAS = {nombre: getattr(np, nombre) for nombre in dir(np) if isinstance(getattr(np, nombre), np.ufunc)}
+CONSTANTES_PERMITIDAS = {'pi': np.pi, 'e': np.e}
+
+_OPERADORES_BINARIOS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.Pow, ast.Mod, ast.FloorDiv)
+_OPERADORES_UNARIOS = (ast.UAdd, ast.USub)
+
+# Espacio de nombres de las funciones compiladas: sin builtins, solo lo permitido
+_ESPACIO_GLOBAL = {'__builtins__': {}, 'np': types.SimpleNamespace(**FUNCIONES_PERMITIDAS, **CONSTANTES_PERMITIDAS)}
+_ESPACIO_GLOBAL.update(FUNCIONES_PERMITIDAS)
+_ESPACIO_GLOBAL.update(CONSTANTES_PERMITIDAS)
+
+
+def analizar_expresion(texto, variables=('x', 'y')):
+    """
+    Analiza y valida una expresión.
+
+    Parámetros:
+    texto (str): Expresión en sintaxis de Python.
+    variables (tuple de str): Nombres de las variables independientes.
+
+    Retorna:
+    ast.expr: Árbol de la expresión, ya validado.
+
+    Lanza:
+    ValueError: Si la expresión está vacía, tiene un error de sintaxis o usa nombres u
+                operaciones fuera de la lista blanca.
+    """
+    texto = texto.strip()
+    if not texto:
+        raise ValueError("La expresión está vacía.")
+    try:
+        arbol = ast.parse(texto, mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Error de sintaxis en la expresión '{texto}': {e.msg}.") from None
+    _validar_nodo(arbol.body, texto, set(variables))
+    return arbol.body
+
+
+def _validar_nodo(nodo, texto, variables):
+    if isinstance(nodo, ast.Constant):
+        if isinstance(nodo.value, bool) or not isinstance(nodo.value, (int, float, complex)):
+            raise ValueError(f"Constante no permitida {nodo.value!r} en la expresión '{texto}'.")
+    elif isinstance(nodo, ast.Name):
+        if nodo.id not in variables and nodo.id not in CONSTANTES_PERMITIDAS:
+            if nodo.id in FUNCIONES_PERMITIDAS:
+                raise ValueError(f"'{nodo.id}' es una función y debe llamarse, p. ej. {nodo.id}(x), "
+                                 f"en la expresión '{texto}'.")
+            raise ValueError(f"Nombre no reconocido '{nodo.id}' en la expresión '{texto}'. "
+                             f"Variables permitidas: {', '.join(sorted(variables))}.")
+    elif isinstance(nodo, ast.Attribute):
+        # Solo np.<función o constante permitida>
+        if not (isinstance(nodo.value, ast.Name) and nodo.value.id == 'np' and
+                (nodo.attr in FUNCIONES_PERMITIDAS or nodo.attr in CONSTANTES_PERMITIDAS)):
+            raise ValueError(f"Atributo no permitido '{ast.unparse(nodo)}' en la expresión '{texto}'.")
+    elif isinstance(nodo, ast.BinOp):
+        if not isinstance(nodo.op, _OPERADORES_BINARIOS):
+            raise ValueError(f"Operador no permitido '{ast.unparse(nodo)}' en la expresión '{texto}' "
+                             f"(use ** para potencias).")
+        _validar_nodo(nodo.left, texto, variables)
+        _validar_nodo(nodo.right, texto, variables)
+    elif isinstance(nodo, ast.UnaryOp):
+        if not isinstance(nodo.op, _OPERADORES_UNARIOS):
+            raise ValueError(f"Operador no permitido '{ast.unparse(nodo)}' en la expresión '{texto}'.")
+        _validar_nodo(nodo.operand, texto, variables)
+    elif isinstance(nodo, ast.Call):
+        funcion = nodo.func
+        es_permitida = ((isinstance(funcion, ast.Name) and funcion.id in FUNCIONES_PERMITIDAS) or
+                        (isinstance(funcion, ast.Attribute) and isinstance(funcion.value, ast.Name) and
+                         funcion.value.id == 'np' and funcion.attr in FUNCIONES_PERMITIDAS))
+        if not es_permitida:
+            raise ValueError(f"Función no permitida '{ast.unparse(funcion)}' en la expresión '{texto}'.")
+        if nodo.keywords:
+            raise ValueError(f"No se permiten argumentos con nombre en '{ast.unparse(nodo)}'.")
+        for argumento in nodo.args:
+            _validar_nodo(argumento, texto, variables)
+    else:
+        raise ValueError(f"Construcción no permitida '{ast.unparse(nodo)}' en la expresión '{texto}'.")
+
+
+def _compilar_lambda(cuerpo, variables, nombre):
+    """Compila `lambda <variables>: <cuerpo>` una sola vez en el espacio de nombres restringido."""
+    funcion = ast.Expression(ast.Lambda(
+        args=ast.arguments(posonlyargs=[], args=[ast.arg(arg=v) for v in variables], kwonlyargs=[],
+                           kw_defaults=[], defaults=[]),
+        body=cuerpo))
+    ast.fix_missing_locations(funcion)
+    return eval(compile(funcion, f"<{nombre}>", 'eval'), _ESPACIO_GLOBAL)
+
+
+class ExpresionCompilada:
+    """
+    Expresión escalar compilada: expr(x, y) con escalares o arreglos (se aplica broadcasting).
+
+    Parámetros:
+    texto (str): Expresión.
+    variables (tuple de str): Variables independientes, en el orden de los argumentos.
+    """
+
+    def __init__(self, texto, variables=('x', 'y')):
+        self.texto = texto.strip()
+        self.variables = tuple(variables)
+        self.arbol = analizar_expresion(self.texto, self.variables)
+        self._funcion = _compilar_lambda(self.arbol, self.variables, self.texto)
+
+    def __call__(self, *valores):
+        return self._funcion(*valores)
+
+    def __repr__(self):
+        return f"ExpresionCompilada('{self.texto}', variables={self.variables})"
+
+
+class SistemaCompilado:
+    """
+    Sistema de expresiones F(vec) = [f_1(vec), ..., f_m(vec)] compilado en una sola función.
+
+    vec puede ser un vector (n,) o un lote de puntos (n, ...) con una fila por variable; el
+    resultado tiene forma (m,) o (m, ...). Las expresiones constantes se expanden a la forma
+    del lote, de modo que el resultado siempre es un arreglo regular.
+
+    Parámetros:
+    textos (list de str): Una expresión por ecuación.
+    variables (tuple de str): Variables independientes; vec[i] corresponde a variables[i].
+    """
+
+    def __init__(self, textos, variables=('x', 'y')):
+        self.textos = [texto.strip() for texto in textos]
+        self.variables = tuple(variables)
+        self.arboles = [analizar_expresion(texto, self.variables) for texto in self.textos]
+        tupla = ast.Tuple(elts=list(self.arboles), ctx=ast.Load())
+        self._funcion = _compilar_lambda(tupla, self.variables, ', '.join(self.textos))
+
+    def __call__(self, vec):
+        if len(vec) != len(self.variables):
+            raise ValueError(f"Se esperaban {len(self.variables)} variables y se recibieron {len(vec)}.")
+        valores = self._funcion(*vec)
+        forma = np.broadcast_shapes(np.shape(vec[0]), *(np.shape(valor) for valor in valores))
+        if forma == ():
+            return np.array(valores)
+        return np.array([np.broadcast_to(valor, forma) for valor in valores])
+
+    def __repr__(self):
+        return f"SistemaCompilado({self.textos}, variables={self.variables})"
+
+
+def compilar_jacobiano(textos, variables=('x', 'y')):
+    """
+    Compila una matriz de expresiones (lista de filas) como función J(vec) -> matriz (m, n[, ...]).
+
+    Parámetros:
+    textos (list de list de str): textos[i][j] es ∂f_i/∂x_j.
+    variables (tuple de str): Variables independientes.
+
+    Retorna:
+    callable: J(vec).
+    """
+    filas = len(textos)
+    sistema = SistemaCompilado([texto for fila in textos for texto in fila], variables)
+
+    def J(vec):
+        valores = sistema(vec)
+        return valores.reshape((filas, -1) + valores.shape[1:])
+
+    return J
+
+
+if __name__ == '__main__':
+    print("Probando el módulo expressions.py...")
+    F_prueba = SistemaCompilado(["x**2 + x*y - 10", "y + 3*x*y**2 - 57"])
+    print(f"F(2, 3) = {F_prueba(np.array([2.0, 3.0]))}")
+    malla_x, malla_y = np.meshgrid(np.linspace(0, 4, 3), np.linspace(0, 4, 3))
+    print(f"F sobre una malla 3x3, forma del resultado: {F_prueba(np.array([malla_x, malla_y])).shape}")
+    J_prueba = compilar_jacobiano([["2*x + y", "x"], ["3*y**2", "1 + 6*x*y"]])
+    print(f"J(2, 3) =\n{J_prueba(np.array([2.0, 3.0]))}")
+    print(f"np.sin(pi/2) + exp(0) = {ExpresionCompilada('np.sin(pi/2) + exp(0)')(0.0, 0.0)}")
+    for texto_invalido in ("__import__('os')", "x.real", "x ^ 2", "z + 1", "x +"):
+        try:
+            ExpresionCompilada(texto_invalido)
+        except ValueError as e:
+            print(f"Rechazada: {e}")